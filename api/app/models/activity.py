@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+from datetime import datetime
+from app.models.analysis import AnalysisRequest
+
+class ActivityRequest(AnalysisRequest):
+    start: Optional[str] = Field(default=None, pattern=r"^\d{4}-\d{2}$")  # "YYYY-MM", inclusive (None = first active month)
+    end: Optional[str] = Field(default=None, pattern=r"^\d{4}-\d{2}$")  # "YYYY-MM", inclusive (None = last active month)
+    granularity: Literal["month", "quarter", "year"] = "month"
+    languages: Optional[List[str]] = None  # None = every language
+    
+    @model_validator(mode="after")
+    def check_range(self) -> "ActivityRequest":
+        for month in (self.start, self.end):
+            if month is not None and not 1 <= int(month[5:]) <= 12:
+                raise ValueError(f"Invalid month: {month}")
+        if self.start and self.end and self.start > self.end:
+            raise ValueError(f"Activity range start {self.start} is after end {self.end}")
+        return self
+
+class LanguageActivity(BaseModel):
+    language: str
+    counts: List[int]  # Commits per period, aligned with ActivityTimeSeries.periods
+    total: int
+
+class ActivityTimeSeries(BaseModel):
+    username: str
+    analysis_date: datetime
+    granularity: str
+    periods: List[str]  # "2024-01", "2024-Q1" or "2024"
+    total_counts: List[int]  # Commits per period across all repositories
+    languages: List[LanguageActivity]  # Most active first
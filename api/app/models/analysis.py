@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -6,6 +6,7 @@ class AnalysisRequest(BaseModel):
     github_username: str
     include_private: bool = False
     access_token: Optional[str] = None
+    author_emails: List[str] = []  # Commit emails not linked to the GitHub account (login matches the linked ones)
 
 class LanguageIntensity(BaseModel):
     language: str
@@ -13,6 +14,7 @@ class LanguageIntensity(BaseModel):
     commit_count: int
     line_count: int
     repository_count: int
+    activity: Optional[Dict[str, int]] = None  # Commits in the last N months, keyed by N
 
 class AnalysisResult(BaseModel):
     username: str
@@ -21,11 +23,42 @@ class AnalysisResult(BaseModel):
     total_repositories: int
     total_commits: int
     analysis_period_months: int
+    scoring_profile: Optional[str] = None  # "name@version" of the ScoringProfile used
+
+class BatchAnalysisRequest(BaseModel):
+    github_usernames: List[str] = []
+    organization: Optional[str] = None  # Its members are analyzed too, with its repositories in the crawl
+    include_private: bool = False
+    access_token: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_members(self) -> "BatchAnalysisRequest":
+        if not self.github_usernames and not self.organization:
+            raise ValueError("github_usernames or organization is required")
+        return self
+
+class BatchAnalysisResult(BaseModel):
+    organization: Optional[str] = None
+    analysis_date: datetime
+    members: List[AnalysisResult]
+    aggregate: AnalysisResult  # Every distinct repository once, with the commits attributed to members
+    total_repositories: int  # Distinct repositories crawled
+    shared_repositories: int  # Repositories with commits attributed to more than one member
+    failed_members: List[str] = []  # Members whose repositories could not be listed
+
+class AnalysisProgress(BaseModel):
+    phase: str  # "pending", "listing", "fetching", "scoring", "completed", "failed"
+    repositories_discovered: int = 0
+    repositories_processed: int = 0
+    repositories_total: Optional[int] = None  # Known once the repository listing is complete
 
 class AnalysisJob(BaseModel):
     job_id: str
     status: str  # "pending", "processing", "completed", "failed"
     created_at: datetime
     completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None  # Heartbeat of the process running the job
     result: Optional[AnalysisResult] = None
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+    progress: Optional[AnalysisProgress] = None
+    batch_result: Optional[BatchAnalysisResult] = None  # Set instead of result by batch analyses
\ No newline at end of file
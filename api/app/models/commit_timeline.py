@@ -0,0 +1,110 @@
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+def parse_commit_timestamp(value) -> Optional[int]:
+    """
+    Epoch seconds of a GitHub ISO 8601 date (None if missing or invalid)
+    """
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def to_timestamp(value: Union[datetime, int, float]) -> float:
+    """
+    Epoch seconds of a datetime or number (cutoffs are timezone-aware UTC; naive values are local time)
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+def month_index(timestamp: Union[int, float]) -> int:
+    """
+    UTC calendar month of an epoch timestamp as year * 12 + (month - 1)
+    """
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.year * 12 + moment.month - 1
+
+def month_start(index: int) -> int:
+    """
+    Epoch seconds at the start of a month index
+    """
+    return int(datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc).timestamp())
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def parse_month(label: str) -> int:
+    """
+    Month index of a "YYYY-MM" label
+    """
+    year, month = label.split("-")
+    if not 1 <= int(month) <= 12:
+        raise ValueError(f"Invalid month: {label}")
+    return int(year) * 12 + int(month) - 1
+
+class CommitTimeline:
+    """
+    Author dates of a repository's commits as sorted epoch seconds (oldest first)
+    Parsed once at ingest; window counts are a bisect instead of re-parsing dates
+    """
+    __slots__ = ("timestamps", "shas")
+    
+    def __init__(self, timestamps: Iterable[int] = (), shas: Optional[Iterable[str]] = None):
+        self.timestamps = array("q", sorted(timestamps))
+        self.shas: Optional[Set[str]] = set(shas) if shas is not None else None
+    
+    @classmethod
+    def from_dates(cls, dates: Iterable[str]) -> "CommitTimeline":
+        """
+        Build from ISO 8601 dates, skipping invalid ones
+        """
+        parsed = (parse_commit_timestamp(date) for date in dates)
+        return cls(timestamp for timestamp in parsed if timestamp is not None)
+    
+    @classmethod
+    def from_weekly_counts(cls, weeks: Iterable[Iterable[int]]) -> "CommitTimeline":
+        """
+        Build from [week start, commits] pairs; each commit is dated at the start of its week
+        """
+        return cls(week for week, commits in weeks for _ in range(commits))
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def count_since(self, since: Union[datetime, int, float, None]) -> int:
+        """
+        Commits authored at or after since (None = all)
+        """
+        if since is None:
+            return len(self.timestamps)
+        return len(self.timestamps) - bisect_left(self.timestamps, to_timestamp(since))
+    
+    def count_between(self, start: Union[datetime, int, float], end: Union[datetime, int, float]) -> int:
+        """
+        Commits authored in [start, end)
+        """
+        return bisect_left(self.timestamps, to_timestamp(end)) - bisect_left(self.timestamps, to_timestamp(start))
+    
+    def monthly_counts(self) -> Dict[int, int]:
+        """
+        Commits per UTC calendar month (month index → count), one bisect per month boundary
+        """
+        if not self.timestamps:
+            return {}
+        counts = {}
+        low = 0
+        for index in range(month_index(self.timestamps[0]), month_index(self.timestamps[-1]) + 1):
+            high = bisect_left(self.timestamps, month_start(index + 1), low)
+            if high > low:
+                counts[index] = high - low
+            low = high
+        return counts
+    
+    def to_list(self) -> List[int]:
+        return self.timestamps.tolist()
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+from app.models.analysis import AnalysisRequest
+
+# Language complexity weights (higher = more complex)
+DEFAULT_LANGUAGE_COMPLEXITY = {
+    "C++": 1.4,
+    "C": 1.3,
+    "Rust": 1.3,
+    "Assembly": 1.5,
+    "Java": 1.2,
+    "C#": 1.2,
+    "Go": 1.1,
+    "Python": 1.0,
+    "JavaScript": 1.0,
+    "TypeScript": 1.1,
+    "PHP": 0.9,
+    "Ruby": 0.9,
+    "HTML": 0.5,
+    "CSS": 0.6,
+    "Markdown": 0.3,
+    "JSON": 0.2,
+    "XML": 0.4,
+    "YAML": 0.3
+}
+
+class ScoringProfile(BaseModel):
+    name: str
+    version: int = 1
+    volume_weight: float = 0.35
+    commit_weight: float = 0.35
+    repository_weight: float = 0.20
+    recency_weight: float = 10.0
+    recency_boost: float = 0.3  # Boost at 100% recent activity
+    language_complexity: Dict[str, float] = Field(default_factory=lambda: dict(DEFAULT_LANGUAGE_COMPLEXITY))
+    default_complexity: float = 1.0
+    
+    @property
+    def label(self) -> str:
+        return f"{self.name}@{self.version}"
+
+class RescoreRequest(AnalysisRequest):
+    profile_name: str = "default"
+    profile_version: Optional[int] = None  # None = latest version
+    profile: Optional[ScoringProfile] = None  # Inline what-if profile (not stored)
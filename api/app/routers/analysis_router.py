@@ -2,19 +2,34 @@
 Analysis Router - GitHub Repository Analysis Endpoints
 
 Design Reference: CLAUDE.md - Backend Architecture
-Endpoints: /analyze (POST), /analyze/{job_id} (GET), /analyze/{job_id}/result (GET)
+Endpoints: /analyze (POST), /analyze/batch (POST), /analyze/{job_id} (GET), /analyze/{job_id}/result (GET),
+/analyze/batch/{job_id}/result (GET),
+/analyze/{job_id}/events (GET, Server-Sent Events), /analyze/{job_id}/result/stream (GET, NDJSON),
+/rescore (POST), /activity (POST), /scoring-profiles (GET, POST: admin token only)
 
 Related Classes:
 - AnalysisService: Core analysis orchestration and job management
 - GitHubService: GitHub API communication for repository data
 - IntencyService: Custom skill intensity calculation algorithms
 - CacheService: Redis caching for GitHub API responses
-- Models: AnalysisRequest, AnalysisJob, AnalysisResult
+- ScoringService: Stored raw aggregates and versioned scoring profiles
+- ActivityService: Monthly commit rollups for activity time series
+- BatchAnalysisService: One deduplicated crawl for a list of users or an organization
+- Models: AnalysisRequest, AnalysisJob, AnalysisResult, RescoreRequest, ScoringProfile,
+  ActivityRequest, ActivityTimeSeries, BatchAnalysisRequest, BatchAnalysisResult
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from app.models.analysis import AnalysisRequest, AnalysisJob, AnalysisResult
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import StreamingResponse
+from app.models.activity import ActivityRequest, ActivityTimeSeries
+from app.models.analysis import AnalysisRequest, AnalysisJob, AnalysisResult, BatchAnalysisRequest, BatchAnalysisResult
+from app.models.scoring import RescoreRequest, ScoringProfile
 from app.services.analysis_service import AnalysisService
+from app.services.batch_analysis_service import BatchAnalysisService
+from typing import AsyncIterator, Dict, List, Optional
+import os
+import hmac
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +44,15 @@ def get_analysis_service() -> AnalysisService:
         _analysis_service_instance = AnalysisService()
     return _analysis_service_instance
 
+# Singleton instance for batch analysis service (shares the analysis service's clients and job store)
+_batch_analysis_service_instance = None
+
+def get_batch_analysis_service() -> BatchAnalysisService:
+    global _batch_analysis_service_instance
+    if _batch_analysis_service_instance is None:
+        _batch_analysis_service_instance = BatchAnalysisService(get_analysis_service())
+    return _batch_analysis_service_instance
+
 @router.post("/analyze", response_model=AnalysisJob)
 async def start_analysis(
     request: AnalysisRequest,
@@ -48,6 +72,46 @@ async def start_analysis(
         logger.error(f"Unexpected error in start_analysis: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/analyze/batch", response_model=AnalysisJob)
+async def start_batch_analysis(
+    request: BatchAnalysisRequest,
+    batch_analysis_service: BatchAnalysisService = Depends(get_batch_analysis_service)
+):
+    """
+    Start one analysis for a list of users and/or an organization's members
+    (progress through /analyze/{job_id} and its event stream)
+    """
+    try:
+        logger.info(
+            f"Starting batch analysis for {len(request.github_usernames)} users, "
+            f"organization: {request.organization}"
+        )
+        return await batch_analysis_service.start_batch_analysis(request)
+    except ValueError as e:
+        logger.error(f"Validation error in start_batch_analysis: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in start_batch_analysis: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/analyze/batch/{job_id}/result", response_model=BatchAnalysisResult)
+async def get_batch_analysis_result(
+    job_id: str,
+    batch_analysis_service: BatchAnalysisService = Depends(get_batch_analysis_service)
+):
+    """
+    Get per-member results and the aggregate of a completed batch analysis
+    """
+    try:
+        logger.debug(f"Getting batch result for job: {job_id}")
+        return await batch_analysis_service.get_batch_result(job_id)
+    except ValueError as e:
+        logger.error(f"Batch result error: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_batch_analysis_result: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/analyze/{job_id}", response_model=AnalysisJob)
 async def get_analysis_status(
     job_id: str,
@@ -67,6 +131,70 @@ async def get_analysis_status(
         logger.error(f"Unexpected error in get_analysis_status: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _format_sse(event: Optional[Dict]) -> str:
+    """
+    Encode a progress event as a Server-Sent Events frame (None = keep-alive comment)
+    """
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+async def _sse_stream(events: AsyncIterator[Optional[Dict]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield _format_sse(event)
+
+@router.get("/analyze/{job_id}/events")
+async def stream_analysis_events(
+    job_id: str,
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    Stream live progress of an analysis job (current state first, then updates until it finishes)
+    """
+    try:
+        # Unknown jobs get a 404 before the stream starts
+        await analysis_service.get_analysis_status(job_id)
+    except ValueError as e:
+        logger.error(f"Job not found: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in stream_analysis_events: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    return StreamingResponse(
+        _sse_stream(analysis_service.stream_progress(job_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _ndjson_stream(frames: AsyncIterator[Optional[Dict]]) -> AsyncIterator[str]:
+    # Blank lines are keep-alives
+    async for frame in frames:
+        yield "\n" if frame is None else json.dumps(frame, default=str) + "\n"
+
+@router.get("/analyze/{job_id}/result/stream")
+async def stream_analysis_result(
+    job_id: str,
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    Stream provisional language rankings while the analysis runs, then the final result (NDJSON)
+    """
+    try:
+        await analysis_service.get_analysis_status(job_id)
+    except ValueError as e:
+        logger.error(f"Job not found: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in stream_analysis_result: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    return StreamingResponse(
+        _ndjson_stream(analysis_service.stream_results(job_id)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/analyze/{job_id}/result", response_model=AnalysisResult)
 async def get_analysis_result(
     job_id: str,
@@ -84,4 +212,83 @@ async def get_analysis_result(
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error in get_analysis_result: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/rescore", response_model=AnalysisResult)
+async def rescore_analysis(
+    request: RescoreRequest,
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    Re-score a previously analyzed user under a stored or inline (what-if) scoring profile
+    """
+    try:
+        logger.info(f"Re-scoring analysis for user: {request.github_username}")
+        return await analysis_service.rescore(request)
+    except ValueError as e:
+        logger.error(f"Rescore error: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in rescore_analysis: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/activity", response_model=ActivityTimeSeries)
+async def get_activity(
+    request: ActivityRequest,
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    Commit activity over time (overall and per language) of a previously analyzed user
+    """
+    try:
+        logger.info(f"Getting activity for user: {request.github_username}")
+        return await analysis_service.activity(request)
+    except ValueError as e:
+        logger.error(f"Activity error: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_activity: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/scoring-profiles", response_model=List[ScoringProfile])
+async def list_scoring_profiles(
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    List available scoring profiles
+    """
+    try:
+        return await analysis_service.scoring_service.list_profiles()
+    except Exception as e:
+        logger.error(f"Unexpected error in list_scoring_profiles: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def require_scoring_admin(authorization: Optional[str] = Header(None)):
+    """
+    Profile registration changes how stored analyses are re-scored: it requires
+    "Authorization: Bearer <SCORING_ADMIN_TOKEN>" and is disabled over HTTP when the token is unset
+    (python rescore.py add-profile always works)
+    """
+    admin_token = os.getenv("SCORING_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Profile registration is disabled; use rescore.py add-profile")
+    if authorization is None or not hmac.compare_digest(authorization.encode(), f"Bearer {admin_token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@router.post("/scoring-profiles", response_model=ScoringProfile, dependencies=[Depends(require_scoring_admin)])
+async def create_scoring_profile(
+    profile: ScoringProfile,
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """
+    Register a new scoring profile version
+    """
+    try:
+        logger.info(f"Registering scoring profile {profile.label}")
+        return await analysis_service.scoring_service.save_profile(profile)
+    except ValueError as e:
+        logger.error(f"Scoring profile error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in create_scoring_profile: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
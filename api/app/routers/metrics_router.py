@@ -0,0 +1,24 @@
+"""
+Metrics Router - Prometheus Scrape Endpoint
+
+Design Reference: CLAUDE.md - Backend Architecture
+Endpoints: /metrics (GET, Prometheus text format)
+
+Related Classes:
+- MetricsService: Samples rate-limit budgets and queue depth, renders every registered metric
+- AnalysisService: Owns the MetricsService wired to its GitHub scheduler and queue
+"""
+
+from fastapi import APIRouter, Depends, Response
+from app.routers.analysis_router import get_analysis_service
+from app.services.analysis_service import AnalysisService
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(analysis_service: AnalysisService = Depends(get_analysis_service)):
+    """
+    Prometheus metrics of this API process
+    """
+    payload, content_type = await analysis_service.metrics_service.render()
+    return Response(content=payload, headers={"Content-Type": content_type})
@@ -0,0 +1,139 @@
+"""
+Activity Service - Monthly Commit Rollups and Activity Time Series
+
+Design Reference: CLAUDE.md - Key Components, Custom "intensity" scores
+Purpose: Serves skill-over-time charts for any date range and granularity without raw commits
+
+Related Classes:
+- AnalysisService: Stores each analysis' rollups and answers activity requests
+- IncrementalRanking: Accumulates per-language monthly commit counts during ingest
+- CommitTimeline: Supplies per-repository monthly counts (one bisect per month boundary)
+- CacheService: Provides the pooled Redis client
+- Models: ActivityRequest, ActivityTimeSeries, LanguageActivity
+
+Storage: Redis hash activity:rollups (analysis identity → rollup), in process memory without Redis
+Rollup: Dense per-month arrays sharing one start month, for all repositories and per language;
+quarters and years are summed from months at query time
+Coverage: Needs commit dates, so analyses run with the GraphQL strategy have no rollup
+"""
+
+from app.models.activity import ActivityRequest, ActivityTimeSeries, LanguageActivity
+from app.models.commit_timeline import month_label, parse_month
+from app.services.cache_service import CacheService
+from redis.exceptions import RedisError
+from typing import Dict, List, Optional
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ActivityService:
+    def __init__(self, cache_service: CacheService):
+        self.redis_client = cache_service.redis_client
+        self.rollups_key = "activity:rollups"
+        
+        # Single-process fallback when Redis is not configured
+        self.rollups: Dict[str, Dict] = {}
+    
+    def build_rollup(
+        self,
+        username: str,
+        analysis_date: str,
+        total_months: Dict[int, int],
+        language_months: Dict[str, Dict[int, int]]
+    ) -> Optional[Dict]:
+        """
+        Compact rollup from month index → count maps (None when there is no dated commit)
+        """
+        if not total_months:
+            return None
+        first, last = min(total_months), max(total_months)
+        
+        def dense(months: Dict[int, int]) -> List[int]:
+            return [months.get(index, 0) for index in range(first, last + 1)]
+        
+        return {
+            "username": username,
+            "analysis_date": analysis_date,
+            "start": month_label(first),
+            "total": dense(total_months),
+            "languages": {language: dense(months) for language, months in language_months.items()}
+        }
+    
+    async def save_rollup(self, identity: str, rollup: Dict):
+        """
+        Persist the rollup of an analysis identity (replacing the previous one)
+        """
+        if self.redis_client is None:
+            self.rollups[identity] = rollup
+            return
+        try:
+            await self.redis_client.hset(self.rollups_key, identity, json.dumps(rollup, separators=(",", ":")))
+        except RedisError as e:
+            # The analysis result is still valid; only the time series is unavailable
+            logger.warning(f"Failed to store activity rollup for {identity}: {e}")
+    
+    async def get_rollup(self, identity: str) -> Optional[Dict]:
+        """
+        Get the stored rollup of an analysis identity
+        """
+        if self.redis_client is None:
+            return self.rollups.get(identity)
+        payload = await self.redis_client.hget(self.rollups_key, identity)
+        return json.loads(payload) if payload is not None else None
+    
+    def time_series(self, rollup: Dict, request: ActivityRequest) -> ActivityTimeSeries:
+        """
+        Slice a rollup to the requested months and sum them into periods
+        """
+        offset = parse_month(rollup["start"])
+        active_last = offset + len(rollup["total"]) - 1
+        # Open ends default to the active months (never producing an empty range)
+        first = parse_month(request.start) if request.start else min(offset, parse_month(request.end or rollup["start"]))
+        last = parse_month(request.end) if request.end else max(active_last, first)
+        
+        periods, bounds = self._periods(first, last, request.granularity)
+        
+        def bucket(months: List[int]) -> List[int]:
+            return [
+                sum(months[max(low - offset, 0):max(high - offset, 0)])
+                for low, high in bounds
+            ]
+        
+        wanted = set(request.languages) if request.languages is not None else None
+        languages = [
+            LanguageActivity(language=language, counts=counts, total=sum(counts))
+            for language, counts in (
+                (language, bucket(months)) for language, months in rollup["languages"].items()
+                if wanted is None or language in wanted
+            )
+        ]
+        languages.sort(key=lambda activity: activity.total, reverse=True)
+        
+        return ActivityTimeSeries(
+            username=rollup["username"],
+            analysis_date=rollup["analysis_date"],
+            granularity=request.granularity,
+            periods=periods,
+            total_counts=bucket(rollup["total"]),
+            languages=languages
+        )
+    
+    def _periods(self, first: int, last: int, granularity: str):
+        """
+        Period labels and their [start, end) month-index bounds covering first..last
+        """
+        size = {"month": 1, "quarter": 3, "year": 12}[granularity]
+        periods, bounds = [], []
+        start = first - first % size
+        while start <= last:
+            if granularity == "month":
+                periods.append(month_label(start))
+            elif granularity == "quarter":
+                periods.append(f"{start // 12:04d}-Q{start % 12 // 3 + 1}")
+            else:
+                periods.append(f"{start // 12:04d}")
+            # Partial periods at the edges only count the requested months
+            bounds.append((max(start, first), min(start + size, last + 1)))
+            start += size
+        return periods, bounds
@@ -8,67 +8,252 @@ Related Classes:
 - GitHubService: Repository and commit data retrieval via GitHub API
 - IntencyService: Custom intensity calculation based on commits, complexity, recency
 - CacheService: Redis caching for API response optimization
-- Models: AnalysisRequest, AnalysisJob, AnalysisResult, LanguageIntensity
+- SnapshotService: Per-repository snapshots so unchanged repositories are not refetched
+- ScoringService: Raw aggregate store for re-scoring under other ScoringProfiles
+- ProgressService: Live progress events and partial results for the streaming endpoints
+- ActivityService: Monthly commit rollups behind the activity time-series endpoint
+- GitMirrorService: Local git mirror engine (ANALYSIS_FETCH_STRATEGY=git)
+- RepositorySelectionService: Listing-metadata pre-filter deciding which per-repository calls are made
+- MetricsService: Prometheus stage timings, job counts and cache reuse
+- Models: AnalysisRequest, AnalysisJob, AnalysisResult, LanguageIntensity, RescoreRequest
 
 Workflow: User repos → Language analysis → Commit history → Intensity calculation → Result aggregation
+Single-flight: Concurrent requests for the same username/options attach to one job, and a result
+completed within ANALYSIS_FRESHNESS_WINDOW is served without crawling GitHub again; running jobs
+send heartbeats (updated_at) and holders silent for ANALYSIS_STALE_AFTER are failed and taken over
+Authors: With ANALYSIS_AUTHOR_FILTER (REST strategy), only the user's commits are fetched and counted:
+the login plus any AnalysisRequest.author_emails, filtered by GitHub (author= / since=); the GraphQL
+strategy counts commits attributed to the user's account (history(author: {id})), without extra emails
+Stats strategy: Weekly per-author commit counts from /stats/contributors; 202 "computing" responses are
+retried later without holding a concurrency slot
+Git strategy: GitMirrorService reads local mirrors (no per-repository API calls) and attributes each
+commit to the languages of the files it touched; mirrors replace snapshots for this strategy
+Selection: Listed repositories pass RepositorySelectionService first (empty ones fetch nothing, ones not
+pushed within the history window fetch languages only); the GraphQL strategy has no per-repository calls to skip
 """
 
-from app.models.analysis import AnalysisRequest, AnalysisJob, AnalysisResult, LanguageIntensity
+from app.models.analysis import AnalysisRequest, AnalysisJob, AnalysisResult
+from app.models.activity import ActivityRequest, ActivityTimeSeries
+from app.models.commit_timeline import CommitTimeline
+from app.models.scoring import RescoreRequest
+from app.services.activity_service import ActivityService
+from app.services.git_mirror_service import GitMirrorService
 from app.services.github_service import GitHubService
 from app.services.intency_service import IntencyService
 from app.services.cache_service import CacheService
+from app.services.job_store_service import create_job_store, FINISHED_STATUSES
+from app.services.metrics_service import ANALYSES, JOBS_IN_FLIGHT, STAGE_DURATION, MetricsService, observe_cache
+from app.services.repository_selection_service import DROPPED_OUTCOMES, RepositorySelectionService
+from app.services.progress_service import JobProgress, ProgressService
+from app.services.snapshot_service import SnapshotService
+from app.services.scoring_service import IncrementalRanking, ScoringService
+from app.services.queue_service import AnalysisQueueService
+from app.services.rate_limit_service import RequestPriority, request_priority
+import os
+import time
 import uuid
+import hashlib
 import logging
 import asyncio
-from datetime import datetime
-from typing import Dict, List
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
 class AnalysisService:
     def __init__(self):
-        self.github_service = GitHubService()
-        self.intency_service = IntencyService()
         self.cache_service = CacheService()
-        self.jobs: Dict[str, AnalysisJob] = {}
+        self.github_service = GitHubService(self.cache_service)
+        self.intency_service = IntencyService()
+        self.job_store = create_job_store(self.cache_service)
+        self.snapshot_service = SnapshotService(self.cache_service)
+        self.scoring_service = ScoringService(self.cache_service)
+        self.progress_service = ProgressService(self.cache_service)
+        self.activity_service = ActivityService(self.cache_service)
+        self.git_mirror_service = GitMirrorService()
+        self.repository_selection = RepositorySelectionService()
+        
+        # Where analyses run: "local" (task on this event loop) or "queue" (worker.py processes)
+        self.execution_mode = os.getenv("ANALYSIS_EXECUTION", "local").lower()
+        self.queue_service = (
+            AnalysisQueueService(self.cache_service.redis_client)
+            if self.cache_service.enabled else None
+        )
+        if self.execution_mode == "queue" and self.queue_service is None:
+            raise ValueError("ANALYSIS_EXECUTION=queue requires REDIS_URL")
+        self._tasks: Set[asyncio.Task] = set()
+        self.metrics_service = MetricsService(self.github_service.rate_limit_service, self.queue_service)
+        
+        # Bounded fan-out for per-repository GitHub calls
+        # Per job: how many repositories a single analysis fetches at once
+        # Per process: shared cap across all jobs running in this worker
+        self.repo_concurrency_per_job = max(1, int(os.getenv("ANALYSIS_REPO_CONCURRENCY", "8")))
+        self.repo_concurrency_per_process = max(1, int(os.getenv("ANALYSIS_PROCESS_REPO_CONCURRENCY", "32")))
+        self._process_semaphore = asyncio.Semaphore(self.repo_concurrency_per_process)
+        
+        # How repository data is fetched: "rest" (1 + 2N calls), "graphql" (batched, token required),
+        # "stats" (contributor statistics: full weekly history in one call per repository)
+        # or "git" (local git mirrors: full history and per-language commits, listing calls only)
+        self.fetch_strategy = os.getenv("ANALYSIS_FETCH_STRATEGY", "rest").lower()
+        # Stats strategy: retries while GitHub computes statistics (202), first delay in seconds, doubling
+        self.stats_max_attempts = max(1, int(os.getenv("ANALYSIS_STATS_MAX_ATTEMPTS", "4")))
+        self.stats_retry_delay = float(os.getenv("ANALYSIS_STATS_RETRY_DELAY", "2"))
+        
+        # Stop paginating commits older than this many months (0 = full history)
+        self.history_months = int(os.getenv("ANALYSIS_HISTORY_MONTHS", "0"))
+        
+        # Count only the analyzed user's commits, filtered by GitHub (author=) instead of client-side
+        self.author_filter = os.getenv("ANALYSIS_AUTHOR_FILTER", "true").lower() == "true"
+        
+        # Windowed commit counts (months) computed once per repository and summed per language
+        self.activity_windows = sorted({
+            int(months) for months in os.getenv("ANALYSIS_ACTIVITY_WINDOWS", "3,6,12,24").split(",")
+            if months.strip()
+        })
+        
+        # Seconds a completed analysis is reused for identical requests (0 = in-flight dedupe only)
+        self.freshness_window = int(os.getenv("ANALYSIS_FRESHNESS_WINDOW", "600"))
+        # Running jobs refresh updated_at this often; holders silent for ANALYSIS_STALE_AFTER seconds
+        # (e.g. after a restart) are treated as dead and their flight is taken over
+        self.heartbeat_interval = float(os.getenv("ANALYSIS_HEARTBEAT_INTERVAL", "30"))
+        self.stale_after = float(os.getenv("ANALYSIS_STALE_AFTER", "120"))
     
-    async def start_analysis(self, request: AnalysisRequest) -> AnalysisJob:
+    async def start_analysis(
+        self,
+        request: AnalysisRequest,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> AnalysisJob:
         """
         Start GitHub repository analysis
+        Background refreshes pass RequestPriority.BACKGROUND so user-facing jobs get GitHub budget first
+        Returns the existing job when an identical analysis is in flight or freshly completed
         """
         job_id = str(uuid.uuid4())
+        now = datetime.now()
         job = AnalysisJob(
             job_id=job_id,
             status="pending",
-            created_at=datetime.now()
+            created_at=now,
+            updated_at=now
         )
         
-        self.jobs[job_id] = job
+        # Saved before claiming so a concurrent request never sees a flight without its job
+        await self.job_store.save(job)
         
-        # Start analysis in background
-        asyncio.create_task(self._perform_analysis(job_id, request))
+        shared_job = await self._claim_flight(request, job_id)
+        observe_cache("analysis", "miss" if shared_job is None else "hit")
+        if shared_job is not None:
+            await self.job_store.delete(job_id)
+            logger.info(
+                f"Reusing analysis job {shared_job.job_id} ({shared_job.status}) "
+                f"for user {request.github_username}"
+            )
+            return shared_job
+        
+        try:
+            if self.execution_mode == "queue":
+                # Hand off to a worker process
+                await self.queue_service.enqueue(job_id, request, priority)
+            else:
+                # Start analysis in background, keeping a reference so the task is not garbage-collected
+                task = asyncio.create_task(self._perform_analysis(job_id, request, priority))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except Exception:
+            # A job that never starts must not capture identical requests
+            await self.job_store.release_flight(self._flight_key(request), job_id)
+            await self.job_store.delete(job_id)
+            raise
         
         logger.info(f"Started analysis job {job_id} for user {request.github_username}")
         return job
     
+    async def _claim_flight(self, request: AnalysisRequest, job_id: str) -> Optional[AnalysisJob]:
+        """
+        Register job_id as the single flight for this request
+        Returns the job to share instead, or None if job_id should run
+        """
+        flight_key = self._flight_key(request)
+        
+        for _ in range(2):
+            holder_id = await self.job_store.claim_flight(flight_key, job_id, self.job_store.active_ttl)
+            if holder_id is None:
+                return None
+            
+            holder = await self.job_store.get(holder_id)
+            if self._is_shareable(holder):
+                return holder
+            if holder is not None and holder.status not in FINISHED_STATUSES:
+                logger.warning(f"Analysis job {holder_id} stopped sending heartbeats, taking its flight over")
+                await self.fail_job(holder_id, "Analysis stopped responding")
+            
+            # Failed, stale or expired holder: take the flight over
+            await self.job_store.release_flight(flight_key, holder_id)
+        
+        logger.warning(f"Could not claim analysis flight {flight_key}, running unshared")
+        return None
+    
+    def _is_shareable(self, job: Optional[AnalysisJob]) -> bool:
+        """
+        Whether a job can serve an identical request: still running (heartbeat within
+        ANALYSIS_STALE_AFTER; queued jobs wait for a worker and are bounded by JOB_ACTIVE_TTL),
+        or completed recently
+        """
+        if job is None:
+            return False
+        if job.status == "pending" and self.execution_mode == "queue":
+            return True
+        if job.status in ("pending", "processing"):
+            last_seen = job.updated_at or job.created_at
+            return datetime.now() - last_seen <= timedelta(seconds=self.stale_after)
+        if job.status == "completed" and job.completed_at is not None:
+            return datetime.now() - job.completed_at <= timedelta(seconds=self.freshness_window)
+        return False
+    
+    def _flight_key(self, request: AnalysisRequest) -> str:
+        """
+        Identity of an analysis: username, visibility, the token it runs as and any extra
+        author emails (results fetched with a token are never shared with other tokens)
+        """
+        visibility = "private" if request.include_private else "public"
+        token_scope = self.github_service.token_scope(request.access_token)
+        identity = f"{request.github_username.lower()}:{visibility}:{token_scope}"
+        emails = self._author_aliases(request)[1:]
+        if emails:
+            # Extra commit emails change the counted commits
+            identity += ":" + hashlib.sha256(",".join(emails).encode("utf-8")).hexdigest()[:16]
+        return identity
+    
+    def _author_aliases(self, request: AnalysisRequest) -> List[str]:
+        """
+        Authors whose commits count as the user's: the login (which GitHub resolves to every email
+        linked to the account) followed by the extra commit emails, lowercased and deduplicated
+        """
+        aliases = [request.github_username.lower()]
+        for email in request.author_emails:
+            email = email.strip().lower()
+            if email and email not in aliases:
+                aliases.append(email)
+        return aliases
+    
     async def get_analysis_status(self, job_id: str) -> AnalysisJob:
         """
         Get analysis job status
         """
-        if job_id not in self.jobs:
+        job = await self.job_store.get(job_id)
+        if job is None:
             raise ValueError(f"Job {job_id} not found")
         
-        return self.jobs[job_id]
+        return job
     
     async def get_analysis_result(self, job_id: str) -> AnalysisResult:
         """
         Get completed analysis result
         """
-        if job_id not in self.jobs:
+        job = await self.job_store.get(job_id)
+        if job is None:
             raise ValueError(f"Job {job_id} not found")
         
-        job = self.jobs[job_id]
         if job.status != "completed":
             raise ValueError(f"Job {job_id} is not completed (status: {job.status})")
         
@@ -77,137 +262,570 @@ class AnalysisService:
         
         return job.result
     
-    async def _perform_analysis(self, job_id: str, request: AnalysisRequest):
+    async def stream_progress(self, job_id: str) -> AsyncIterator[Optional[Dict]]:
+        """
+        Current job state followed by live progress events until the job finishes
+        Yields None when nothing happened for a heartbeat interval
+        """
+        async with self.progress_service.subscribe(job_id) as subscription:
+            # Subscribed before reading the job so no event between the two is lost
+            event = self._job_event(await self.get_analysis_status(job_id))
+            
+            while True:
+                yield event
+                if event is not None and event['type'] in FINISHED_STATUSES:
+                    return
+                
+                event = await subscription.next_event(self.progress_service.heartbeat_interval)
+                if event is None:
+                    # Quiet period: re-check the store in case the job ended without an event
+                    try:
+                        job = await self.get_analysis_status(job_id)
+                    except ValueError:
+                        return
+                    if job.status in FINISHED_STATUSES:
+                        event = self._job_event(job)
+    
+    async def stream_results(self, job_id: str) -> AsyncIterator[Optional[Dict]]:
+        """
+        Provisional rankings ("partial") as repositories finish, then a "final" frame
+        with the AnalysisResult (or the "failed" event); None = keep-alive
+        """
+        async for event in self.stream_progress(job_id):
+            if event is None or event['type'] in ('partial', 'failed'):
+                yield event
+            elif event['type'] == 'completed':
+                result = await self.get_analysis_result(job_id)
+                yield {'type': 'final', 'job_id': job_id, 'result': result.model_dump(mode='json')}
+    
+    def _job_event(self, job: AnalysisJob) -> Dict:
+        """
+        Progress event describing a job's current state
+        """
+        return {
+            'type': job.status if job.status in FINISHED_STATUSES else 'progress',
+            'job_id': job.job_id,
+            'status': job.status,
+            'progress': job.progress.model_dump() if job.progress is not None else None,
+            'error_message': job.error_message
+        }
+    
+    async def _perform_analysis(
+        self,
+        job_id: str,
+        request: AnalysisRequest,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+    ):
         """
         Perform the actual analysis work
         """
+        # Every GitHub request made by this job (and its child tasks) is scheduled at this priority
+        request_priority.set(priority)
+        # Provisional ranking in completion order, scored under the same profile as the result
+        progress = self.progress_service.tracker(
+            job_id, IncrementalRanking(IntencyService(self.intency_service.profile))
+        )
+        JOBS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        heartbeat = None
+        
         try:
-            job = self.jobs[job_id]
+            job = await self.job_store.get(job_id)
+            if job is None:
+                raise ValueError(f"Job {job_id} not found")
             job.status = "processing"
+            job.progress = progress.progress
+            job.updated_at = datetime.now()
+            await self.job_store.save(job)
+            heartbeat = asyncio.create_task(self._heartbeat(job))
+            await progress.phase("listing")
             
             logger.info(f"Starting analysis for {request.github_username}")
             
-            # Step 1: Get user repositories
-            repos = await self.github_service.get_user_repositories(
-                request.github_username, 
-                request.access_token
-            )
+            # Step 1 + 2: Stream user repositories and fan out per-repository fetches
+            # as each listing page arrives
+            repos, repo_data = await self._fetch_all_repository_data(request, progress)
+            await progress.phase("scoring")
             
             logger.info(f"Found {len(repos)} repositories for {request.github_username}")
             
-            # Step 2: Analyze each repository
-            language_stats = defaultdict(lambda: {
-                'total_bytes': 0,
-                'repository_count': 0,
-                'commit_count': 0,
-                'recent_activity': 0,
-                'total_commits': 0
-            })
+            with STAGE_DURATION.labels("scoring").time():
+                # Aggregate in listing order so results are deterministic
+                aggregate = IncrementalRanking(self.intency_service)
+                for repo, data in zip(repos, repo_data):
+                    if data is None:
+                        continue
+                    aggregate.add(data)
+                    logger.debug(f"Processed repo {repo['name']}: {len(data['languages'])} languages, {data['commit_count']} commits")
+                
+                # Step 3: Calculate intensities
+                language_intensities = aggregate.ranking()
             
-            total_commits = 0
+            total_commits = aggregate.total_commits
+            analysis_date = datetime.now()
             
-            for repo in repos:
-                try:
-                    # Get language information
-                    languages = await self.github_service.get_repository_languages(
-                        request.github_username,
-                        repo['name'],
-                        request.access_token
-                    )
-                    
-                    # Get commit history for intensity calculation
-                    commits = await self.github_service.get_commit_history(
-                        request.github_username,
-                        repo['name'],
-                        request.access_token
-                    )
-                    
-                    # Process languages with time-weighted commits
-                    for language, bytes_count in languages.items():
-                        language_stats[language]['total_bytes'] += bytes_count
-                        language_stats[language]['repository_count'] += 1
-                        
-                        # Filter commits for time-weighted analysis
-                        recent_commits = self._filter_recent_commits(commits, 12)  # Last 12 months
-                        language_stats[language]['commit_count'] += len(commits)  # Use all commits for intensity
-                        language_stats[language]['recent_activity'] = len(recent_commits)
-                        language_stats[language]['total_commits'] = len(commits)
-                    
-                    total_commits += len(commits)
-                    
-                    logger.debug(f"Processed repo {repo['name']}: {len(languages)} languages, {len(commits)} commits")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to analyze repository {repo['name']}: {e}")
-                    continue
-            
-            # Step 3: Calculate intensities and create result
-            language_intensities = []
-            
-            for language, stats in language_stats.items():
-                intensity = self.intency_service.calculate_language_intensity(
-                    language=language,
-                    total_bytes=stats['total_bytes'],
-                    commit_count=stats['commit_count'],
-                    repository_count=stats['repository_count'],
-                    recent_activity=stats.get('recent_activity', 0)
-                )
-                
-                language_intensities.append(LanguageIntensity(
-                    language=language,
-                    intensity=intensity,
-                    commit_count=stats['commit_count'],
-                    line_count=stats['total_bytes'] // 50,  # Rough estimation: 50 bytes per line
-                    repository_count=stats['repository_count']
-                ))
+            # Keep the raw aggregates so the result can be re-scored without GitHub calls
+            await self.scoring_service.save_aggregates(self._flight_key(request), {
+                'username': request.github_username,
+                'analysis_date': analysis_date.isoformat(),
+                'total_repositories': len(repos),
+                'total_commits': total_commits,
+                'analysis_period_months': 12,
+                'languages': {language: dict(stats) for language, stats in aggregate.language_stats.items()}
+            })
             
-            # Sort by intensity (highest first)
-            language_intensities.sort(key=lambda x: x.intensity, reverse=True)
+            # Monthly rollups answer activity time-series requests without raw commits
+            rollup = self.activity_service.build_rollup(
+                request.github_username, analysis_date.isoformat(), aggregate.total_months, aggregate.language_months
+            )
+            if rollup is not None:
+                await self.activity_service.save_rollup(self._flight_key(request), rollup)
             
             # Step 4: Create analysis result
             result = AnalysisResult(
                 username=request.github_username,
-                analysis_date=datetime.now(),
+                analysis_date=analysis_date,
                 languages=language_intensities,
                 total_repositories=len(repos),
                 total_commits=total_commits,
-                analysis_period_months=12  # Default analysis period
+                analysis_period_months=12,  # Default analysis period
+                scoring_profile=self.intency_service.profile.label
             )
             
-            # Update job status
+            # Update job status (the heartbeat is stopped first so it cannot overwrite the final state)
+            await self._stop_heartbeat(heartbeat)
             job.status = "completed"
             job.completed_at = datetime.now()
             job.result = result
+            job.progress.phase = "completed"
+            await self.job_store.save(job)
+            await self.progress_service.publish(job_id, self._job_event(job))
+            await self.job_store.release_flight(self._flight_key(request), job_id, self.freshness_window)
+            ANALYSES.labels("completed").inc()
             
             logger.info(f"Completed analysis for {request.github_username}: {len(language_intensities)} languages")
             
         except Exception as e:
             logger.error(f"Analysis failed for job {job_id}: {e}")
-            job = self.jobs[job_id]
-            job.status = "failed"
-            job.error_message = str(e)
-            job.completed_at = datetime.now()
+            await self._stop_heartbeat(heartbeat)
+            await self.fail_job(job_id, str(e))
+            await self.job_store.release_flight(self._flight_key(request), job_id)
+        finally:
+            await self._stop_heartbeat(heartbeat)
+            JOBS_IN_FLIGHT.dec()
+            STAGE_DURATION.labels("analysis").observe(time.perf_counter() - started)
     
-    def _filter_recent_commits(self, commits: List[Dict], months_back: int) -> List[Dict]:
+    async def _heartbeat(self, job: AnalysisJob):
         """
-        Filter commits to only include those within the specified months back
+        Refresh the running job's updated_at so identical requests can tell it from an orphan
         """
-        if months_back <= 0:
-            return commits
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            job.updated_at = datetime.now()
+            try:
+                await self.job_store.save(job)
+            except ValueError as e:
+                logger.warning(f"Failed to record heartbeat of job {job.job_id}: {e}")
+    
+    async def _stop_heartbeat(self, heartbeat: Optional[asyncio.Task]):
+        if heartbeat is None or heartbeat.done():
+            return
+        heartbeat.cancel()
+        try:
+            await heartbeat
+        except asyncio.CancelledError:
+            pass
+    
+    async def rescore(self, request: RescoreRequest) -> AnalysisResult:
+        """
+        Re-score the stored aggregates of a previous analysis under another scoring profile
+        (no GitHub calls; the identity matches the original request's username, options and token)
+        """
+        aggregates = await self.scoring_service.get_aggregates(self._flight_key(request))
+        if aggregates is None:
+            raise ValueError(f"No stored analysis for {request.github_username}")
         
-        from datetime import datetime, timedelta
-        cutoff_date = datetime.now() - timedelta(days=months_back * 30)
+        profile = request.profile or await self.scoring_service.get_profile(
+            request.profile_name, request.profile_version
+        )
+        return self.scoring_service.rescore([aggregates], profile)[0]
+    
+    async def activity(self, request: ActivityRequest) -> ActivityTimeSeries:
+        """
+        Commit activity over time of a previous analysis, from its monthly rollup
+        (same identity rules as rescore)
+        """
+        rollup = await self.activity_service.get_rollup(self._flight_key(request))
+        if rollup is None:
+            raise ValueError(f"No activity history for {request.github_username}")
+        return self.activity_service.time_series(rollup, request)
+    
+    async def fail_job(self, job_id: str, error_message: str):
+        """
+        Mark a job as failed
+        """
+        job = await self.job_store.get(job_id)
+        if job is None:
+            return
+        job.status = "failed"
+        job.error_message = error_message
+        job.completed_at = datetime.now()
+        if job.progress is not None:
+            job.progress.phase = "failed"
+        await self.job_store.save(job)
+        await self.progress_service.publish(job_id, self._job_event(job))
+        ANALYSES.labels("failed").inc()
+    
+    async def _fetch_all_repository_data(
+        self,
+        request: AnalysisRequest,
+        progress: Optional[JobProgress] = None
+    ) -> Tuple[List[Dict], List[Optional[Dict]]]:
+        """
+        Collect per-repository activity (languages, commit_count, recent_activity)
+        using the configured fetch strategy
+        """
+        if self.fetch_strategy == "graphql":
+            if request.access_token:
+                return await self._fetch_all_repository_data_graphql(request, progress)
+            logger.info("GraphQL strategy requires an access token, falling back to REST")
+        
+        return await self._fetch_all_repository_data_rest(request, progress)
+    
+    async def _fetch_all_repository_data_graphql(
+        self,
+        request: AnalysisRequest,
+        progress: Optional[JobProgress] = None
+    ) -> Tuple[List[Dict], List[Optional[Dict]]]:
+        """
+        Batched strategy: repositories, language sizes and commit counts in a few GraphQL queries
+        """
+        repos: List[Dict] = []
+        repo_data: List[Optional[Dict]] = []
+        recent_cutoff = datetime.now(timezone.utc) - timedelta(days=12 * 30)  # Last 12 months
+        started = time.perf_counter()
         
-        recent_commits = []
-        for commit in commits:
+        async for page in self.github_service.iter_repository_activity(
+            request.github_username,
+            request.access_token,
+            since=recent_cutoff,
+            windows=self._window_cutoffs(),
+            own_commits=self.author_filter
+        ):
+            if progress is not None:
+                await progress.discovered(len(page))
+            
+            for repo in page:
+                repos.append(repo)
+                repo_data.append({
+                    'languages': repo['languages'],
+                    'commit_count': repo['commit_count'],
+                    'recent_activity': repo['recent_commit_count'],
+                    'activity': repo['activity']
+                })
+                if progress is not None:
+                    await progress.processed(repo_data[-1])
+        
+        STAGE_DURATION.labels("graphql").observe(time.perf_counter() - started)
+        if progress is not None:
+            await progress.phase("fetching")
+        return repos, repo_data
+    
+    async def _fetch_all_repository_data_rest(
+        self,
+        request: AnalysisRequest,
+        progress: Optional[JobProgress] = None
+    ) -> Tuple[List[Dict], List[Optional[Dict]]]:
+        """
+        REST strategy: stream repository pages and start fetching each repository
+        while later pages download
+        """
+        job_semaphore = asyncio.Semaphore(self.repo_concurrency_per_job)
+        repos: List[Dict] = []
+        tasks: List[asyncio.Task] = []
+        started = time.perf_counter()
+        
+        history_cutoff = self._history_cutoff()
+        selection = self.repository_selection
+        
+        try:
+            async for page in self.github_service.iter_user_repositories(
+                request.github_username,
+                request.access_token
+            ):
+                added = 0
+                for index, repo in enumerate(page):
+                    if selection.limit_reached(len(repos)):
+                        selection.sampled(len(page) - index)
+                        break
+                    outcome = selection.select(repo, history_cutoff)
+                    if outcome in DROPPED_OUTCOMES:
+                        continue
+                    repos.append(repo)
+                    tasks.append(asyncio.create_task(
+                        self._fetch_repository_data(request, repo, job_semaphore, progress, outcome)
+                    ))
+                    added += 1
+                if progress is not None:
+                    await progress.discovered(added)
+                if selection.limit_reached(len(repos)):
+                    # Listings are most recently updated first: later pages are not needed
+                    logger.info(f"Analyzing the first {len(repos)} repositories of {request.github_username}")
+                    break
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        STAGE_DURATION.labels("listing").observe(time.perf_counter() - started)
+        if progress is not None:
+            await progress.phase("fetching")
+        return repos, list(await asyncio.gather(*tasks))
+    
+    async def _fetch_repository_data(
+        self,
+        request: AnalysisRequest,
+        repo: Dict,
+        job_semaphore: asyncio.Semaphore,
+        progress: Optional[JobProgress] = None,
+        outcome: str = "analyze"
+    ) -> Optional[Dict]:
+        """
+        Fetch language and commit data for one repository and report it to the job's progress
+        outcome: the repository's pre-filter outcome (empty repositories are counted without fetching)
+        """
+        if outcome == "empty":
+            data = None
+        else:
+            data = await self._load_repository_data(
+                request, repo, job_semaphore, with_commits=outcome != "languages"
+            )
+        if progress is not None:
+            await progress.processed(data)
+        return data
+    
+    async def _load_repository_data(
+        self,
+        request: AnalysisRequest,
+        repo: Dict,
+        job_semaphore: asyncio.Semaphore,
+        with_commits: bool = True
+    ) -> Optional[Dict]:
+        """
+        Fetch language and commit data for one repository
+        Repositories not pushed to since their stored snapshot are served from the snapshot
+        Without with_commits (no commits can fall in the history window), only languages are fetched
+        Returns None when the repository fails so the rest of the job continues
+        """
+        authors = self._commit_authors(request)
+        if self.fetch_strategy == "git":
+            return await self._load_repository_mirror(request, repo, authors, job_semaphore)
+        
+        scope = self.github_service.token_scope(request.access_token)
+        snapshot = await self.snapshot_service.get(request.github_username, repo['name'], scope)
+        if self.snapshot_service.is_current(snapshot, repo, self.history_months, authors, self.fetch_strategy):
+            logger.debug(f"Repository {repo['name']} unchanged since last analysis, using snapshot")
+            observe_cache("snapshot", "hit")
+            return self._summarize_snapshot(snapshot)
+        if self.snapshot_service.enabled:
+            observe_cache("snapshot", "miss")
+        
+        try:
+            if not with_commits:
+                async with job_semaphore, self._process_semaphore:
+                    languages = await self._timed("languages", self.github_service.get_repository_languages(
+                        request.github_username,
+                        repo['name'],
+                        request.access_token
+                    ))
+                timeline = CommitTimeline()
+            elif self.fetch_strategy == "stats":
+                languages, timeline = await self._fetch_repository_stats(request, repo, job_semaphore)
+            else:
+                async with job_semaphore, self._process_semaphore:
+                    languages, timeline = await asyncio.gather(
+                        self._timed("languages", self.github_service.get_repository_languages(
+                            request.github_username,
+                            repo['name'],
+                            request.access_token
+                        )),
+                        self._timed("commits", self._fetch_commit_timeline(request, repo, authors))
+                    )
+        except Exception as e:
+            logger.warning(f"Failed to analyze repository {repo['name']}: {e}")
+            return None
+        
+        await self.snapshot_service.save(
+            request.github_username, repo, scope, languages, timeline, self.history_months, authors,
+            self.fetch_strategy
+        )
+        
+        return self._summarize_timeline(languages, timeline)
+    
+    async def _load_repository_mirror(
+        self,
+        request: AnalysisRequest,
+        repo: Dict,
+        authors: Optional[List[str]],
+        job_semaphore: asyncio.Semaphore
+    ) -> Optional[Dict]:
+        """
+        Git strategy: languages, commits and per-language commit attribution from the local mirror
+        """
+        cutoff = self._history_cutoff()
+        async with job_semaphore, self._process_semaphore:
             try:
-                commit_date = datetime.fromisoformat(
-                    commit['author']['date'].replace('Z', '+00:00')
+                languages, timeline, language_timelines = await self._timed(
+                    "mirror",
+                    self.git_mirror_service.analyze_repository(
+                        request.github_username,
+                        repo,
+                        request.access_token,
+                        authors=authors,
+                        since_timestamp=int(cutoff.timestamp()) if cutoff is not None else None
+                    )
                 )
-                if commit_date >= cutoff_date:
-                    recent_commits.append(commit)
-            except (KeyError, ValueError, TypeError):
-                # Skip commits with invalid date format
-                continue
+            except Exception as e:
+                logger.warning(f"Failed to analyze repository {repo['name']}: {e}")
+                return None
         
-        return recent_commits
\ No newline at end of file
+        return self._summarize_timeline(languages, timeline, language_timelines)
+    
+    def _commit_authors(self, request: AnalysisRequest) -> Optional[List[str]]:
+        """
+        Authors whose commits are counted (None = every commit)
+        Contributor statistics only know GitHub logins, so the stats strategy counts the login alone
+        """
+        if self.fetch_strategy == "stats":
+            return [request.github_username.lower()]
+        return self._author_aliases(request) if self.author_filter else None
+    
+    def _fetch_commit_timeline(self, request: AnalysisRequest, repo: Dict, authors: Optional[List[str]]) -> Awaitable[CommitTimeline]:
+        return self.github_service.get_commit_timeline(
+            request.github_username,
+            repo['name'],
+            request.access_token,
+            since=self._history_cutoff(),
+            authors=authors
+        )
+    
+    async def _fetch_repository_stats(
+        self,
+        request: AnalysisRequest,
+        repo: Dict,
+        job_semaphore: asyncio.Semaphore
+    ) -> Tuple[Dict[str, int], CommitTimeline]:
+        """
+        Stats strategy: languages plus the user's weekly commit counts for the whole history
+        from /stats/contributors (one request per repository)
+        While GitHub is still computing the statistics (202), the retry waits outside the
+        concurrency limits so other repositories proceed; once ANALYSIS_STATS_MAX_ATTEMPTS are
+        used up the user's commits are listed instead
+        """
+        login = request.github_username.lower()
+        languages = None
+        delay = self.stats_retry_delay
+        
+        for attempt in range(self.stats_max_attempts):
+            async with job_semaphore, self._process_semaphore:
+                stats_call = self._timed("stats", self.github_service.get_contributor_stats(
+                    request.github_username,
+                    repo['name'],
+                    request.access_token
+                ))
+                if languages is None:
+                    languages, stats = await asyncio.gather(
+                        self._timed("languages", self.github_service.get_repository_languages(
+                            request.github_username,
+                            repo['name'],
+                            request.access_token
+                        )),
+                        stats_call
+                    )
+                else:
+                    stats = await stats_call
+            
+            if stats is not None:
+                weeks = stats.get(login, [])
+                cutoff = self._history_cutoff()
+                if cutoff is not None:
+                    # Keep weeks that overlap the history window
+                    start = cutoff.timestamp() - 7 * 86400
+                    weeks = [week for week in weeks if week[0] > start]
+                return languages, CommitTimeline.from_weekly_counts(weeks)
+            
+            if attempt + 1 < self.stats_max_attempts:
+                logger.debug(f"Statistics for {repo['name']} are being computed, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay *= 2
+        
+        logger.info(f"Statistics for {repo['name']} still not ready, listing commits instead")
+        async with job_semaphore, self._process_semaphore:
+            timeline = await self._timed("commits", self._fetch_commit_timeline(request, repo, [login]))
+        return languages, timeline
+    
+    async def _timed(self, stage: str, awaitable: Awaitable[Any]) -> Any:
+        """
+        Await a pipeline stage and record its duration
+        """
+        with STAGE_DURATION.labels(stage).time():
+            return await awaitable
+    
+    def _summarize_snapshot(self, snapshot: Dict) -> Dict:
+        """
+        Per-repository activity from a snapshot (recent activity is relative to now)
+        """
+        return self._summarize_timeline(snapshot['languages'], self.snapshot_service.timeline(snapshot))
+    
+    def _summarize_timeline(
+        self,
+        languages: Dict[str, int],
+        timeline: CommitTimeline,
+        language_timelines: Optional[Dict[str, CommitTimeline]] = None
+    ) -> Dict:
+        """
+        Per-repository activity, computed once per repository: commit count, recent activity,
+        windowed commit counts ({"<months>": count}) and monthly counts (month index → count)
+        With per-language timelines, each language is credited only with the commits touching it
+        (the same counts, per language, under 'language_commits')
+        """
+        summary = {'languages': languages, **self._timeline_activity(timeline)}
+        if language_timelines is not None:
+            summary['language_commits'] = {
+                language: self._timeline_activity(commits) for language, commits in language_timelines.items()
+            }
+        return summary
+    
+    def _timeline_activity(self, timeline: CommitTimeline) -> Dict:
+        return {
+            'commit_count': len(timeline),
+            'recent_activity': self._count_recent_commits(timeline, 12),  # Last 12 months
+            'activity': {
+                str(months): timeline.count_since(cutoff)
+                for months, cutoff in self._window_cutoffs().items()
+            },
+            'monthly': timeline.monthly_counts()
+        }
+    
+    def _window_cutoffs(self) -> Dict[int, datetime]:
+        """
+        Start of each activity window, relative to now (UTC)
+        """
+        now = datetime.now(timezone.utc)
+        return {months: now - timedelta(days=months * 30) for months in self.activity_windows}
+    
+    def _history_cutoff(self) -> Optional[datetime]:
+        """
+        Oldest commit date worth paginating to, in UTC (None = full history)
+        """
+        if self.history_months <= 0:
+            return None
+        return datetime.now(timezone.utc) - timedelta(days=self.history_months * 30)
+    
+    def _count_recent_commits(self, timeline: CommitTimeline, months_back: int) -> int:
+        """
+        Count commits within the specified months back (0 = all commits)
+        """
+        if months_back <= 0:
+            return len(timeline)
+        return timeline.count_since(datetime.now(timezone.utc) - timedelta(days=months_back * 30))
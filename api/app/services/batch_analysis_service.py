@@ -0,0 +1,368 @@
+"""
+Batch Analysis Service - Team and Organization Analysis with Shared-Repository Deduplication
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Analyzes many members in one planned crawl instead of one independent job per member
+
+Related Classes:
+- AnalysisService: Shares its GitHub client, job store, progress events and concurrency limits
+- GitHubService: Organization members and repositories, member listings, per-author commit timelines
+- IncrementalRanking: One ranking per member plus the organization-level aggregate
+- Models: BatchAnalysisRequest, BatchAnalysisResult, AnalysisJob, AnalysisResult
+
+Plan: Members (listed + organization members) → distinct repositories (the organization's and every
+member's own, deduplicated by owner/name) → languages and commits fetched once per repository
+Attribution: As in a single analysis, with ANALYSIS_AUTHOR_FILTER (default) every repository counts only
+the commits authored by the member's GitHub login; without it a member's own repositories count all
+their commits. The aggregate counts members' commits (all commits of members' own repositories when
+the filter is off)
+Budget: GitHub calls grow with distinct repositories instead of members × repositories; batches run
+at RequestPriority.BACKGROUND so interactive analyses get the rate-limit budget first
+Execution: Like single analyses, a task on this event loop (ANALYSIS_EXECUTION=local) or a queued
+message run by worker.py (queue), which retries it if the worker crashes
+Selection: The analysis service's RepositorySelectionService pre-filters the plan (empty, archived and
+stale repositories are left out; ANALYSIS_MAX_REPOSITORIES applies to single analyses only)
+"""
+
+from app.models.analysis import AnalysisJob, AnalysisResult, BatchAnalysisRequest, BatchAnalysisResult
+from app.models.commit_timeline import CommitTimeline
+from app.services.analysis_service import AnalysisService
+from app.services.metrics_service import ANALYSES, JOBS_IN_FLIGHT, STAGE_DURATION
+from app.services.progress_service import JobProgress
+from app.services.repository_selection_service import DROPPED_OUTCOMES
+from app.services.scoring_service import IncrementalRanking
+from app.services.rate_limit_service import RequestPriority, request_priority
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+import os
+import time
+import uuid
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PlannedRepository:
+    owner: str
+    repo: Dict
+    member: Optional[str]  # Lowercased login of the member owning it (None = organization/non-member)
+    with_commits: bool = True  # False = not pushed within the history window, languages only
+
+@dataclass
+class CrawledRepository:
+    languages: Dict[str, int]
+    timeline: CommitTimeline
+    authors: Dict[str, CommitTimeline]  # Members' commits only, by lowercased login
+
+class BatchAnalysisService:
+    def __init__(self, analysis_service: AnalysisService):
+        self.analysis_service = analysis_service
+        self.github_service = analysis_service.github_service
+        self.job_store = analysis_service.job_store
+        self.max_members = int(os.getenv("BATCH_MAX_MEMBERS", "5000"))
+        # Member repository listings fetched at once while planning
+        self.listing_concurrency = max(1, int(os.getenv("BATCH_LISTING_CONCURRENCY", "8")))
+        # Repositories crawled at once (also bounded by the process-wide repository cap)
+        self.repo_concurrency = max(1, int(os.getenv("BATCH_REPO_CONCURRENCY", "16")))
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def start_batch_analysis(self, request: BatchAnalysisRequest) -> AnalysisJob:
+        """
+        Start a batch analysis in the background; the job's batch_result holds the outcome
+        """
+        if len(self._explicit_members(request)) > self.max_members:
+            raise ValueError(f"Batch analysis is limited to {self.max_members} members")
+        
+        job = AnalysisJob(
+            job_id=str(uuid.uuid4()),
+            status="pending",
+            created_at=datetime.now()
+        )
+        await self.job_store.save(job)
+        
+        try:
+            if self.analysis_service.execution_mode == "queue":
+                # Hand off to a worker process, keeping large crawls off the API event loop
+                await self.analysis_service.queue_service.enqueue(job.job_id, request, RequestPriority.BACKGROUND)
+            else:
+                task = asyncio.create_task(self._perform_batch_analysis(job.job_id, request))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except Exception:
+            await self.job_store.delete(job.job_id)
+            raise
+        
+        logger.info(
+            f"Started batch analysis job {job.job_id} for {len(request.github_usernames)} users"
+            f"{f' and organization {request.organization}' if request.organization else ''}"
+        )
+        return job
+    
+    async def get_batch_result(self, job_id: str) -> BatchAnalysisResult:
+        """
+        Get a completed batch analysis result
+        """
+        job = await self.job_store.get(job_id)
+        if job is None:
+            raise ValueError(f"Job {job_id} not found")
+        
+        if job.status != "completed":
+            raise ValueError(f"Job {job_id} is not completed (status: {job.status})")
+        
+        if job.batch_result is None:
+            raise ValueError(f"Job {job_id} has no batch result")
+        
+        return job.batch_result
+    
+    async def _perform_batch_analysis(self, job_id: str, request: BatchAnalysisRequest):
+        """
+        Plan the crawl, fetch each distinct repository once and score every member
+        """
+        request_priority.set(RequestPriority.BACKGROUND)
+        progress = self.analysis_service.progress_service.tracker(job_id)
+        JOBS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        
+        try:
+            job = await self.job_store.get(job_id)
+            if job is None:
+                raise ValueError(f"Job {job_id} not found")
+            job.status = "processing"
+            job.progress = progress.progress
+            await self.job_store.save(job)
+            await progress.phase("listing")
+            
+            members = await self._resolve_members(request)
+            planned, failed_members = await self._plan_repositories(request, members, progress)
+            logger.info(f"Batch job {job_id}: {len(members)} members, {len(planned)} distinct repositories")
+            
+            await progress.phase("fetching")
+            semaphore = asyncio.Semaphore(self.repo_concurrency)
+            crawled = await asyncio.gather(*(
+                self._crawl_repository(request, plan, members, semaphore, progress) for plan in planned
+            ))
+            await progress.phase("scoring")
+            
+            with STAGE_DURATION.labels("scoring").time():
+                result = self._build_result(request, members, planned, crawled, failed_members)
+            
+            job.status = "completed"
+            job.completed_at = datetime.now()
+            job.batch_result = result
+            job.progress.phase = "completed"
+            await self.job_store.save(job)
+            await self.analysis_service.progress_service.publish(job_id, self.analysis_service._job_event(job))
+            ANALYSES.labels("completed").inc()
+            
+            logger.info(f"Completed batch analysis {job_id}: {len(result.members)} members")
+        
+        except Exception as e:
+            logger.error(f"Batch analysis failed for job {job_id}: {e}")
+            await self.analysis_service.fail_job(job_id, str(e))
+        finally:
+            JOBS_IN_FLIGHT.dec()
+            STAGE_DURATION.labels("batch").observe(time.perf_counter() - started)
+    
+    def _explicit_members(self, request: BatchAnalysisRequest) -> Dict[str, str]:
+        """
+        Requested usernames without duplicates (lowercased login → login as given)
+        """
+        members: Dict[str, str] = {}
+        for username in request.github_usernames:
+            members.setdefault(username.lower(), username)
+        return members
+    
+    async def _resolve_members(self, request: BatchAnalysisRequest) -> Dict[str, str]:
+        """
+        Requested usernames followed by the organization's members (lowercased login → login)
+        """
+        members = self._explicit_members(request)
+        if request.organization:
+            async for page in self.github_service.iter_organization_members(
+                request.organization, request.access_token
+            ):
+                for login in page:
+                    members.setdefault(login.lower(), login)
+        
+        if len(members) > self.max_members:
+            raise ValueError(f"Batch analysis is limited to {self.max_members} members ({len(members)} requested)")
+        return members
+    
+    async def _plan_repositories(
+        self,
+        request: BatchAnalysisRequest,
+        members: Dict[str, str],
+        progress: JobProgress
+    ) -> Tuple[List[PlannedRepository], List[str]]:
+        """
+        Distinct repositories to crawl, in listing order (organization first, then members),
+        and the members whose repositories could not be listed
+        """
+        started = time.perf_counter()
+        planned: Dict[str, PlannedRepository] = {}
+        history_cutoff = self.analysis_service._history_cutoff()
+        
+        async def add(page: List[Dict]):
+            added = 0
+            for repo in page:
+                key = repo['full_name'].lower()
+                if key in planned:
+                    continue
+                # Empty repositories have nothing to attribute, so they are left out with the dropped ones
+                outcome = self.analysis_service.repository_selection.select(repo, history_cutoff)
+                if outcome in DROPPED_OUTCOMES or outcome == "empty":
+                    continue
+                owner = repo['full_name'].split("/")[0]
+                planned[key] = PlannedRepository(
+                    owner=owner,
+                    repo=repo,
+                    member=owner.lower() if owner.lower() in members else None,
+                    with_commits=outcome != "languages"
+                )
+                added += 1
+            await progress.discovered(added)
+        
+        if request.organization:
+            async for page in self.github_service.iter_organization_repositories(
+                request.organization, request.access_token
+            ):
+                await add(page)
+        
+        semaphore = asyncio.Semaphore(self.listing_concurrency)
+        
+        async def list_member(login: str) -> Optional[List[Dict]]:
+            async with semaphore:
+                try:
+                    return [
+                        repo
+                        async for page in self.github_service.iter_user_repositories(login, request.access_token)
+                        for repo in page
+                    ]
+                except ValueError as e:
+                    logger.warning(f"Failed to list repositories of {login}: {e}")
+                    return None
+        
+        listings = await asyncio.gather(*(list_member(login) for login in members.values()))
+        
+        # Merged in member order so the plan is deterministic
+        failed_members = []
+        for login, repos in zip(members.values(), listings):
+            if repos is None:
+                failed_members.append(login)
+            else:
+                await add(repos)
+        
+        STAGE_DURATION.labels("listing").observe(time.perf_counter() - started)
+        return list(planned.values()), failed_members
+    
+    async def _crawl_repository(
+        self,
+        request: BatchAnalysisRequest,
+        plan: PlannedRepository,
+        members: Dict[str, str],
+        semaphore: asyncio.Semaphore,
+        progress: JobProgress
+    ) -> Optional[CrawledRepository]:
+        """
+        Fetch one repository's languages and commits by author
+        Returns None when the repository fails so the rest of the batch continues
+        """
+        crawled = None
+        async with semaphore, self.analysis_service._process_semaphore:
+            try:
+                languages, (timeline, authors) = await asyncio.gather(
+                    self.analysis_service._timed("languages", self.github_service.get_repository_languages(
+                        plan.owner,
+                        plan.repo['name'],
+                        request.access_token
+                    )),
+                    self.analysis_service._timed("commits", self.github_service.get_author_timelines(
+                        plan.owner,
+                        plan.repo['name'],
+                        request.access_token,
+                        since=self.analysis_service._history_cutoff()
+                    )) if plan.with_commits else self._no_commits()
+                )
+                crawled = CrawledRepository(
+                    languages=languages,
+                    timeline=timeline,
+                    authors={login: commits for login, commits in authors.items() if login in members}
+                )
+            except Exception as e:
+                logger.warning(f"Failed to analyze repository {plan.repo['full_name']}: {e}")
+        
+        await progress.processed()
+        return crawled
+    
+    async def _no_commits(self) -> Tuple[CommitTimeline, Dict[str, CommitTimeline]]:
+        return CommitTimeline(), {}
+    
+    def _build_result(
+        self,
+        request: BatchAnalysisRequest,
+        members: Dict[str, str],
+        planned: List[PlannedRepository],
+        crawled: List[Optional[CrawledRepository]],
+        failed_members: List[str]
+    ) -> BatchAnalysisResult:
+        """
+        Attribute each crawled repository to its members and score every member and the aggregate
+        """
+        intency_service = self.analysis_service.intency_service
+        summarize = self.analysis_service._summarize_timeline
+        author_filter = self.analysis_service.author_filter
+        rankings = {login: IncrementalRanking(intency_service) for login in members}
+        aggregate = IncrementalRanking(intency_service)
+        shared_repositories = 0
+        
+        # Aggregated in plan order so results are deterministic
+        for plan, repository in zip(planned, crawled):
+            if repository is None:
+                continue
+            
+            contributors = set(repository.authors)
+            if plan.member is not None:
+                own = repository.authors.get(plan.member, CommitTimeline()) if author_filter else repository.timeline
+                rankings[plan.member].add(summarize(repository.languages, own))
+                contributors.add(plan.member)
+            if plan.member is not None and not author_filter:
+                attributed = repository.timeline
+            else:
+                attributed = CommitTimeline(
+                    timestamp for commits in repository.authors.values() for timestamp in commits.timestamps
+                )
+            
+            for login, commits in repository.authors.items():
+                if login != plan.member:
+                    rankings[login].add(summarize(repository.languages, commits))
+            
+            if len(contributors) > 1:
+                shared_repositories += 1
+            aggregate.add(summarize(repository.languages, attributed))
+        
+        analysis_date = datetime.now()
+        return BatchAnalysisResult(
+            organization=request.organization,
+            analysis_date=analysis_date,
+            members=[
+                self._to_result(login, rankings[key], analysis_date)
+                for key, login in members.items()
+            ],
+            aggregate=self._to_result(request.organization or "team", aggregate, analysis_date),
+            total_repositories=sum(1 for repository in crawled if repository is not None),
+            shared_repositories=shared_repositories,
+            failed_members=failed_members
+        )
+    
+    def _to_result(self, username: str, ranking: IncrementalRanking, analysis_date: datetime) -> AnalysisResult:
+        return AnalysisResult(
+            username=username,
+            analysis_date=analysis_date,
+            languages=ranking.ranking(),
+            total_repositories=ranking.repository_count,
+            total_commits=ranking.total_commits,
+            analysis_period_months=12,  # Default analysis period
+            scoring_profile=self.analysis_service.intency_service.profile.label
+        )
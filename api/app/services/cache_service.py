@@ -10,37 +10,129 @@ Related Classes:
 
 Strategy: Time-based expiration, user-specific and repository-specific cache keys
 Benefits: Rate limit management, improved response times, reduced GitHub API calls
+Serialization: Compact JSON, zlib-compressed above a size threshold (1-byte format prefix)
 """
 
-import redis
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 from typing import Any, Optional
+import os
 import json
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Payload format prefixes
+_FORMAT_JSON = b"j"
+_FORMAT_ZLIB = b"z"
 
 class CacheService:
-    def __init__(self):
-        # TODO: Configure Redis connection from environment variables
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or os.getenv("REDIS_URL")
+        self.default_expire = int(os.getenv("CACHE_DEFAULT_EXPIRE", "3600"))
+        self.compress_threshold = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "1024"))
+        
+        # Pooled async client; caching is disabled when no Redis URL is configured
         self.redis_client = None
+        if self.redis_url:
+            pool = aioredis.ConnectionPool.from_url(
+                self.redis_url,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+            )
+            self.redis_client = aioredis.Redis(connection_pool=pool)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.redis_client is not None
     
     async def get(self, key: str) -> Optional[Any]:
         """
         Get cached data by key
         """
-        # TODO: Implement cache retrieval
-        pass
+        if self.redis_client is None:
+            return None
+        
+        try:
+            payload = await self.redis_client.get(key)
+        except RedisError as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return None
+        
+        if payload is None:
+            return None
+        
+        try:
+            return self._deserialize(payload)
+        except (ValueError, zlib.error) as e:
+            logger.warning(f"Discarding undecodable cache entry {key}: {e}")
+            return None
     
     async def set(self, key: str, value: Any, expire_seconds: int = 3600) -> bool:
         """
         Set cached data with expiration
         """
-        # TODO: Implement cache storage
-        pass
+        if self.redis_client is None:
+            return False
+        
+        try:
+            await self.redis_client.set(key, self._serialize(value), ex=expire_seconds)
+            return True
+        except RedisError as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+            return False
     
     async def delete(self, key: str) -> bool:
         """
         Delete cached data
         """
-        # TODO: Implement cache deletion
-        pass
+        if self.redis_client is None:
+            return False
+        
+        try:
+            return bool(await self.redis_client.delete(key))
+        except RedisError as e:
+            logger.warning(f"Cache delete failed for {key}: {e}")
+            return False
+    
+    async def close(self):
+        """
+        Close the Redis connection pool
+        """
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+    
+    def _serialize(self, value: Any) -> bytes:
+        """
+        Encode value as compact JSON, compressing large payloads
+        """
+        raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(raw) >= self.compress_threshold:
+            return _FORMAT_ZLIB + zlib.compress(raw, 6)
+        return _FORMAT_JSON + raw
+    
+    def _deserialize(self, payload: bytes) -> Any:
+        """
+        Decode a payload written by _serialize
+        """
+        prefix, body = payload[:1], payload[1:]
+        if prefix == _FORMAT_ZLIB:
+            body = zlib.decompress(body)
+        elif prefix != _FORMAT_JSON:
+            raise ValueError(f"Unknown cache payload format: {prefix!r}")
+        return json.loads(body)
+    
+    def generate_user_resource_key(self, username: str, resource: str, scope: str = "public") -> str:
+        """
+        Generate cache key for a GitHub resource owned by a user (e.g. repository list)
+        """
+        return f"user:{username.lower()}:{resource}:{scope}"
+    
+    def generate_repo_resource_key(self, owner: str, repo: str, resource: str, scope: str = "public") -> str:
+        """
+        Generate cache key for a GitHub resource of a repository (e.g. languages, commits)
+        """
+        return f"{self._generate_repo_cache_key(owner.lower(), repo.lower())}:{resource}:{scope}"
     
     def _generate_user_cache_key(self, username: str) -> str:
         """
@@ -52,4 +144,4 @@ class CacheService:
         """
         Generate cache key for repository data
         """
-        return f"repo:{owner}:{repo}"
\ No newline at end of file
+        return f"repo:{owner}:{repo}"
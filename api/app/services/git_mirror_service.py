@@ -0,0 +1,281 @@
+"""
+Git Mirror Service - Repository Analysis from Local Git Mirrors
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Alternative to the GitHub REST/GraphQL fetches for heavy users and org-wide runs:
+full-history commit data and language sizes read from local mirrors, with no API quota
+
+Related Classes:
+- AnalysisService: Uses this engine when ANALYSIS_FETCH_STRATEGY=git (the repository listing still comes from GitHubService)
+- CommitTimeline: Commit timestamps for the repository and for each language
+- IncrementalRanking: Consumes the per-language commit attribution
+
+Mirrors: Bare mirrors under GIT_MIRROR_ROOT/{owner}/{repo}.git, cloned from GIT_MIRROR_URL_TEMPLATE
+(a local path template works offline) and fetched incrementally when the listing's pushed_at moves
+(full mirrors: numstat diffs and blob sizes need the blobs, so blobless clones would fetch them lazily anyway)
+Languages: Classified by file extension; bytes from `git ls-tree -l HEAD`, commits per language from the
+files each commit touched (`git log --numstat`)
+Execution: git runs in a process pool (GIT_MIRROR_PROCESSES), one mirror at a time per process;
+a file lock keeps concurrent jobs and processes from updating the same mirror at once
+Security: Access tokens reach git through GIT_CONFIG_* environment variables, never argv or the mirror config
+"""
+
+from app.models.commit_timeline import CommitTimeline
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import os
+import base64
+import fcntl
+import asyncio
+import logging
+import subprocess
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+# File extension (lowercase, with dot) → language
+EXTENSION_LANGUAGES = {
+    ".py": "Python", ".pyi": "Python",
+    ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".java": "Java",
+    ".kt": "Kotlin", ".kts": "Kotlin",
+    ".swift": "Swift",
+    ".c": "C", ".h": "C",
+    ".cc": "C++", ".cpp": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++",
+    ".cs": "C#",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".scala": "Scala",
+    ".hs": "Haskell",
+    ".ex": "Elixir", ".exs": "Elixir",
+    ".erl": "Erlang",
+    ".clj": "Clojure",
+    ".lua": "Lua",
+    ".r": "R",
+    ".dart": "Dart",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell",
+    ".ps1": "PowerShell",
+    ".sql": "SQL",
+    ".html": "HTML", ".htm": "HTML",
+    ".css": "CSS", ".scss": "SCSS", ".sass": "Sass", ".less": "Less",
+    ".vue": "Vue",
+    ".svelte": "Svelte",
+    ".asm": "Assembly", ".s": "Assembly",
+    ".md": "Markdown",
+    ".json": "JSON",
+    ".xml": "XML",
+    ".yml": "YAML", ".yaml": "YAML",
+    ".tf": "HCL",
+    ".ipynb": "Jupyter Notebook"
+}
+
+# Extensionless file names → language
+FILENAME_LANGUAGES = {
+    "dockerfile": "Dockerfile",
+    "makefile": "Makefile"
+}
+
+# Path segments excluded from classification (third-party code)
+VENDORED_DIRECTORIES = ("node_modules", "vendor", "third_party", "dist")
+
+def classify_path(path: str) -> Optional[str]:
+    """
+    Language of a repository path by extension (None = unclassified or vendored)
+    """
+    parts = path.split("/")
+    if any(part in VENDORED_DIRECTORIES for part in parts[:-1]):
+        return None
+    name = parts[-1].lower()
+    if name in FILENAME_LANGUAGES:
+        return FILENAME_LANGUAGES[name]
+    _, extension = os.path.splitext(name)
+    return EXTENSION_LANGUAGES.get(extension)
+
+def author_pattern(alias: str) -> str:
+    """
+    Extended regex matched by `git log --author` against "Name <email>" for an author alias:
+    an email matches exactly, a login matches its name or GitHub noreply address
+    """
+    escaped = "".join(f"\\{char}" if char in ".[]{}()\\*+?^$|" else char for char in alias)
+    if "@" in alias:
+        return f"<{escaped}>"
+    return f"(^{escaped} <|[<+]{escaped}@users\\.noreply\\.github\\.com>)"
+
+def _git(args: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> str:
+    completed = subprocess.run(
+        ["git", "-c", "core.quotePath=false", *args],
+        cwd=cwd,
+        env=env,
+        timeout=timeout,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return completed.stdout
+
+def sync_mirror(url: str, path: str, watermark: Optional[str], access_token: Optional[str], timeout: float):
+    """
+    Clone the mirror, or fetch it when the repository's watermark changed since the last sync
+    """
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    if access_token:
+        credentials = base64.b64encode(f"x-access-token:{access_token}".encode()).decode()
+        env.update(
+            GIT_CONFIG_COUNT="1",
+            GIT_CONFIG_KEY_0="http.extraHeader",
+            GIT_CONFIG_VALUE_0=f"Authorization: Basic {credentials}"
+        )
+    marker = os.path.join(path, "skill-piler-watermark")
+    
+    if not os.path.isdir(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _git(["clone", "--mirror", "--quiet", url, path], env=env, timeout=timeout)
+    else:
+        if watermark is not None and os.path.exists(marker):
+            with open(marker) as stored:
+                if stored.read() == watermark:
+                    return
+        _git(["fetch", "--prune", "--quiet", "origin"], cwd=path, env=env, timeout=timeout)
+    
+    if watermark is not None:
+        with open(marker, "w") as stored:
+            stored.write(watermark)
+
+def read_mirror(
+    path: str,
+    authors: Optional[List[str]],
+    since_timestamp: Optional[int]
+) -> Tuple[Dict[str, int], List[int], Dict[str, List[int]]]:
+    """
+    Language bytes at HEAD, commit timestamps (authors' commits only, if given) and
+    the timestamps of the commits touching each language
+    """
+    try:
+        _git(["rev-parse", "--verify", "--quiet", "HEAD"], cwd=path)
+    except subprocess.CalledProcessError:
+        # Empty repository
+        return {}, [], {}
+    
+    languages: Dict[str, int] = {}
+    for line in _git(["ls-tree", "-r", "-l", "HEAD"], cwd=path).splitlines():
+        meta, _, file_path = line.partition("\t")
+        fields = meta.split()
+        if len(fields) != 4 or fields[1] != "blob":
+            continue
+        language = classify_path(file_path)
+        if language is not None:
+            languages[language] = languages.get(language, 0) + int(fields[3])
+    
+    args = ["log", "--no-merges", "--no-renames", "--numstat", "--format=@%at"]
+    if authors:
+        args += ["--extended-regexp", "--regexp-ignore-case"]
+        args += [f"--author={author_pattern(alias)}" for alias in authors]
+    if since_timestamp is not None:
+        args.append(f"--max-age={since_timestamp}")
+    args.append("HEAD")
+    
+    timestamps: List[int] = []
+    language_timestamps: Dict[str, List[int]] = {}
+    current: Optional[int] = None
+    touched = set()
+    
+    def finish_commit():
+        for language in touched:
+            language_timestamps.setdefault(language, []).append(current)
+        touched.clear()
+    
+    for line in _git(args, cwd=path).splitlines():
+        if line.startswith("@"):
+            if current is not None:
+                finish_commit()
+            current = int(line[1:])
+            timestamps.append(current)
+        elif line:
+            file_path = line.split("\t", 2)[-1]
+            language = classify_path(file_path)
+            if language is not None:
+                touched.add(language)
+    if current is not None:
+        finish_commit()
+    
+    return languages, timestamps, language_timestamps
+
+def analyze_mirror(
+    url: str,
+    path: str,
+    watermark: Optional[str],
+    access_token: Optional[str],
+    authors: Optional[List[str]],
+    since_timestamp: Optional[int],
+    timeout: float
+) -> Tuple[Dict[str, int], List[int], Dict[str, List[int]]]:
+    """
+    Sync and read one mirror (runs in a pool process), holding the mirror's lock throughout
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            sync_mirror(url, path, watermark, access_token, timeout)
+            return read_mirror(path, authors, since_timestamp)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+class GitMirrorService:
+    def __init__(self):
+        self.mirror_root = os.getenv("GIT_MIRROR_ROOT", "/var/lib/skill-piler/mirrors")
+        # {owner} and {repo} are substituted; a local path template analyzes repositories on disk
+        self.url_template = os.getenv("GIT_MIRROR_URL_TEMPLATE", "https://github.com/{owner}/{repo}.git")
+        self.processes = max(1, int(os.getenv("GIT_MIRROR_PROCESSES", str(os.cpu_count() or 1))))
+        self.timeout = float(os.getenv("GIT_MIRROR_TIMEOUT", "600"))
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    async def analyze_repository(
+        self,
+        owner: str,
+        repo: Dict,
+        access_token: Optional[str] = None,
+        authors: Optional[List[str]] = None,
+        since_timestamp: Optional[int] = None
+    ) -> Tuple[Dict[str, int], CommitTimeline, Dict[str, CommitTimeline]]:
+        """
+        Language bytes, commit timeline and per-language commit timelines of a repository
+        from its local mirror (synced first when the listing's pushed_at changed)
+        """
+        url = self.url_template.format(owner=owner, repo=repo['name'])
+        path = os.path.join(self.mirror_root, owner.lower(), f"{repo['name'].lower()}.git")
+        watermark = repo.get('pushed_at') or repo.get('updated_at')
+        
+        try:
+            languages, timestamps, language_timestamps = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(),
+                analyze_mirror,
+                url, path, watermark, access_token, authors, since_timestamp, self.timeout
+            )
+        except subprocess.CalledProcessError as e:
+            logger.error(f"git failed for {owner}/{repo['name']}: {(e.stderr or '').strip()}")
+            raise ValueError(f"Failed to read git mirror of {owner}/{repo['name']}")
+        except subprocess.TimeoutExpired:
+            raise ValueError(f"Timed out syncing git mirror of {owner}/{repo['name']}")
+        
+        logger.debug(f"Read {len(timestamps)} commits for {owner}/{repo['name']} from its git mirror")
+        return languages, CommitTimeline(timestamps), {
+            language: CommitTimeline(language_commits) for language, language_commits in language_timestamps.items()
+        }
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: workers do not inherit the event loop, sockets or threads of this process
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+    
+    async def close(self):
+        """
+        Shut the process pool down (called from the app lifespan)
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
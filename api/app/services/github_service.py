@@ -9,22 +9,314 @@ Related Classes:
 - AuthService: Provides access tokens for authenticated API calls
 - CacheService: Caches API responses to reduce rate limit usage
 
-API Usage: REST API v3 for repositories/commits, GraphQL planned for complex queries
+API Usage: REST API v3 for repositories/commits, GraphQL for batched repository/language/commit-count fetches,
+contributor statistics for weekly per-author history in one call
 Security: Token-based authentication, no sensitive data exposure to frontend
 """
 
-from typing import List, Dict, Optional
+from app.models.commit_timeline import CommitTimeline, parse_commit_timestamp
+from app.services.cache_service import CacheService
+from app.services.metrics_service import GITHUB_REQUEST_DURATION, GITHUB_REQUESTS, observe_cache
+from app.services.rate_limit_service import RateLimitService
+from typing import Any, AsyncIterator, Callable, List, Dict, Optional, Set, Tuple
+import os
+import time
+import hashlib
 import httpx
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+# One query returns a page of repositories with their language sizes and
+# default-branch commit counts (all-time, since the activity cutoff and per activity window);
+# window variables and fields are filled in by _repository_activity_query.
+# $author = {id: <user node ID>} counts only the user's commits, null counts every author
+
+USER_ID_QUERY = """
+query($login: String!) {
+  user(login: $login) { id }
+}
+"""
+REPOSITORY_ACTIVITY_QUERY = """
+query($login: String!, $cursor: String, $pageSize: Int!, $languageCount: Int!, $since: GitTimestamp!, $author: CommitAuthor__WINDOW_VARIABLES__) {
+  user(login: $login) {
+    repositories(
+      first: $pageSize
+      after: $cursor
+      ownerAffiliations: OWNER
+      isFork: false
+      privacy: PUBLIC
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        primaryLanguage { name }
+        diskUsage
+        stargazerCount
+        forkCount
+        updatedAt
+        pushedAt
+        createdAt
+        url
+        languages(first: $languageCount, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(author: $author) { totalCount }
+              recent: history(since: $since, author: $author) { totalCount }__WINDOW_FIELDS__
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
 class GitHubService:
-    def __init__(self):
-        self.api_base_url = "https://api.github.com"
-        self.graphql_url = "https://api.github.com/graphql"
-        self.timeout = httpx.Timeout(30.0)
+    def __init__(
+        self,
+        cache_service: Optional[CacheService] = None,
+        rate_limit_service: Optional[RateLimitService] = None
+    ):
+        self.api_base_url = os.getenv("GITHUB_API_BASE_URL", "https://api.github.com")
+        self.graphql_url = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+        self.timeout = httpx.Timeout(float(os.getenv("GITHUB_API_TIMEOUT", "30")))
+        
+        # Connection pool shared by every GitHub call (keep-alive + HTTP/2 multiplexing)
+        self.http2 = os.getenv("GITHUB_HTTP2", "true").lower() == "true"
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("GITHUB_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("GITHUB_KEEPALIVE_EXPIRY", "30"))
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+        
+        # Central scheduler: per-token budget, pacing, backoff and priorities
+        self.rate_limit_service = rate_limit_service or RateLimitService()
+        
+        # Read-through cache for GitHub responses (per-resource TTLs in seconds)
+        self.cache_service = cache_service
+        self.repos_cache_expire = int(os.getenv("CACHE_REPOS_EXPIRE", "3600"))
+        self.languages_cache_expire = int(os.getenv("CACHE_LANGUAGES_EXPIRE", "86400"))
+        self.commits_cache_expire = int(os.getenv("CACHE_COMMITS_EXPIRE", "3600"))
+        # How long entries with ETag/Last-Modified are kept for conditional revalidation
+        self.validator_retention = int(os.getenv("CACHE_VALIDATOR_RETENTION", "604800"))
+        
+        # Pagination caps (0 = follow every Link: rel="next")
+        self.max_repo_pages = int(os.getenv("GITHUB_MAX_REPO_PAGES", "0"))
+        self.max_commit_pages = int(os.getenv("GITHUB_MAX_COMMIT_PAGES", "0"))
+        
+        # GraphQL batching (repositories per query, languages per repository)
+        self.graphql_page_size = int(os.getenv("GITHUB_GRAPHQL_PAGE_SIZE", "50"))
+        self.graphql_language_count = int(os.getenv("GITHUB_GRAPHQL_LANGUAGE_COUNT", "20"))
+    
+    async def start(self):
+        """
+        Create the shared HTTP client (called from the app lifespan)
+        """
+        self._get_client()
+    
+    async def close(self):
+        """
+        Close the shared HTTP client and release pooled connections
+        """
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use
+        """
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+            logger.info(f"Created GitHub HTTP client (http2={self.http2})")
+        return self.client
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        access_token: Optional[str],
+        resource: str = "core",
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request on the shared client through the rate-limit scheduler
+        """
+        client = self._get_client()
+        send = client.get if method == "GET" else client.post
+        endpoint = self._endpoint_label(url)
+        
+        async def send_once() -> httpx.Response:
+            # Every attempt is measured, including rate-limit retries
+            started = time.perf_counter()
+            status = "error"
+            try:
+                response = await send(url, **kwargs)
+                status = str(response.status_code)
+                return response
+            finally:
+                GITHUB_REQUESTS.labels(endpoint, status).inc()
+                GITHUB_REQUEST_DURATION.labels(endpoint).observe(time.perf_counter() - started)
+        
+        return await self.rate_limit_service.send(
+            self.token_scope(access_token),
+            resource,
+            send_once
+        )
+    
+    def _endpoint_label(self, url: str) -> str:
+        """
+        Low-cardinality endpoint name for metrics (owner, repository, user and organization segments templated)
+        """
+        if url == self.graphql_url:
+            return "graphql"
+        
+        path = urlsplit(url).path
+        base_path = urlsplit(self.api_base_url).path.rstrip("/")
+        if base_path and path.startswith(base_path):
+            path = path[len(base_path):]
+        
+        segments = path.strip("/").split("/")
+        if segments[0] == "repos" and len(segments) >= 3:
+            segments[1:3] = ["{owner}", "{repo}"]
+        elif segments[0] == "users" and len(segments) >= 2:
+            segments[1] = "{user}"
+        elif segments[0] == "orgs" and len(segments) >= 2:
+            segments[1] = "{org}"
+        return "/" + "/".join(segments)
+    
+    def token_scope(self, access_token: Optional[str]) -> str:
+        """
+        Non-reversible identity for a token: cache namespace (authenticated responses
+        are never shared) and rate-limit budget key ("public" = anonymous per-IP budget)
+        """
+        if not access_token:
+            return "public"
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
+    
+    def _repos_cache_key(self, username: str, access_token: Optional[str], page: int = 1) -> Optional[str]:
+        return self._user_cache_key(username, f"repos:{page}", access_token)
+    
+    def _user_cache_key(self, login: str, resource: str, access_token: Optional[str]) -> Optional[str]:
+        if self.cache_service is None:
+            return None
+        return self.cache_service.generate_user_resource_key(login, resource, self.token_scope(access_token))
+    
+    def _repo_cache_key(self, owner: str, repo: str, resource: str, access_token: Optional[str]) -> Optional[str]:
+        if self.cache_service is None:
+            return None
+        return self.cache_service.generate_repo_resource_key(owner, repo, resource, self.token_scope(access_token))
+    
+    async def _get_json(self, url: str, access_token: Optional[str] = None, **kwargs) -> Any:
+        """
+        GET a single (non-paginated) JSON resource
+        """
+        data, _ = await self._get_json_page(url, access_token, **kwargs)
+        return data
+    
+    async def _get_json_page(
+        self,
+        url: str,
+        access_token: Optional[str] = None,
+        params: Optional[Dict] = None,
+        cache_key: Optional[str] = None,
+        expire_seconds: int = 3600,
+        project: Optional[Callable[[Any], Any]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        GET a JSON resource with read-through caching and conditional revalidation
+        Returns the (projected) payload and the URL of the next page, if any
+        
+        Cached entries keep the projected payload together with the response validators
+        (ETag / Last-Modified). Fresh entries are served without a request; stale ones are
+        revalidated with If-None-Match / If-Modified-Since, and a 304 returns the cached
+        payload as-is (304s do not count against the GitHub rate limit).
+        """
+        entry = await self.cache_service.get(cache_key) if cache_key else None
+        if not isinstance(entry, dict) or "data" not in entry:
+            entry = None
+        if entry is not None and time.time() - entry.get("fetched_at", 0) < expire_seconds:
+            logger.debug(f"Cache hit for {cache_key}")
+            observe_cache("github", "hit")
+            return entry["data"], entry.get("next_url")
+        
+        headers = self._get_headers(access_token)
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        
+        response = await self._send("GET", url, access_token, headers=headers, params=params)
+        
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"Not modified: {url}")
+            observe_cache("github", "revalidated")
+            entry["fetched_at"] = time.time()
+            await self._store_entry(cache_key, entry, expire_seconds)
+            return entry["data"], entry.get("next_url")
+        
+        response.raise_for_status()
+        if response.status_code == 202:
+            # Accepted: GitHub is still computing the resource (statistics); not cached
+            logger.debug(f"Still being computed: {url}")
+            return None, None
+        if cache_key:
+            observe_cache("github", "miss")
+        
+        data = response.json() if response.status_code != 204 else None
+        if project is not None:
+            data = project(data)
+        next_url = self._parse_next_link(response.headers.get("Link"))
+        
+        if cache_key:
+            await self._store_entry(cache_key, {
+                "data": data,
+                "next_url": next_url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time()
+            }, expire_seconds)
+        
+        return data, next_url
+    
+    def _parse_next_link(self, link_header: Optional[str]) -> Optional[str]:
+        """
+        Extract the rel="next" URL from a GitHub Link header
+        """
+        if not link_header:
+            return None
+        for part in link_header.split(","):
+            section = part.split(";")
+            if len(section) < 2:
+                continue
+            url = section[0].strip().strip("<>")
+            if any(param.strip() == 'rel="next"' for param in section[1:]):
+                return url
+        return None
+    
+    async def _store_entry(self, cache_key: str, entry: Dict, expire_seconds: int):
+        """
+        Store a cache entry; entries with validators outlive their freshness TTL
+        so they can still be revalidated with a conditional request
+        """
+        if entry.get("etag") or entry.get("last_modified"):
+            expire_seconds = max(expire_seconds, self.validator_retention)
+        await self.cache_service.set(cache_key, entry, expire_seconds)
     
     def _get_headers(self, access_token: Optional[str] = None) -> Dict[str, str]:
         headers = {
@@ -37,73 +329,125 @@ class GitHubService:
     
     async def get_user_repositories(self, username: str, access_token: str = None) -> List[Dict]:
         """
-        Get user's public repositories from GitHub API
+        Get user's public repositories from GitHub API (all pages)
+        """
+        repos = []
+        async for page in self.iter_user_repositories(username, access_token):
+            repos.extend(page)
+        
+        logger.info(f"Retrieved {len(repos)} repositories for user {username}")
+        return repos
+    
+    async def iter_user_repositories(self, username: str, access_token: str = None) -> AsyncIterator[List[Dict]]:
+        """
+        Stream user's public repositories page by page as they arrive
+        Follows Link-header pagination up to max_repo_pages (0 = unlimited)
+        """
+        async for page in self._iter_listing_pages(
+            f"{self.api_base_url}/users/{username}/repos",
+            {"type": "public", "sort": "updated", "per_page": 100},
+            access_token,
+            lambda page_number: self._repos_cache_key(username, access_token, page_number),
+            self._project_repositories,
+            f"User {username}",
+            "repositories"
+        ):
+            yield page
+    
+    async def iter_organization_repositories(self, organization: str, access_token: str = None) -> AsyncIterator[List[Dict]]:
+        """
+        Stream an organization's public repositories page by page
+        """
+        async for page in self._iter_listing_pages(
+            f"{self.api_base_url}/orgs/{organization}/repos",
+            {"type": "public", "sort": "updated", "per_page": 100},
+            access_token,
+            lambda page_number: self._user_cache_key(organization, f"org-repos:{page_number}", access_token),
+            self._project_repositories,
+            f"Organization {organization}",
+            "repositories"
+        ):
+            yield page
+    
+    async def iter_organization_members(self, organization: str, access_token: str = None) -> AsyncIterator[List[str]]:
+        """
+        Stream the logins of an organization's members page by page
+        (public members only, unless the token can see the organization's membership)
+        """
+        async for page in self._iter_listing_pages(
+            f"{self.api_base_url}/orgs/{organization}/members",
+            {"per_page": 100},
+            access_token,
+            lambda page_number: self._user_cache_key(organization, f"members:{page_number}", access_token),
+            self._project_members,
+            f"Organization {organization}",
+            "members"
+        ):
+            yield page
+    
+    async def _iter_listing_pages(
+        self,
+        url: str,
+        params: Dict,
+        access_token: Optional[str],
+        cache_key_of: Callable[[int], Optional[str]],
+        project: Callable[[List[Dict]], List[Any]],
+        owner: str,
+        resource: str
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Paginate a user or organization listing (owner: "User x" / "Organization x", for messages)
         """
         try:
-            headers = self._get_headers(access_token)
+            page_number = 1
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.api_base_url}/users/{username}/repos"
-                params = {
-                    "type": "public",
-                    "sort": "updated",
-                    "per_page": 100
-                }
-                
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
+            while url:
+                items, url = await self._get_json_page(
+                    url,
+                    access_token,
+                    params=params,
+                    cache_key=cache_key_of(page_number),
+                    expire_seconds=self.repos_cache_expire,
+                    project=project
+                )
+                logger.debug(f"Retrieved {resource} page {page_number} for {owner}: {len(items)} {resource}")
+                yield items
                 
-                repos = response.json()
-                logger.info(f"Retrieved {len(repos)} repositories for user {username}")
-                
-                return [
-                    {
-                        "name": repo["name"],
-                        "full_name": repo["full_name"],
-                        "description": repo.get("description", ""),
-                        "language": repo.get("language"),
-                        "size": repo["size"],
-                        "stargazers_count": repo["stargazers_count"],
-                        "forks_count": repo["forks_count"],
-                        "updated_at": repo["updated_at"],
-                        "created_at": repo["created_at"],
-                        "clone_url": repo["clone_url"],
-                        "languages_url": repo["languages_url"]
-                    }
-                    for repo in repos
-                    if not repo["fork"]  # Exclude forked repositories
-                ]
+                if url and self.max_repo_pages and page_number >= self.max_repo_pages:
+                    logger.warning(f"Listing of {resource} for {owner} truncated at {page_number} pages")
+                    break
                 
+                # The next link already carries the query string
+                params = None
+                page_number += 1
+            
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error getting repositories for {username}: {e}")
+            logger.error(f"HTTP error getting {resource} for {owner}: {e}")
             if e.response.status_code == 404:
-                raise ValueError(f"User {username} not found")
+                raise ValueError(f"{owner} not found")
             elif e.response.status_code == 403:
                 raise ValueError("Rate limit exceeded or access denied")
             else:
                 raise ValueError(f"GitHub API error: {e.response.status_code}")
         except Exception as e:
-            logger.error(f"Error getting repositories for {username}: {e}")
-            raise ValueError(f"Failed to get repositories: {str(e)}")
+            logger.error(f"Error getting {resource} for {owner}: {e}")
+            raise ValueError(f"Failed to get {resource}: {str(e)}")
     
     async def get_repository_languages(self, owner: str, repo: str, access_token: str = None) -> Dict:
         """
         Get programming languages used in a repository with byte counts
         """
         try:
-            headers = self._get_headers(access_token)
+            languages = await self._get_json(
+                f"{self.api_base_url}/repos/{owner}/{repo}/languages",
+                access_token,
+                cache_key=self._repo_cache_key(owner, repo, "languages", access_token),
+                expire_seconds=self.languages_cache_expire
+            )
+            logger.debug(f"Retrieved languages for {owner}/{repo}: {list(languages.keys())}")
+            
+            return languages
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.api_base_url}/repos/{owner}/{repo}/languages"
-                
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                
-                languages = response.json()
-                logger.debug(f"Retrieved languages for {owner}/{repo}: {list(languages.keys())}")
-                
-                return languages
-                
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error getting languages for {owner}/{repo}: {e}")
             if e.response.status_code == 404:
@@ -116,45 +460,191 @@ class GitHubService:
             logger.error(f"Error getting languages for {owner}/{repo}: {e}")
             raise ValueError(f"Failed to get languages: {str(e)}")
     
-    async def get_commit_history(self, owner: str, repo: str, access_token: str = None) -> List[Dict]:
+    async def get_contributor_stats(
+        self,
+        owner: str,
+        repo: str,
+        access_token: str = None
+    ) -> Optional[Dict[str, List[List[int]]]]:
         """
-        Get commit history for intensity calculation (last 100 commits)
+        Weekly commit counts of every contributor over the whole history in one request
+        ({login: [[week start, commits], ...]}, lowercased logins, weeks with commits only)
+        Returns None while GitHub is still computing the statistics (202); retry later
         """
         try:
-            headers = self._get_headers(access_token)
+            stats = await self._get_json(
+                f"{self.api_base_url}/repos/{owner}/{repo}/stats/contributors",
+                access_token,
+                cache_key=self._repo_cache_key(owner, repo, "contributor-stats", access_token),
+                expire_seconds=self.commits_cache_expire,
+                project=self._project_contributor_stats
+            )
+            if stats is not None:
+                logger.debug(f"Retrieved contributor statistics for {owner}/{repo}: {len(stats)} contributors")
+            return stats
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error getting contributor statistics for {owner}/{repo}: {e}")
+            if e.response.status_code == 404:
+                raise ValueError(f"Repository {owner}/{repo} not found")
+            elif e.response.status_code == 403:
+                raise ValueError("Rate limit exceeded or access denied")
+            else:
+                raise ValueError(f"GitHub API error: {e.response.status_code}")
+        except Exception as e:
+            logger.error(f"Error getting contributor statistics for {owner}/{repo}: {e}")
+            raise ValueError(f"Failed to get contributor statistics: {str(e)}")
+    
+    async def get_commit_history(
+        self,
+        owner: str,
+        repo: str,
+        access_token: str = None,
+        since: Optional[datetime] = None,
+        author: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get commit history for intensity calculation (all pages, optionally cut off at since
+        and limited to one author's login or email)
+        """
+        commits = []
+        async for page in self.iter_commits(owner, repo, access_token, since, author):
+            commits.extend(page)
+        
+        logger.debug(f"Retrieved {len(commits)} commits for {owner}/{repo}")
+        return commits
+    
+    async def get_commit_timeline(
+        self,
+        owner: str,
+        repo: str,
+        access_token: str = None,
+        since: Optional[datetime] = None,
+        include_shas: bool = False,
+        authors: Optional[List[str]] = None
+    ) -> CommitTimeline:
+        """
+        Lean commit history: sorted author timestamps (and optionally SHAs) only
+        Pages are projected to [timestamp, sha] pairs before caching, so messages and
+        author details are never kept in memory or in the cache
+        With authors (logins or emails), only their commits are transferred: one author-filtered
+        listing per alias, deduplicated by SHA
+        """
+        timestamps: List[int] = []
+        dedupe = include_shas or (authors is not None and len(authors) > 1)
+        shas: Optional[Set[str]] = set() if dedupe else None
+        for author in authors or [None]:
+            async for page in self._iter_commit_pages(
+                owner, repo, access_token, since, "commit-times", self._project_commit_times, self._commit_time, author
+            ):
+                for timestamp, sha in page:
+                    if shas is not None:
+                        if sha in shas:
+                            continue
+                        shas.add(sha)
+                    timestamps.append(timestamp)
+        
+        logger.debug(f"Retrieved {len(timestamps)} commit timestamps for {owner}/{repo}")
+        return CommitTimeline(timestamps, shas if include_shas else None)
+    
+    async def get_author_timelines(
+        self,
+        owner: str,
+        repo: str,
+        access_token: str = None,
+        since: Optional[datetime] = None
+    ) -> Tuple[CommitTimeline, Dict[str, CommitTimeline]]:
+        """
+        Commit history split by author: the whole timeline and one timeline per GitHub login
+        (lowercased; commits whose author has no linked account are only in the whole timeline)
+        """
+        timestamps: List[int] = []
+        by_author: Dict[str, List[int]] = {}
+        async for page in self._iter_commit_pages(
+            owner, repo, access_token, since, "commit-authors", self._project_commit_authors, self._commit_time
+        ):
+            for timestamp, login in page:
+                timestamps.append(timestamp)
+                if login:
+                    by_author.setdefault(login, []).append(timestamp)
+        
+        logger.debug(f"Retrieved {len(timestamps)} commits by {len(by_author)} authors for {owner}/{repo}")
+        return CommitTimeline(timestamps), {
+            login: CommitTimeline(author_timestamps) for login, author_timestamps in by_author.items()
+        }
+    
+    def iter_commits(
+        self,
+        owner: str,
+        repo: str,
+        access_token: str = None,
+        since: Optional[datetime] = None,
+        author: Optional[str] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream commit history page by page (newest first)
+        Commits authored before since are dropped; stops after max_commit_pages (0 = unlimited)
+        """
+        return self._iter_commit_pages(
+            owner, repo, access_token, since, "commits", self._project_commits, self._commit_date_timestamp, author
+        )
+    
+    async def _iter_commit_pages(
+        self,
+        owner: str,
+        repo: str,
+        access_token: Optional[str],
+        since: Optional[datetime],
+        resource: str,
+        project: Callable[[List[Dict]], List[Any]],
+        timestamp_of: Callable[[Any], Optional[int]],
+        author: Optional[str] = None
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Paginate the commits endpoint with a projection (cached per projection under resource)
+        author and since are applied by GitHub (author= / since=), so commits outside the
+        filter are never transferred; since is sent rounded down to the UTC day to keep cache
+        keys stable and trimmed exactly here
+        """
+        since_timestamp = self._since_timestamp(since)
+        try:
+            url = f"{self.api_base_url}/repos/{owner}/{repo}/commits"
+            params = {
+                "per_page": 100
+            }
+            if author:
+                params["author"] = author
+                resource = f"{resource}:author={author.lower()}"
+            if since_timestamp is not None:
+                params["since"] = self._since_param(since_timestamp)
+                resource = f"{resource}:since={params['since'][:10]}"
+            page_number = 1
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.api_base_url}/repos/{owner}/{repo}/commits"
-                params = {
-                    "per_page": 100,
-                    "page": 1
-                }
+            while url:
+                commits, url = await self._get_json_page(
+                    url,
+                    access_token,
+                    params=params,
+                    cache_key=self._repo_cache_key(owner, repo, f"{resource}:{page_number}", access_token),
+                    expire_seconds=self.commits_cache_expire,
+                    project=project
+                )
                 
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
+                if since_timestamp is not None:
+                    # since= bounds the listing by committer date, so a rebased or cherry-picked commit
+                    # can still carry an older author date: drop it without ending the pagination
+                    commits = [commit for commit in commits if not self._is_before(timestamp_of(commit), since_timestamp)]
                 
-                commits = response.json()
-                logger.debug(f"Retrieved {len(commits)} commits for {owner}/{repo}")
+                if commits:
+                    yield commits
                 
-                return [
-                    {
-                        "sha": commit["sha"],
-                        "message": commit["commit"]["message"],
-                        "author": {
-                            "name": commit["commit"]["author"]["name"],
-                            "email": commit["commit"]["author"]["email"],
-                            "date": commit["commit"]["author"]["date"]
-                        },
-                        "committer": {
-                            "name": commit["commit"]["committer"]["name"],
-                            "email": commit["commit"]["committer"]["email"],
-                            "date": commit["commit"]["committer"]["date"]
-                        },
-                        "stats_url": commit["url"]
-                    }
-                    for commit in commits
-                ]
+                if url and self.max_commit_pages and page_number >= self.max_commit_pages:
+                    logger.warning(f"Commit history for {owner}/{repo} truncated at {page_number} pages")
+                    break
                 
+                params = None
+                page_number += 1
+            
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error getting commits for {owner}/{repo}: {e}")
             if e.response.status_code == 404:
@@ -167,31 +657,295 @@ class GitHubService:
             logger.error(f"Error getting commits for {owner}/{repo}: {e}")
             raise ValueError(f"Failed to get commits: {str(e)}")
     
-    async def validate_access_token(self, access_token: str) -> Dict:
+    def _is_before(self, timestamp: Optional[int], since_timestamp: float) -> bool:
         """
-        Validate GitHub access token and get user info
+        Whether a commit was authored before the cutoff (undated commits are kept)
+        """
+        return timestamp is not None and timestamp < since_timestamp
+    
+    def _since_timestamp(self, since: Optional[datetime]) -> Optional[float]:
+        """
+        Epoch seconds of a cutoff (naive datetimes are UTC)
+        """
+        if since is None:
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return since.timestamp()
+    
+    def _since_param(self, since_timestamp: float) -> str:
+        """
+        since= query value: the cutoff rounded down to the start of its UTC day
+        """
+        day = datetime.fromtimestamp(since_timestamp, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return day.strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    def _commit_date_timestamp(self, commit: Dict) -> Optional[int]:
+        return parse_commit_timestamp((commit.get("author") or {}).get("date"))
+    
+    def _commit_time(self, pair: List) -> Optional[int]:
+        return pair[0]
+    
+    async def iter_repository_activity(
+        self,
+        username: str,
+        access_token: str,
+        since: datetime,
+        windows: Optional[Dict[int, datetime]] = None,
+        own_commits: bool = False
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream repositories with languages and commit counts via GraphQL, page by page
+        Replaces 1 + 2N REST calls with one query per page of repositories (token required)
+        windows maps activity windows (months) to their cutoffs; counts land in "activity"
+        own_commits counts only commits GitHub attributes to the user's account (one extra
+        query resolves the user's node ID), otherwise commits of every author
         """
+        if not access_token:
+            raise ValueError("GraphQL API requires an access token")
+        
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        windows = windows or {}
+        query = self._repository_activity_query(sorted(windows))
+        window_variables = {
+            f"since{months}": (cutoff if cutoff.tzinfo else cutoff.replace(tzinfo=timezone.utc)).isoformat()
+            for months, cutoff in windows.items()
+        }
+        
         try:
-            headers = self._get_headers(access_token)
+            author = None
+            if own_commits:
+                user = (await self._post_graphql(USER_ID_QUERY, {"login": username}, access_token)).get("user")
+                if user is None:
+                    raise ValueError(f"User {username} not found")
+                author = {"id": user["id"]}
+            
+            cursor = None
+            page_number = 1
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.api_base_url}/user"
+            while True:
+                data = await self._post_graphql(
+                    query,
+                    {
+                        "login": username,
+                        "cursor": cursor,
+                        "pageSize": self.graphql_page_size,
+                        "languageCount": self.graphql_language_count,
+                        "since": since.isoformat(),
+                        "author": author,
+                        **window_variables
+                    },
+                    access_token
+                )
                 
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+                if data.get("user") is None:
+                    raise ValueError(f"User {username} not found")
                 
-                user = response.json()
-                logger.info(f"Validated access token for user {user['login']}")
+                repositories = data["user"]["repositories"]
+                page = [self._project_repository_activity(node) for node in repositories["nodes"]]
+                logger.debug(f"Retrieved GraphQL repository page {page_number} for user {username}: {len(page)} repositories")
+                yield page
                 
-                return {
-                    "login": user["login"],
-                    "name": user.get("name"),
-                    "email": user.get("email"),
-                    "avatar_url": user["avatar_url"],
-                    "public_repos": user["public_repos"],
-                    "private_repos": user.get("total_private_repos", 0)
-                }
+                if not repositories["pageInfo"]["hasNextPage"]:
+                    break
+                if self.max_repo_pages and page_number >= self.max_repo_pages:
+                    logger.warning(f"GraphQL repository listing for {username} truncated at {page_number} pages")
+                    break
                 
+                cursor = repositories["pageInfo"]["endCursor"]
+                page_number += 1
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error querying GraphQL for {username}: {e}")
+            if e.response.status_code == 401:
+                raise ValueError("Invalid access token")
+            elif e.response.status_code == 403:
+                raise ValueError("Rate limit exceeded or access denied")
+            else:
+                raise ValueError(f"GitHub API error: {e.response.status_code}")
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error querying GraphQL for {username}: {e}")
+            raise ValueError(f"Failed to get repository activity: {str(e)}")
+    
+    def _repository_activity_query(self, window_months: List[int]) -> str:
+        """
+        Repository activity query with one aliased history count (recent{N}) per window
+        """
+        variables = "".join(f", $since{months}: GitTimestamp!" for months in window_months)
+        fields = "".join(
+            f"\n              recent{months}: history(since: $since{months}, author: $author) {{ totalCount }}"
+            for months in window_months
+        )
+        return REPOSITORY_ACTIVITY_QUERY.replace("__WINDOW_VARIABLES__", variables).replace("__WINDOW_FIELDS__", fields)
+    
+    async def _post_graphql(self, query: str, variables: Dict, access_token: str) -> Dict:
+        """
+        Execute a GraphQL query and return its data (GraphQL errors raise ValueError)
+        """
+        response = await self._send(
+            "POST",
+            self.graphql_url,
+            access_token,
+            resource="graphql",
+            headers=self._get_headers(access_token),
+            json={"query": query, "variables": variables}
+        )
+        response.raise_for_status()
+        
+        payload = response.json()
+        errors = payload.get("errors")
+        if errors and not payload.get("data"):
+            raise ValueError(f"GraphQL error: {errors[0].get('message', errors[0])}")
+        if errors:
+            # Partial results: e.g. a single repository failing to resolve
+            logger.warning(f"GraphQL returned partial data: {errors[0].get('message', errors[0])}")
+        
+        return payload["data"]
+    
+    def _project_repository_activity(self, node: Dict) -> Dict:
+        """
+        Flatten a GraphQL repository node to the REST repository fields plus activity
+        """
+        history = ((node.get("defaultBranchRef") or {}).get("target") or {})
+        return {
+            "name": node["name"],
+            "full_name": node["nameWithOwner"],
+            "description": node.get("description") or "",
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "size": node.get("diskUsage") or 0,
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            "updated_at": node.get("updatedAt"),
+            "pushed_at": node.get("pushedAt"),
+            "created_at": node.get("createdAt"),
+            "clone_url": f"{node['url']}.git",
+            "languages": {
+                edge["node"]["name"]: edge["size"]
+                for edge in node["languages"]["edges"]
+            },
+            "commit_count": (history.get("history") or {}).get("totalCount", 0),
+            "recent_commit_count": (history.get("recent") or {}).get("totalCount", 0),
+            "activity": {
+                alias[len("recent"):]: (count or {}).get("totalCount", 0)
+                for alias, count in history.items()
+                if alias.startswith("recent") and alias[len("recent"):].isdigit()
+            }
+        }
+    
+    def _project_repositories(self, repos: List[Dict]) -> List[Dict]:
+        """
+        Keep only the repository fields the analysis needs
+        """
+        return [
+            {
+                "name": repo["name"],
+                "full_name": repo["full_name"],
+                "description": repo.get("description", ""),
+                "language": repo.get("language"),
+                "size": repo["size"],
+                "stargazers_count": repo["stargazers_count"],
+                "forks_count": repo["forks_count"],
+                "updated_at": repo["updated_at"],
+                "pushed_at": repo.get("pushed_at"),
+                "created_at": repo["created_at"],
+                "archived": repo.get("archived", False),
+                "clone_url": repo["clone_url"],
+                "languages_url": repo["languages_url"]
+            }
+            for repo in repos
+            if not repo["fork"]  # Exclude forked repositories
+        ]
+    
+    def _project_commits(self, commits: List[Dict]) -> List[Dict]:
+        """
+        Flatten commit payloads to the fields the analysis needs
+        """
+        return [
+            {
+                "sha": commit["sha"],
+                "message": commit["commit"]["message"],
+                "author": {
+                    "name": commit["commit"]["author"]["name"],
+                    "email": commit["commit"]["author"]["email"],
+                    "date": commit["commit"]["author"]["date"]
+                },
+                "committer": {
+                    "name": commit["commit"]["committer"]["name"],
+                    "email": commit["commit"]["committer"]["email"],
+                    "date": commit["commit"]["committer"]["date"]
+                },
+                "stats_url": commit["url"]
+            }
+            for commit in commits
+        ]
+    
+    def _project_commit_times(self, commits: List[Dict]) -> List[List]:
+        """
+        Reduce commit payloads to [author timestamp, sha] pairs (lean mode)
+        """
+        projected = []
+        for commit in commits:
+            timestamp = parse_commit_timestamp(commit["commit"]["author"]["date"])
+            if timestamp is not None:
+                projected.append([timestamp, commit["sha"]])
+        return projected
+    
+    def _project_commit_authors(self, commits: List[Dict]) -> List[List]:
+        """
+        Reduce commit payloads to [author timestamp, author login] pairs (login lowercased, None if unlinked)
+        """
+        projected = []
+        for commit in commits:
+            timestamp = parse_commit_timestamp(commit["commit"]["author"]["date"])
+            if timestamp is not None:
+                login = (commit.get("author") or {}).get("login")
+                projected.append([timestamp, login.lower() if login else None])
+        return projected
+    
+    def _project_contributor_stats(self, stats: Optional[List[Dict]]) -> Dict[str, List[List[int]]]:
+        """
+        Reduce contributor statistics to {login: [[week start, commits], ...]}
+        (additions/deletions and empty weeks dropped; None = empty repository, 204)
+        """
+        projected = {}
+        for contributor in stats or []:
+            login = (contributor.get("author") or {}).get("login")
+            if login:
+                projected[login.lower()] = [
+                    [week["w"], week["c"]] for week in contributor.get("weeks", []) if week.get("c")
+                ]
+        return projected
+    
+    def _project_members(self, members: List[Dict]) -> List[str]:
+        return [member["login"] for member in members]
+    
+    async def validate_access_token(self, access_token: str) -> Dict:
+        """
+        Validate GitHub access token and get user info
+        """
+        try:
+            headers = self._get_headers(access_token)
+            
+            url = f"{self.api_base_url}/user"
+            
+            response = await self._send("GET", url, access_token, headers=headers)
+            response.raise_for_status()
+            
+            user = response.json()
+            logger.info(f"Validated access token for user {user['login']}")
+            
+            return {
+                "login": user["login"],
+                "name": user.get("name"),
+                "email": user.get("email"),
+                "avatar_url": user["avatar_url"],
+                "public_repos": user["public_repos"],
+                "private_repos": user.get("total_private_repos", 0)
+            }
+            
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error validating token: {e}")
             if e.response.status_code == 401:
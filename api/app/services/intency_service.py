@@ -10,37 +10,26 @@ Related Classes:
 
 Algorithm: Logarithmic scaling for volume/commits + complexity multipliers + recency boost
 Weighting: 35% volume, 35% commits, 20% repository spread, 10% recent activity
+(default@1; other weightings are versioned ScoringProfiles)
+Batch: calculate_language_intensities / normalize_intensities_batch score columnar arrays
+(one row per user-language) in a single NumPy pass, matching the scalar path
 """
 
-from typing import List, Dict
+from app.models.scoring import ScoringProfile
+from typing import List, Dict, Optional, Sequence
 import math
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SCORING_PROFILE = ScoringProfile(name="default", version=1)
+
 class IntencyService:
-    def __init__(self):
-        # Language complexity weights (higher = more complex)
-        self.language_complexity = {
-            "C++": 1.4,
-            "C": 1.3,
-            "Rust": 1.3,
-            "Assembly": 1.5,
-            "Java": 1.2,
-            "C#": 1.2,
-            "Go": 1.1,
-            "Python": 1.0,
-            "JavaScript": 1.0,
-            "TypeScript": 1.1,
-            "PHP": 0.9,
-            "Ruby": 0.9,
-            "HTML": 0.5,
-            "CSS": 0.6,
-            "Markdown": 0.3,
-            "JSON": 0.2,
-            "XML": 0.4,
-            "YAML": 0.3
-        }
+    def __init__(self, profile: Optional[ScoringProfile] = None):
+        # Weights and language complexity of the scoring model
+        self.profile = profile or DEFAULT_SCORING_PROFILE
+        self.language_complexity = self.profile.language_complexity
     
     def calculate_language_intensity(self, language: str, total_bytes: int, commit_count: int, repository_count: int, recent_activity: int = None) -> float:
         """
@@ -69,14 +58,14 @@ class IntencyService:
         if recent_activity is not None and recent_activity > 0 and commit_count > 0:
             # Boost intensity based on recent activity ratio
             activity_ratio = recent_activity / commit_count
-            recency_boost = 1.0 + (activity_ratio * 0.3)  # Up to 30% boost for recent activity
+            recency_boost = 1.0 + (activity_ratio * self.profile.recency_boost)  # Up to 30% boost for recent activity
         
         # Combine scores with weights
         base_intensity = (
-            volume_score * 0.35 +      # 35% weight on code volume
-            commit_score * 0.35 +      # 35% weight on commit activity  
-            repository_score * 0.20 +  # 20% weight on repository spread
-            (recency_boost - 1.0) * 10 # 10% boost for recent activity
+            volume_score * self.profile.volume_weight +            # 35% weight on code volume
+            commit_score * self.profile.commit_weight +            # 35% weight on commit activity
+            repository_score * self.profile.repository_weight +    # 20% weight on repository spread
+            (recency_boost - 1.0) * self.profile.recency_weight    # 10% boost for recent activity
         )
         
         # Apply language complexity multiplier
@@ -91,6 +80,92 @@ class IntencyService:
         
         return round(final_intensity, 2)
     
+    def calculate_language_intensities(
+        self,
+        languages: Sequence[str],
+        total_bytes: Sequence[int],
+        commit_counts: Sequence[int],
+        repository_counts: Sequence[int],
+        recent_activity: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_language_intensity over columnar inputs
+        Rows may belong to any number of users; returns one rounded score per row
+        """
+        total_bytes = np.asarray(total_bytes, dtype=np.int64)
+        commit_counts = np.asarray(commit_counts, dtype=np.float64)
+        repository_counts = np.asarray(repository_counts, dtype=np.float64)
+        if recent_activity is None:
+            recent_activity = np.zeros_like(commit_counts)
+        else:
+            recent_activity = np.asarray(recent_activity, dtype=np.float64)
+        
+        line_counts = (total_bytes // 50).astype(np.float64)  # Rough estimation: 50 bytes per line
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volume_scores = np.where(
+                line_counts > 0, np.minimum(np.log10(np.maximum(line_counts, 1)) * 15, 50.0), 0.0
+            )
+            commit_scores = np.where(
+                commit_counts > 0, np.minimum(np.log10(np.maximum(commit_counts, 1)) * 20, 40.0), 0.0
+            )
+            repository_scores = np.where(
+                repository_counts > 0, np.minimum(np.sqrt(np.maximum(repository_counts, 0)) * 8, 30.0), 0.0
+            )
+            recency_boosts = np.where(
+                (recent_activity > 0) & (commit_counts > 0),
+                1.0 + (recent_activity / commit_counts) * self.profile.recency_boost,
+                1.0
+            )
+        
+        base_intensities = (
+            volume_scores * self.profile.volume_weight +
+            commit_scores * self.profile.commit_weight +
+            repository_scores * self.profile.repository_weight +
+            (recency_boosts - 1.0) * self.profile.recency_weight
+        )
+        final_intensities = np.minimum(base_intensities * self._get_language_complexities(languages), 100.0)
+        final_intensities = np.where((total_bytes == 0) | (commit_counts == 0), 0.0, final_intensities)
+        
+        return np.round(final_intensities, 2)
+    
+    def normalize_intensities_batch(
+        self,
+        intensities: Sequence[float],
+        groups: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        Vectorized normalize_intensities; rows sharing a group ID (e.g. a user)
+        are scaled together so each group's highest intensity becomes 100
+        """
+        intensities = np.asarray(intensities, dtype=np.float64)
+        if intensities.size == 0:
+            return intensities
+        
+        if groups is None:
+            groups = np.zeros(intensities.shape, dtype=np.int64)
+        else:
+            _, groups = np.unique(np.asarray(groups), return_inverse=True)
+        
+        group_max = np.zeros(groups.max() + 1, dtype=np.float64)
+        np.maximum.at(group_max, groups, intensities)
+        row_max = group_max[groups]
+        
+        # Groups whose maximum is 0 are left unchanged
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = np.where(row_max != 0, np.round(intensities * (100.0 / row_max), 2), intensities)
+        return normalized
+    
+    def _get_language_complexities(self, languages: Sequence[str]) -> np.ndarray:
+        """
+        Complexity multipliers for a column of languages (one lookup per distinct language)
+        """
+        if len(languages) == 0:
+            return np.zeros(0, dtype=np.float64)
+        distinct, inverse = np.unique(np.asarray(languages, dtype=object), return_inverse=True)
+        weights = np.array([self._get_language_complexity(language) for language in distinct], dtype=np.float64)
+        return weights[inverse]
+    
     def _calculate_volume_score(self, line_count: int) -> float:
         """
         Calculate score based on code volume (logarithmic scale)
@@ -130,7 +205,7 @@ class IntencyService:
         """
         Get complexity multiplier for a language
         """
-        return self.language_complexity.get(language, 1.0)  # Default to 1.0 for unknown languages
+        return self.language_complexity.get(language, self.profile.default_complexity)  # Default to 1.0 for unknown languages
     
     def _apply_time_weight(self, base_intensity: float, maintenance_months: int) -> float:
         """
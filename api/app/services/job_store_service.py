@@ -0,0 +1,224 @@
+"""
+Job Store Service - Persistent Analysis Job Storage
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Keeps analysis job state outside the worker process so any API worker can serve it
+
+Related Classes:
+- AnalysisService: Creates, updates and reads jobs through the store
+- CacheService: Provides the pooled Redis client used by RedisJobStore
+- Models: AnalysisJob, AnalysisResult, BatchAnalysisResult
+
+Backends: "redis" (one hash per job, shared across workers/nodes) or "memory" (single process)
+Expiry: Finished jobs expire after JOB_RESULT_TTL, unfinished jobs after JOB_ACTIVE_TTL
+Single-flight: Flight keys map an analysis identity to the job currently serving it (SET NX)
+"""
+
+from app.models.analysis import AnalysisJob
+from app.services.cache_service import CacheService
+from redis.exceptions import RedisError
+from typing import Dict, Optional, Tuple
+from abc import ABC, abstractmethod
+import os
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Release a flight key only if it still points at the releasing job:
+# ARGV[2] > 0 shortens its lifetime to that many seconds, otherwise it is deleted
+_RELEASE_FLIGHT_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    if tonumber(ARGV[2]) > 0 then
+        return redis.call('expire', KEYS[1], ARGV[2])
+    end
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+FINISHED_STATUSES = ("completed", "failed")
+
+# Nested job fields stored as JSON strings in the job hash
+JSON_FIELDS = ("result", "progress", "batch_result")
+
+class JobStore(ABC):
+    def __init__(self):
+        self.result_ttl = int(os.getenv("JOB_RESULT_TTL", "86400"))
+        self.active_ttl = int(os.getenv("JOB_ACTIVE_TTL", "21600"))
+    
+    @abstractmethod
+    async def save(self, job: AnalysisJob):
+        """
+        Create or replace a job
+        """
+    
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """
+        Get a job by ID (None if missing or expired)
+        """
+    
+    @abstractmethod
+    async def delete(self, job_id: str):
+        """
+        Remove a job
+        """
+    
+    @abstractmethod
+    async def claim_flight(self, flight_key: str, job_id: str, ttl: int) -> Optional[str]:
+        """
+        Atomically register job_id as the job serving flight_key
+        Returns None when claimed, otherwise the job ID that already holds the key
+        """
+    
+    @abstractmethod
+    async def release_flight(self, flight_key: str, job_id: str, keep_seconds: int = 0):
+        """
+        Release flight_key if job_id still holds it; keep_seconds > 0 keeps it
+        pointing at the finished job for that long instead of deleting it
+        """
+    
+    def _ttl_for(self, job: AnalysisJob) -> int:
+        return self.result_ttl if job.status in FINISHED_STATUSES else self.active_ttl
+
+class InMemoryJobStore(JobStore):
+    def __init__(self):
+        super().__init__()
+        self.jobs: Dict[str, Tuple[AnalysisJob, float]] = {}
+        self.flights: Dict[str, Tuple[str, float]] = {}
+    
+    async def save(self, job: AnalysisJob):
+        self._prune()
+        self.jobs[job.job_id] = (job, time.time() + self._ttl_for(job))
+    
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        entry = self.jobs.get(job_id)
+        if entry is None:
+            return None
+        job, expires_at = entry
+        if expires_at <= time.time():
+            del self.jobs[job_id]
+            return None
+        return job
+    
+    async def delete(self, job_id: str):
+        self.jobs.pop(job_id, None)
+    
+    async def claim_flight(self, flight_key: str, job_id: str, ttl: int) -> Optional[str]:
+        self._prune()
+        entry = self.flights.get(flight_key)
+        if entry is not None:
+            return entry[0]
+        self.flights[flight_key] = (job_id, time.time() + ttl)
+        return None
+    
+    async def release_flight(self, flight_key: str, job_id: str, keep_seconds: int = 0):
+        entry = self.flights.get(flight_key)
+        if entry is None or entry[0] != job_id:
+            return
+        if keep_seconds > 0:
+            self.flights[flight_key] = (job_id, time.time() + keep_seconds)
+        else:
+            del self.flights[flight_key]
+    
+    def _prune(self):
+        """
+        Drop expired jobs and flight keys so the store stays bounded
+        """
+        now = time.time()
+        expired = [job_id for job_id, (_, expires_at) in self.jobs.items() if expires_at <= now]
+        for job_id in expired:
+            del self.jobs[job_id]
+        expired = [key for key, (_, expires_at) in self.flights.items() if expires_at <= now]
+        for key in expired:
+            del self.flights[key]
+
+class RedisJobStore(JobStore):
+    def __init__(self, redis_client):
+        super().__init__()
+        self.redis_client = redis_client
+    
+    async def save(self, job: AnalysisJob):
+        key = self._job_key(job.job_id)
+        data = job.model_dump(mode="json")
+        mapping = {
+            field: json.dumps(value, separators=(",", ":")) if field in JSON_FIELDS else value
+            for field, value in data.items()
+            if value is not None
+        }
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, self._ttl_for(job))
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Failed to save job {job.job_id}: {e}")
+            raise ValueError(f"Failed to save job {job.job_id}")
+    
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        try:
+            data = await self.redis_client.hgetall(self._job_key(job_id))
+        except RedisError as e:
+            logger.error(f"Failed to read job {job_id}: {e}")
+            raise ValueError(f"Failed to read job {job_id}")
+        
+        if not data:
+            return None
+        
+        fields = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in data.items()
+        }
+        for field in JSON_FIELDS:
+            if field in fields:
+                fields[field] = json.loads(fields[field])
+        return AnalysisJob.model_validate(fields)
+    
+    async def delete(self, job_id: str):
+        try:
+            await self.redis_client.delete(self._job_key(job_id))
+        except RedisError as e:
+            logger.warning(f"Failed to delete job {job_id}: {e}")
+    
+    async def claim_flight(self, flight_key: str, job_id: str, ttl: int) -> Optional[str]:
+        key = self._flight_key(flight_key)
+        try:
+            # Retry once in case the holder expired between SET NX and GET
+            for _ in range(2):
+                if await self.redis_client.set(key, job_id, nx=True, ex=ttl):
+                    return None
+                holder = await self.redis_client.get(key)
+                if holder is not None:
+                    return holder.decode() if isinstance(holder, bytes) else holder
+        except RedisError as e:
+            # Without coordination every request runs its own analysis
+            logger.warning(f"Failed to claim flight {flight_key}: {e}")
+        return None
+    
+    async def release_flight(self, flight_key: str, job_id: str, keep_seconds: int = 0):
+        try:
+            await self.redis_client.eval(
+                _RELEASE_FLIGHT_SCRIPT, 1, self._flight_key(flight_key), job_id, keep_seconds
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to release flight {flight_key}: {e}")
+    
+    def _job_key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+    
+    def _flight_key(self, flight_key: str) -> str:
+        return f"flight:{flight_key}"
+
+def create_job_store(cache_service: CacheService) -> JobStore:
+    """
+    Build the configured job store (JOB_STORE_BACKEND: redis | memory, default redis when available)
+    """
+    backend = os.getenv("JOB_STORE_BACKEND", "redis" if cache_service.enabled else "memory").lower()
+    if backend == "redis":
+        if not cache_service.enabled:
+            raise ValueError("JOB_STORE_BACKEND=redis requires REDIS_URL")
+        return RedisJobStore(cache_service.redis_client)
+    return InMemoryJobStore()
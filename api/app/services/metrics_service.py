@@ -0,0 +1,150 @@
+"""
+Metrics Service - Prometheus Metrics for the Analysis Pipeline
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Exposes pipeline stage timings, GitHub usage, cache efficiency and job load for tuning
+
+Related Classes:
+- AnalysisService: Stage timings, in-flight jobs, job outcomes and single-flight reuse
+- GitHubService: Request counts/durations by endpoint and status, response cache lookups
+- SnapshotService: Snapshot reuse (cache="snapshot")
+- RepositorySelectionService: Listed repositories by pre-filter outcome
+- RateLimitService, AnalysisQueueService: Sampled when metrics are collected (remaining budget, queue depth)
+
+Exposition: GET /metrics on the API; worker.py serves its own on ANALYSIS_WORKER_METRICS_PORT
+Cardinality: Endpoints are path templates and tokens are never labels (budgets are summarized per resource)
+"""
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from typing import Tuple
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Pipeline stages: listing, languages, commits, stats, mirror, graphql, scoring, the whole analysis and whole batches
+STAGE_DURATION = Histogram(
+    "skill_piler_stage_duration_seconds",
+    "Duration of analysis pipeline stages",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+
+ANALYSES = Counter(
+    "skill_piler_analyses_total",
+    "Finished analyses by outcome",
+    ["status"]
+)
+
+JOBS_IN_FLIGHT = Gauge(
+    "skill_piler_analysis_jobs_in_flight",
+    "Analyses currently running in this process"
+)
+
+QUEUE_DEPTH = Gauge(
+    "skill_piler_analysis_queue_depth",
+    "Messages in the analysis queue (queued + in progress)"
+)
+
+GITHUB_REQUESTS = Counter(
+    "skill_piler_github_requests_total",
+    "GitHub API requests by endpoint and response status (every retry attempt counts)",
+    ["endpoint", "status"]
+)
+
+GITHUB_REQUEST_DURATION = Histogram(
+    "skill_piler_github_request_duration_seconds",
+    "GitHub API request latency",
+    ["endpoint"]
+)
+
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "skill_piler_github_rate_limit_remaining",
+    "Lowest remaining GitHub rate-limit budget across tracked tokens",
+    ["resource"]
+)
+
+GITHUB_RATE_LIMIT_RESET = Gauge(
+    "skill_piler_github_rate_limit_reset_seconds",
+    "Seconds until the lowest tracked budget resets",
+    ["resource"]
+)
+
+GITHUB_RATE_LIMIT_TOKENS = Gauge(
+    "skill_piler_github_rate_limit_tokens",
+    "Tokens with a tracked, unexpired budget",
+    ["resource"]
+)
+
+CACHE_LOOKUPS = Counter(
+    "skill_piler_cache_lookups_total",
+    "Cache lookups by cache and result (hit, miss, revalidated)",
+    ["cache", "result"]
+)
+
+# Outcomes: analyze, languages (no commits in the history window), empty, archived, stale, sampled
+REPOSITORY_SELECTION = Counter(
+    "skill_piler_repository_selection_total",
+    "Listed repositories by pre-filter outcome",
+    ["outcome"]
+)
+
+class MetricsService:
+    def __init__(self, rate_limit_service=None, queue_service=None):
+        self.rate_limit_service = rate_limit_service
+        self.queue_service = queue_service
+        # Resources with a published remaining-budget sample (removed once all their budgets reset)
+        self._sampled_resources = set()
+    
+    async def collect(self):
+        """
+        Refresh gauges that are sampled rather than updated as events happen
+        """
+        self._collect_rate_limits()
+        
+        if self.queue_service is not None:
+            try:
+                QUEUE_DEPTH.set(await self.queue_service.depth())
+            except Exception as e:
+                logger.warning(f"Failed to read analysis queue depth: {e}")
+    
+    async def render(self) -> Tuple[bytes, str]:
+        """
+        Metrics in the Prometheus text format, with its content type
+        """
+        await self.collect()
+        return generate_latest(), CONTENT_TYPE_LATEST
+    
+    def _collect_rate_limits(self):
+        if self.rate_limit_service is None:
+            return
+        
+        now = time.time()
+        lowest = {}
+        tokens = {}
+        for (_, resource), budget in list(self.rate_limit_service.budgets.items()):
+            if budget.reset_at <= now:
+                continue
+            tokens[resource] = tokens.get(resource, 0) + 1
+            if resource not in lowest or budget.remaining < lowest[resource].remaining:
+                lowest[resource] = budget
+        
+        for resource in set(tokens) | self._sampled_resources:
+            GITHUB_RATE_LIMIT_TOKENS.labels(resource).set(tokens.get(resource, 0))
+            budget = lowest.get(resource)
+            if budget is None:
+                GITHUB_RATE_LIMIT_REMAINING.remove(resource)
+                GITHUB_RATE_LIMIT_RESET.remove(resource)
+                self._sampled_resources.discard(resource)
+                continue
+            GITHUB_RATE_LIMIT_REMAINING.labels(resource).set(budget.remaining)
+            GITHUB_RATE_LIMIT_RESET.labels(resource).set(budget.reset_at - now)
+            self._sampled_resources.add(resource)
+
+def observe_cache(cache: str, result: str):
+    """
+    Count a cache lookup (result: hit, miss or revalidated)
+    """
+    CACHE_LOOKUPS.labels(cache, result).inc()
@@ -0,0 +1,248 @@
+"""
+Progress Service - Live Analysis Progress Events
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Pushes job progress to clients instead of having them poll GET /analyze/{job_id}
+
+Related Classes:
+- AnalysisService: Reports phases and repository counts through JobProgress and
+publishes the final completed/failed event
+- CacheService: Provides the pooled Redis client used for pub/sub
+- IncrementalRanking: Provisional ranking for partial results
+- Models: AnalysisProgress
+
+Transport: Redis pub/sub channel job:{job_id}:events, so events reach API nodes serving the
+stream wherever the job runs (API process or worker); in-process fan-out without Redis
+Connections: Each process subscribes over one shared pub/sub connection and routes messages to
+per-job queues, so open streams never drain the cache pool; on Redis errors streams fall back to
+polling the job store
+Throttling: Count updates are published at most every PROGRESS_MIN_INTERVAL seconds per job;
+phase changes and final events are always published
+Partial Results: With an IncrementalRanking, each update is followed by a "partial" event
+carrying the provisional language ranking of the repositories processed so far
+"""
+
+from app.models.analysis import AnalysisProgress
+from app.services.cache_service import CacheService
+from app.services.scoring_service import IncrementalRanking
+from redis.exceptions import RedisError
+from contextlib import asynccontextmanager
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Optional, Set
+import os
+import json
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ProgressSubscription:
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+    
+    async def next_event(self, timeout: float) -> Optional[Dict]:
+        """
+        Wait up to timeout seconds for the next event (None = nothing arrived)
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class ProgressService:
+    def __init__(self, cache_service: CacheService):
+        self.redis_client = cache_service.redis_client
+        self.min_interval = float(os.getenv("PROGRESS_MIN_INTERVAL", "0.5"))
+        self.heartbeat_interval = float(os.getenv("PROGRESS_HEARTBEAT_INTERVAL", "15"))
+        
+        # Subscribers of this process per job, fed in-process or by the shared pub/sub listener
+        self._queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        
+        # One pub/sub connection per process, shared by every stream
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._pubsub_lock = asyncio.Lock()
+    
+    async def publish(self, job_id: str, event: Dict):
+        """
+        Publish a progress event to every subscriber of a job
+        """
+        if self.redis_client is None:
+            self._deliver(job_id, event)
+            return
+        
+        try:
+            await self.redis_client.publish(self._channel(job_id), json.dumps(event, separators=(",", ":")))
+        except RedisError as e:
+            # Progress is best effort; the job itself carries on
+            logger.warning(f"Failed to publish progress for job {job_id}: {e}")
+    
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[ProgressSubscription]:
+        """
+        Receive a job's progress events for the duration of the context
+        Without Redis (or when subscribing fails) events are in-process only and
+        stream_progress falls back to re-reading the job every heartbeat
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        first = not self._queues.get(job_id)
+        self._queues[job_id].add(queue)
+        try:
+            if self.redis_client is not None and first:
+                await self._subscribe_channel(job_id)
+            yield ProgressSubscription(queue)
+        finally:
+            self._queues[job_id].discard(queue)
+            if not self._queues[job_id]:
+                del self._queues[job_id]
+                if self.redis_client is not None:
+                    await self._unsubscribe_channel(job_id)
+    
+    async def close(self):
+        """
+        Stop the shared pub/sub listener and release its connection (called from the app lifespan)
+        """
+        async with self._pubsub_lock:
+            await self._reset_pubsub()
+    
+    def tracker(self, job_id: str, ranking: Optional[IncrementalRanking] = None) -> "JobProgress":
+        """
+        Progress tracker for one running job (with a ranking, partial results are published too)
+        """
+        return JobProgress(self, job_id, ranking)
+    
+    async def _subscribe_channel(self, job_id: str):
+        async with self._pubsub_lock:
+            try:
+                if self._pubsub is None:
+                    # (Re)connect: jobs left without events by a failed connection subscribe again too
+                    self._pubsub = self.redis_client.pubsub()
+                    await self._pubsub.subscribe(*[self._channel(subscribed) for subscribed in self._queues])
+                else:
+                    await self._pubsub.subscribe(self._channel(job_id))
+                if self._listener is None:
+                    self._listener = asyncio.create_task(self._listen(self._pubsub))
+            except RedisError as e:
+                logger.warning(f"Failed to subscribe to progress for job {job_id}, polling instead: {e}")
+                await self._reset_pubsub()
+    
+    async def _unsubscribe_channel(self, job_id: str):
+        async with self._pubsub_lock:
+            if self._pubsub is None:
+                return
+            try:
+                await self._pubsub.unsubscribe(self._channel(job_id))
+            except RedisError as e:
+                logger.warning(f"Failed to unsubscribe from progress for job {job_id}: {e}")
+                await self._reset_pubsub()
+    
+    async def _listen(self, pubsub):
+        """
+        Route messages of the shared pub/sub connection to the subscribers of each job
+        """
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                self._deliver(self._job_id(channel), json.loads(message["data"]))
+        except RedisError as e:
+            # Open streams keep polling the job; the next subscription reconnects
+            logger.warning(f"Progress listener stopped: {e}")
+            async with self._pubsub_lock:
+                if self._pubsub is pubsub:
+                    self._listener = None
+                    await self._reset_pubsub()
+    
+    async def _reset_pubsub(self):
+        listener, self._listener = self._listener, None
+        if listener is not None and listener is not asyncio.current_task():
+            listener.cancel()
+            try:
+                await listener
+            except (asyncio.CancelledError, RedisError):
+                pass
+        
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except RedisError:
+                pass
+    
+    def _deliver(self, job_id: str, event: Dict):
+        for queue in self._queues.get(job_id, ()):
+            queue.put_nowait(event)
+    
+    def _channel(self, job_id: str) -> str:
+        return f"job:{job_id}:events"
+    
+    def _job_id(self, channel: str) -> str:
+        return channel[len("job:"):-len(":events")]
+
+class JobProgress:
+    def __init__(
+        self,
+        progress_service: ProgressService,
+        job_id: str,
+        ranking: Optional[IncrementalRanking] = None
+    ):
+        self.progress_service = progress_service
+        self.job_id = job_id
+        self.progress = AnalysisProgress(phase="pending")
+        self.ranking = ranking
+        self._ranking_changed = False
+        self._last_published = 0.0
+    
+    async def phase(self, phase: str):
+        """
+        Enter a new phase (always published)
+        """
+        self.progress.phase = phase
+        if phase == "fetching":
+            self.progress.repositories_total = self.progress.repositories_discovered
+        await self._publish(force=True)
+    
+    async def discovered(self, count: int):
+        """
+        Record newly listed repositories
+        """
+        self.progress.repositories_discovered += count
+        await self._publish()
+    
+    async def processed(self, data: Optional[Dict] = None):
+        """
+        Record a finished repository (fetched, reused, or None after failure)
+        """
+        self.progress.repositories_processed += 1
+        if data is not None and self.ranking is not None:
+            self.ranking.add(data)
+            self._ranking_changed = True
+        await self._publish()
+    
+    async def _publish(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_published < self.progress_service.min_interval:
+            return
+        self._last_published = now
+        await self.progress_service.publish(self.job_id, {
+            "type": "progress",
+            "job_id": self.job_id,
+            "status": "processing",
+            "progress": self.progress.model_dump()
+        })
+        
+        if self._ranking_changed:
+            self._ranking_changed = False
+            await self.progress_service.publish(self.job_id, {
+                "type": "partial",
+                "job_id": self.job_id,
+                "status": "processing",
+                "progress": self.progress.model_dump(),
+                "total_commits": self.ranking.total_commits,
+                "languages": [language.model_dump() for language in self.ranking.ranking()]
+            })
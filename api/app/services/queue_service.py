@@ -0,0 +1,170 @@
+"""
+Queue Service - Durable Analysis Job Queue (Redis Streams)
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Hands analysis work from API nodes to independently scaled worker nodes
+
+Related Classes:
+- AnalysisService: Enqueues AnalysisRequests when ANALYSIS_EXECUTION=queue
+- BatchAnalysisService: Enqueues BatchAnalysisRequests (kind "batch") in the same mode
+- AnalysisWorker: Claims, runs and acknowledges queued analyses and batches
+- CacheService: Provides the pooled Redis client
+
+Delivery: Consumer group (at-least-once); unacknowledged messages idle longer than the
+visibility timeout are reclaimed by another worker, up to ANALYSIS_QUEUE_MAX_ATTEMPTS
+Security: Messages carry the request's access token and are deleted once acknowledged
+"""
+
+from app.models.analysis import AnalysisRequest, BatchAnalysisRequest
+from app.services.rate_limit_service import RequestPriority
+from redis.exceptions import ResponseError
+from dataclasses import dataclass
+from typing import Dict, List, Union
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class QueuedAnalysis:
+    message_id: str
+    job_id: str
+    request: Union[AnalysisRequest, BatchAnalysisRequest]
+    priority: RequestPriority
+    attempts: int
+    kind: str = "analysis"  # "analysis" or "batch"
+
+class AnalysisQueueService:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.stream = os.getenv("ANALYSIS_QUEUE_STREAM", "analysis:queue")
+        self.group = os.getenv("ANALYSIS_QUEUE_GROUP", "analysis-workers")
+        self.visibility_timeout_ms = int(float(os.getenv("ANALYSIS_QUEUE_VISIBILITY_TIMEOUT", "300")) * 1000)
+        self.max_attempts = int(os.getenv("ANALYSIS_QUEUE_MAX_ATTEMPTS", "3"))
+        self._group_ready = False
+    
+    async def ensure_group(self):
+        """
+        Create the stream and consumer group if they do not exist yet
+        """
+        if self._group_ready:
+            return
+        try:
+            await self.redis_client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+    
+    async def enqueue(
+        self,
+        job_id: str,
+        request: Union[AnalysisRequest, BatchAnalysisRequest],
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> str:
+        """
+        Add an analysis (or a batch analysis) to the queue and return its message ID
+        """
+        await self.ensure_group()
+        message_id = await self.redis_client.xadd(self.stream, {
+            "job_id": job_id,
+            "kind": "batch" if isinstance(request, BatchAnalysisRequest) else "analysis",
+            "request": request.model_dump_json(),
+            "priority": int(priority)
+        })
+        return self._decode(message_id)
+    
+    async def claim(self, consumer: str, count: int, block_ms: int = 5000) -> List[QueuedAnalysis]:
+        """
+        Claim up to count analyses: abandoned ones (crashed workers) first, then new ones
+        """
+        await self.ensure_group()
+        
+        claimed = await self._reclaim_abandoned(consumer, count)
+        if len(claimed) < count:
+            response = await self.redis_client.xreadgroup(
+                self.group,
+                consumer,
+                {self.stream: ">"},
+                count=count - len(claimed),
+                block=block_ms
+            )
+            for _, messages in response or []:
+                for message_id, fields in messages:
+                    claimed.append(await self._to_queued(message_id, fields))
+        
+        return claimed
+    
+    async def ack(self, message_id: str):
+        """
+        Acknowledge a finished analysis and drop its message
+        """
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, message_id)
+            pipe.xdel(self.stream, message_id)
+            pipe.hdel(self._attempts_key(), message_id)
+            await pipe.execute()
+    
+    async def extend(self, consumer: str, message_ids: List[str]):
+        """
+        Heartbeat: reset the idle time of in-progress messages so they are not reclaimed
+        """
+        if message_ids:
+            await self.redis_client.xclaim(
+                self.stream, self.group, consumer, 0, message_ids, justid=True
+            )
+    
+    async def depth(self) -> int:
+        """
+        Number of messages in the stream (queued + in progress)
+        """
+        return await self.redis_client.xlen(self.stream)
+    
+    async def _reclaim_abandoned(self, consumer: str, count: int) -> List[QueuedAnalysis]:
+        response = await self.redis_client.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            self.visibility_timeout_ms,
+            start_id="0-0",
+            count=count
+        )
+        claimed = []
+        for message_id, fields in response[1]:
+            if fields is None:
+                continue
+            queued = await self._to_queued(message_id, fields)
+            logger.warning(f"Reclaimed abandoned analysis job {queued.job_id} (attempt {queued.attempts})")
+            claimed.append(queued)
+        return claimed
+    
+    def is_exhausted(self, queued: QueuedAnalysis) -> bool:
+        """
+        Whether a message has been delivered more often than max_attempts
+        """
+        return queued.attempts > self.max_attempts
+    
+    async def _to_queued(self, message_id, fields: Dict) -> QueuedAnalysis:
+        """
+        Decode a stream message and count the delivery attempt
+        """
+        message_id = self._decode(message_id)
+        fields = {self._decode(k): self._decode(v) for k, v in fields.items()}
+        attempts = await self.redis_client.hincrby(self._attempts_key(), message_id, 1)
+        kind = fields.get("kind", "analysis")
+        request_model = BatchAnalysisRequest if kind == "batch" else AnalysisRequest
+        
+        return QueuedAnalysis(
+            message_id=message_id,
+            job_id=fields["job_id"],
+            request=request_model.model_validate_json(fields["request"]),
+            priority=RequestPriority(int(fields.get("priority", RequestPriority.INTERACTIVE))),
+            attempts=attempts,
+            kind=kind
+        )
+    
+    def _attempts_key(self) -> str:
+        return f"{self.stream}:attempts"
+    
+    def _decode(self, value) -> str:
+        return value.decode() if isinstance(value, bytes) else str(value)
@@ -0,0 +1,231 @@
+"""
+Rate Limit Service - GitHub Request Scheduling, Budget Tracking and Backoff
+
+Design Reference: CLAUDE.md - External Dependencies, Security Considerations
+Purpose: Keeps GitHub API usage inside the rate-limit budget instead of failing jobs
+
+Related Classes:
+- GitHubService: Sends every REST/GraphQL request through this scheduler
+- AnalysisService: Marks jobs as interactive or background via request_priority
+
+Budget: X-RateLimit-Limit/Remaining/Reset/Resource tracked per token (anonymous = per process IP)
+Pacing: Below a reserve fraction, requests are spread evenly over the time left until reset
+Retry: 429 / secondary-rate-limit 403 with Retry-After or jittered exponential backoff
+Priority: Interactive requests are admitted ahead of background refreshes
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import os
+import time
+import heapq
+import random
+import asyncio
+import logging
+import itertools
+import httpx
+
+logger = logging.getLogger(__name__)
+
+class RequestPriority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+# Priority of GitHub requests made from the current task (inherited by child tasks)
+request_priority: ContextVar[RequestPriority] = ContextVar(
+    "github_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+@dataclass
+class RateLimitBudget:
+    limit: int
+    remaining: int
+    reset_at: float
+
+class RateLimitService:
+    def __init__(self):
+        self.max_in_flight = max(1, int(os.getenv("GITHUB_MAX_IN_FLIGHT", "20")))
+        self.max_retries = int(os.getenv("GITHUB_MAX_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("GITHUB_BACKOFF_BASE", "1.0"))
+        self.backoff_max = float(os.getenv("GITHUB_BACKOFF_MAX", "60"))
+        # Longest we are willing to wait for an exhausted budget to reset
+        self.max_reset_wait = float(os.getenv("GITHUB_MAX_RESET_WAIT", "60"))
+        # Fraction of the budget below which requests are paced; background
+        # work starts pacing earlier so interactive jobs keep some headroom
+        self.pacing_reserve = {
+            RequestPriority.INTERACTIVE: float(os.getenv("GITHUB_PACING_RESERVE", "0.1")),
+            RequestPriority.BACKGROUND: float(os.getenv("GITHUB_BACKGROUND_RESERVE", "0.3"))
+        }
+        
+        self.budgets: Dict[Tuple[str, str], RateLimitBudget] = {}
+        
+        # Priority admission gate for in-flight requests
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+    
+    async def send(
+        self,
+        identity: str,
+        resource: str,
+        send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send a request through the scheduler: admit by priority, pace against
+        the remaining budget, and retry rate-limited responses with backoff
+        """
+        priority = request_priority.get()
+        
+        for attempt in range(self.max_retries + 1):
+            await self._pace(identity, resource, priority)
+            
+            await self._acquire(priority)
+            try:
+                response = await send()
+            finally:
+                self._release()
+            
+            self.record(identity, response)
+            
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+            
+            logger.warning(
+                f"GitHub rate limited ({response.status_code}) for {identity}/{resource}, "
+                f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})"
+            )
+            await asyncio.sleep(delay)
+        
+        return response
+    
+    def record(self, identity: str, response: httpx.Response):
+        """
+        Update the budget for a token from X-RateLimit-* response headers
+        """
+        headers = response.headers
+        limit = self._parse_int(headers.get("X-RateLimit-Limit"))
+        remaining = self._parse_int(headers.get("X-RateLimit-Remaining"))
+        reset_at = self._parse_int(headers.get("X-RateLimit-Reset"))
+        if limit is None or remaining is None or reset_at is None:
+            return
+        
+        resource = headers.get("X-RateLimit-Resource") or "core"
+        self.budgets[(identity, resource)] = RateLimitBudget(
+            limit=limit,
+            remaining=remaining,
+            reset_at=float(reset_at)
+        )
+    
+    def get_budget(self, identity: str, resource: str = "core") -> Optional[RateLimitBudget]:
+        return self.budgets.get((identity, resource))
+    
+    def _pacing_delay(self, identity: str, resource: str, priority: RequestPriority) -> float:
+        """
+        Seconds to wait before the next request so the remaining budget lasts until reset
+        """
+        budget = self.budgets.get((identity, resource))
+        if budget is None:
+            return 0.0
+        
+        now = time.time()
+        if budget.reset_at <= now:
+            # Window has rolled over; the next response refreshes the budget
+            return 0.0
+        
+        seconds_left = budget.reset_at - now
+        if budget.remaining <= 0:
+            if seconds_left > self.max_reset_wait:
+                raise ValueError(
+                    f"Rate limit exceeded (resets in {int(seconds_left)}s)"
+                )
+            return seconds_left
+        
+        reserve = budget.limit * self.pacing_reserve[priority]
+        if budget.remaining > reserve:
+            return 0.0
+        return seconds_left / budget.remaining
+    
+    async def _pace(self, identity: str, resource: str, priority: RequestPriority):
+        delay = self._pacing_delay(identity, resource, priority)
+        if delay > 0:
+            logger.debug(f"Pacing GitHub request for {identity}/{resource} by {delay:.2f}s")
+            budget = self.budgets[(identity, resource)]
+            # Reserve the slot we are about to use so concurrent callers spread out too
+            budget.remaining = max(budget.remaining - 1, 0)
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """
+        Backoff before retrying a rate-limited response (None = do not retry)
+        """
+        if attempt >= self.max_retries:
+            return None
+        if response.status_code not in (403, 429):
+            return None
+        
+        headers = response.headers
+        retry_after = self._parse_int(headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 1)
+        
+        if self._parse_int(headers.get("X-RateLimit-Remaining")) == 0:
+            # Primary limit exhausted: only worth waiting if the reset is close
+            reset_at = self._parse_int(headers.get("X-RateLimit-Reset"))
+            if reset_at is None:
+                return None
+            wait = reset_at - time.time()
+            if wait > self.max_reset_wait:
+                return None
+            return max(wait, 0) + random.uniform(0, 1)
+        
+        if response.status_code == 403 and not self._is_secondary_limit(response):
+            # Plain permission error
+            return None
+        
+        # Secondary rate limit without guidance: full-jitter exponential backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    def _is_secondary_limit(self, response: httpx.Response) -> bool:
+        try:
+            message = str(response.json().get("message", ""))
+        except Exception:
+            return False
+        return "secondary rate limit" in message.lower() or "abuse" in message.lower()
+    
+    async def _acquire(self, priority: RequestPriority):
+        """
+        Wait for an in-flight slot; lower priority values are admitted first
+        """
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just before cancellation: pass it on
+                self._release()
+            raise
+    
+    def _release(self):
+        """
+        Hand the slot to the highest-priority waiter, or free it
+        """
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+    
+    def _parse_int(self, value) -> Optional[int]:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
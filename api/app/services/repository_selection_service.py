@@ -0,0 +1,91 @@
+"""
+Repository Selection Service - Listing-Metadata Pre-Filter for Per-Repository Fetches
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Decides from repository listing metadata alone (size, archived, created_at, pushed_at)
+which per-repository calls a repository needs, before any of them is made
+
+Related Classes:
+- AnalysisService: Selects repositories while streaming the user's listing (REST, stats and git strategies)
+- BatchAnalysisService: Selects the repositories of a planned crawl
+- GitHubService: Listing projection that carries the metadata
+- MetricsService: REPOSITORY_SELECTION counts outcomes
+
+Outcomes:
+- analyze: languages and commits fetched as before
+- languages: not pushed since the history window (ANALYSIS_HISTORY_MONTHS) began, so no commit can fall
+  inside it; only languages are fetched
+- empty: size 0 and never pushed after creation; counted as a repository, nothing fetched
+  (GitHub answers its commit listing with 409 anyway)
+- archived, stale: dropped (opt-in: ANALYSIS_SKIP_ARCHIVED, ANALYSIS_STALE_MONTHS)
+- sampled: dropped past ANALYSIS_MAX_REPOSITORIES (opt-in; listings are most recently updated first)
+Exactness: analyze, languages and empty leave results unchanged; the dropping outcomes change them by design
+"""
+
+from app.models.commit_timeline import parse_commit_timestamp, to_timestamp
+from app.services.metrics_service import REPOSITORY_SELECTION
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Outcomes whose repositories are left out of the analysis entirely
+DROPPED_OUTCOMES = ("archived", "stale", "sampled")
+
+# Slack between pushed_at and the history cutoff: since= is rounded down to the UTC day and the
+# stats strategy keeps every week overlapping the window
+HISTORY_MARGIN = timedelta(days=8)
+
+class RepositorySelectionService:
+    def __init__(self):
+        self.skip_empty = os.getenv("ANALYSIS_SKIP_EMPTY", "true").lower() == "true"
+        self.skip_archived = os.getenv("ANALYSIS_SKIP_ARCHIVED", "false").lower() == "true"
+        # Repositories not pushed within this many months are dropped (0 = keep all)
+        self.stale_months = max(0, int(os.getenv("ANALYSIS_STALE_MONTHS", "0")))
+        # Repositories analyzed per user, in listing order (0 = unlimited)
+        self.max_repositories = max(0, int(os.getenv("ANALYSIS_MAX_REPOSITORIES", "0")))
+    
+    def select(self, repo: Dict, history_cutoff: Optional[datetime] = None) -> str:
+        """
+        Outcome for one listed repository (see the module docstring)
+        history_cutoff: oldest commit date the analysis counts (None = full history)
+        """
+        pushed_at = parse_commit_timestamp(repo.get('pushed_at'))
+        
+        if self.skip_archived and repo.get('archived'):
+            return self._count("archived")
+        if self.stale_months > 0 and pushed_at is not None and \
+                pushed_at < to_timestamp(datetime.now(timezone.utc) - timedelta(days=self.stale_months * 30)):
+            return self._count("stale")
+        if self.skip_empty and self._is_empty(repo, pushed_at):
+            return self._count("empty")
+        if history_cutoff is not None and pushed_at is not None and \
+                pushed_at < to_timestamp(history_cutoff - HISTORY_MARGIN):
+            return self._count("languages")
+        return self._count("analyze")
+    
+    def limit_reached(self, selected: int) -> bool:
+        """
+        Whether a user with this many selected repositories is at ANALYSIS_MAX_REPOSITORIES
+        """
+        return self.max_repositories > 0 and selected >= self.max_repositories
+    
+    def sampled(self, count: int):
+        """
+        Count repositories left out past ANALYSIS_MAX_REPOSITORIES
+        """
+        if count > 0:
+            REPOSITORY_SELECTION.labels("sampled").inc(count)
+    
+    def _is_empty(self, repo: Dict, pushed_at: Optional[int]) -> bool:
+        # size lags behind new pushes, so a repository pushed after creation is never treated as empty
+        if repo.get('size') != 0:
+            return False
+        created_at = parse_commit_timestamp(repo.get('created_at'))
+        return pushed_at is None or (created_at is not None and pushed_at <= created_at)
+    
+    def _count(self, outcome: str) -> str:
+        REPOSITORY_SELECTION.labels(outcome).inc()
+        return outcome
@@ -0,0 +1,275 @@
+"""
+Scoring Service - Raw Aggregate Store, Scoring Profiles and Offline Re-scoring
+
+Design Reference: CLAUDE.md - Key Components, Custom "intensity" scores
+Purpose: Re-scores stored profiles under a different scoring model without calling GitHub
+
+Related Classes:
+- AnalysisService: Persists each analysis' per-language raw aggregates here
+- IntencyService: Scores aggregates (vectorized batch path) under a ScoringProfile
+- CacheService: Provides the pooled Redis client
+- Models: ScoringProfile, RescoreRequest, AnalysisResult, LanguageIntensity
+
+Storage: Redis hashes scoring:aggregates (analysis identity → aggregates) and
+scoring:profiles ("name@version" → profile), in process memory without Redis
+Profiles: Versions are immutable; the name "default" is reserved for the built-in default@1, which
+live analyses score under (stored versions of it would silently change /rescore's default)
+Entry Points: POST /rescore, api/rescore.py (single user or whole population; the population
+re-scores each user's most recent analysis once)
+Incremental: IncrementalRanking accumulates repositories one at a time and re-scores only
+the languages each repository touched (live partial results and the final result); it also
+sums monthly commit counts for the activity rollups
+"""
+
+from app.models.analysis import AnalysisResult, LanguageIntensity
+from app.models.scoring import ScoringProfile
+from app.services.cache_service import CacheService
+from app.services.intency_service import IntencyService, DEFAULT_SCORING_PROFILE
+from redis.exceptions import RedisError
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IncrementalRanking:
+    def __init__(self, intency_service: IntencyService):
+        self.intency_service = intency_service
+        self.language_stats: Dict[str, Dict] = {}
+        self.total_commits = 0
+        self.repository_count = 0
+        # Monthly commit counts (month index → commits), overall and per language
+        self.total_months: Dict[int, int] = {}
+        self.language_months: Dict[str, Dict[int, int]] = {}
+        self._intensities: Dict[str, LanguageIntensity] = {}
+        self._dirty: Set[str] = set()
+    
+    def add(self, data: Dict):
+        """
+        Accumulate one repository's activity (languages, commit_count, recent_activity,
+        activity windows, monthly counts) into the totals of every language it uses; with
+        language_commits, languages get only the commits attributed to them
+        """
+        commit_count = data['commit_count']
+        monthly = data.get('monthly') or {}
+        # Per-language attribution (git mirrors): language → the same counts as the repository's
+        language_commits = data.get('language_commits')
+        
+        # Process languages with time-weighted commits
+        for language, bytes_count in data['languages'].items():
+            stats = self.language_stats.setdefault(language, {
+                'total_bytes': 0,
+                'repository_count': 0,
+                'commit_count': 0,
+                'recent_activity': 0,
+                'activity': {}
+            })
+            stats['total_bytes'] += bytes_count
+            stats['repository_count'] += 1
+            # Without attribution every language uses all of the repository's commits
+            counts = data if language_commits is None else language_commits.get(language) or {}
+            stats['commit_count'] += counts.get('commit_count', 0)
+            stats['recent_activity'] += counts.get('recent_activity', 0)
+            for window, count in (counts.get('activity') or {}).items():
+                stats['activity'][window] = stats['activity'].get(window, 0) + count
+            language_months = self.language_months.setdefault(language, {})
+            for month, count in (counts.get('monthly') or {}).items():
+                language_months[month] = language_months.get(month, 0) + count
+            self._dirty.add(language)
+        
+        for month, count in monthly.items():
+            self.total_months[month] = self.total_months.get(month, 0) + count
+        
+        self.total_commits += commit_count
+        self.repository_count += 1
+    
+    def ranking(self) -> List[LanguageIntensity]:
+        """
+        Languages by intensity (highest first), scoring only languages changed since the last call
+        """
+        for language in [language for language in self.language_stats if language in self._dirty]:
+            stats = self.language_stats[language]
+            self._intensities[language] = LanguageIntensity(
+                language=language,
+                intensity=self.intency_service.calculate_language_intensity(
+                    language=language,
+                    total_bytes=stats['total_bytes'],
+                    commit_count=stats['commit_count'],
+                    repository_count=stats['repository_count'],
+                    recent_activity=stats.get('recent_activity', 0)
+                ),
+                commit_count=stats['commit_count'],
+                line_count=stats['total_bytes'] // 50,  # Rough estimation: 50 bytes per line
+                repository_count=stats['repository_count'],
+                activity=dict(stats['activity']) or None
+            )
+        self._dirty.clear()
+        
+        # Sort by intensity (highest first)
+        return sorted(self._intensities.values(), key=lambda x: x.intensity, reverse=True)
+
+class ScoringService:
+    def __init__(self, cache_service: CacheService):
+        self.redis_client = cache_service.redis_client
+        self.aggregates_key = "scoring:aggregates"
+        self.profiles_key = "scoring:profiles"
+        
+        # Single-process fallback when Redis is not configured
+        self.aggregates: Dict[str, Dict] = {}
+        self.profiles: Dict[str, ScoringProfile] = {}
+    
+    async def save_aggregates(self, identity: str, aggregates: Dict):
+        """
+        Persist the raw per-language aggregates of an analysis
+        """
+        if self.redis_client is None:
+            self.aggregates[identity] = aggregates
+            return
+        try:
+            await self.redis_client.hset(
+                self.aggregates_key, identity, json.dumps(aggregates, separators=(",", ":"))
+            )
+        except RedisError as e:
+            # The analysis result is still valid; it just cannot be re-scored later
+            logger.warning(f"Failed to store aggregates for {identity}: {e}")
+    
+    async def get_aggregates(self, identity: str) -> Optional[Dict]:
+        """
+        Get the stored raw aggregates of an analysis identity
+        """
+        if self.redis_client is None:
+            return self.aggregates.get(identity)
+        payload = await self.redis_client.hget(self.aggregates_key, identity)
+        return json.loads(payload) if payload is not None else None
+    
+    async def iter_aggregates(self, batch_size: int = 500) -> AsyncIterator[List[Dict]]:
+        """
+        Stream the latest stored aggregate record of each user in batches
+        A user can have several records (identities also carry visibility, token scope and
+        author emails); the one with the most recent analysis_date wins
+        """
+        latest: Dict[str, Tuple[str, str]] = {}
+        if self.redis_client is None:
+            for identity, record in self.aggregates.items():
+                self._keep_latest(latest, identity, record)
+            records = [self.aggregates[identity] for _, identity in latest.values()]
+            for start in range(0, len(records), batch_size):
+                yield records[start:start + batch_size]
+            return
+        
+        # First pass keeps only the winning identity per user, second pass loads their records
+        cursor = 0
+        while True:
+            cursor, entries = await self.redis_client.hscan(self.aggregates_key, cursor, count=batch_size)
+            for identity, payload in entries.items():
+                identity = identity.decode() if isinstance(identity, bytes) else identity
+                self._keep_latest(latest, identity, json.loads(payload))
+            if cursor == 0:
+                break
+        
+        identities = [identity for _, identity in latest.values()]
+        for start in range(0, len(identities), batch_size):
+            payloads = await self.redis_client.hmget(self.aggregates_key, identities[start:start + batch_size])
+            records = [json.loads(payload) for payload in payloads if payload is not None]
+            if records:
+                yield records
+    
+    def _keep_latest(self, latest: Dict[str, Tuple[str, str]], identity: str, record: Dict):
+        # Identities start with the lowercased username
+        username = identity.split(":", 1)[0]
+        candidate = (record.get("analysis_date") or "", identity)
+        if username not in latest or candidate > latest[username]:
+            latest[username] = candidate
+    
+    async def save_profile(self, profile: ScoringProfile) -> ScoringProfile:
+        """
+        Register a new profile version (existing versions are never overwritten)
+        """
+        if profile.name == DEFAULT_SCORING_PROFILE.name:
+            raise ValueError(f"Scoring profile name {profile.name} is reserved for the built-in {DEFAULT_SCORING_PROFILE.label}")
+        
+        if self.redis_client is None:
+            if profile.label in self.profiles:
+                raise ValueError(f"Scoring profile {profile.label} already exists")
+            self.profiles[profile.label] = profile
+            return profile
+        
+        created = await self.redis_client.hsetnx(self.profiles_key, profile.label, profile.model_dump_json())
+        if not created:
+            raise ValueError(f"Scoring profile {profile.label} already exists")
+        return profile
+    
+    async def list_profiles(self) -> List[ScoringProfile]:
+        """
+        All profiles, built-in default first, then by name and version
+        """
+        if self.redis_client is None:
+            stored = list(self.profiles.values())
+        else:
+            payloads = await self.redis_client.hgetall(self.profiles_key)
+            stored = [ScoringProfile.model_validate_json(payload) for payload in payloads.values()]
+        # Versions of the reserved name stored before it was reserved are ignored
+        stored = [profile for profile in stored if profile.name != DEFAULT_SCORING_PROFILE.name]
+        
+        stored.sort(key=lambda profile: (profile.name, profile.version))
+        return [DEFAULT_SCORING_PROFILE] + stored
+    
+    async def get_profile(self, name: str = "default", version: Optional[int] = None) -> ScoringProfile:
+        """
+        Get a profile by name and version (None = latest version)
+        """
+        candidates = [
+            profile for profile in await self.list_profiles()
+            if profile.name == name and (version is None or profile.version == version)
+        ]
+        if not candidates:
+            label = name if version is None else f"{name}@{version}"
+            raise ValueError(f"Scoring profile {label} not found")
+        return max(candidates, key=lambda profile: profile.version)
+    
+    def rescore(self, records: List[Dict], profile: ScoringProfile) -> List[AnalysisResult]:
+        """
+        Score many aggregate records under one profile in a single vectorized pass
+        """
+        languages, total_bytes, commit_counts, repository_counts, recent_activity = [], [], [], [], []
+        for record in records:
+            for language, stats in record["languages"].items():
+                languages.append(language)
+                total_bytes.append(stats["total_bytes"])
+                commit_counts.append(stats["commit_count"])
+                repository_counts.append(stats["repository_count"])
+                recent_activity.append(stats.get("recent_activity") or 0)
+        
+        intensities = IntencyService(profile).calculate_language_intensities(
+            languages, total_bytes, commit_counts, repository_counts, recent_activity
+        ).tolist()
+        
+        results = []
+        row = 0
+        for record in records:
+            language_intensities = []
+            for language, stats in record["languages"].items():
+                language_intensities.append(LanguageIntensity(
+                    language=language,
+                    intensity=intensities[row],
+                    commit_count=stats["commit_count"],
+                    line_count=stats["total_bytes"] // 50,  # Rough estimation: 50 bytes per line
+                    repository_count=stats["repository_count"],
+                    activity=stats.get("activity") or None
+                ))
+                row += 1
+            
+            # Sort by intensity (highest first)
+            language_intensities.sort(key=lambda x: x.intensity, reverse=True)
+            
+            results.append(AnalysisResult(
+                username=record["username"],
+                analysis_date=record["analysis_date"],
+                languages=language_intensities,
+                total_repositories=record["total_repositories"],
+                total_commits=record["total_commits"],
+                analysis_period_months=record["analysis_period_months"],
+                scoring_profile=profile.label
+            ))
+        
+        return results
@@ -0,0 +1,120 @@
+"""
+Snapshot Service - Per-Repository Analysis Snapshots for Incremental Re-analysis
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Lets a re-analysis skip repositories that have not been pushed to since the last run
+
+Related Classes:
+- AnalysisService: Reuses current snapshots and refreshes the ones whose watermark moved
+- CacheService: Redis storage for snapshots (repository-specific, token-scoped keys)
+- GitHubService: Supplies pushed_at/updated_at watermarks and the token scope
+
+Watermark: pushed_at (falling back to updated_at) of the repository listing
+Contents: Language bytes, sorted commit epoch timestamps and commit count; time-dependent
+aggregates (e.g. recent activity) are derived from the timestamps at analysis time
+Authors: Snapshots record the author aliases their commits were filtered by (None = all commits)
+and are only reused for the same aliases
+Strategy: Snapshots record the fetch strategy that produced them and are only reused by it
+(the stats strategy stores week-bucketed timestamps, the REST strategy exact commit times)
+Expiry: ANALYSIS_SNAPSHOT_TTL (default 30 days) since the last refresh
+"""
+
+from app.models.commit_timeline import CommitTimeline
+from app.services.cache_service import CacheService
+from datetime import datetime
+from typing import Dict, List, Optional
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SnapshotService:
+    def __init__(self, cache_service: CacheService):
+        self.cache_service = cache_service
+        self.snapshot_ttl = int(os.getenv("ANALYSIS_SNAPSHOT_TTL", str(30 * 86400)))
+    
+    @property
+    def enabled(self) -> bool:
+        return self.cache_service.enabled and self.snapshot_ttl > 0
+    
+    async def get(self, owner: str, repo: str, scope: str) -> Optional[Dict]:
+        """
+        Get the stored snapshot of a repository
+        """
+        if not self.enabled:
+            return None
+        return await self.cache_service.get(self._snapshot_key(owner, repo, scope))
+    
+    async def save(
+        self,
+        owner: str,
+        repo: Dict,
+        scope: str,
+        languages: Dict[str, int],
+        timeline: CommitTimeline,
+        history_months: int,
+        authors: Optional[List[str]] = None,
+        strategy: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Store a snapshot of a freshly fetched repository under its current watermark
+        """
+        watermark = self.watermark(repo)
+        if not self.enabled or watermark is None:
+            return None
+        
+        snapshot = {
+            "watermark": watermark,
+            "history_months": history_months,
+            "authors": authors,
+            "strategy": strategy,
+            "languages": languages,
+            "commit_times": timeline.to_list(),
+            "commit_count": len(timeline),
+            "refreshed_at": datetime.now().isoformat()
+        }
+        await self.cache_service.set(
+            self._snapshot_key(owner, repo["name"], scope),
+            snapshot,
+            self.snapshot_ttl
+        )
+        return snapshot
+    
+    def is_current(
+        self,
+        snapshot: Optional[Dict],
+        repo: Dict,
+        history_months: int,
+        authors: Optional[List[str]] = None,
+        strategy: Optional[str] = None
+    ) -> bool:
+        """
+        Whether a snapshot still describes the repository: same watermark and
+        collected with the same commit history window, author filter and fetch strategy
+        """
+        if snapshot is None or "commit_times" not in snapshot:
+            # Missing, or written in the older ISO-date format
+            return False
+        watermark = self.watermark(repo)
+        return (
+            watermark is not None
+            and snapshot.get("watermark") == watermark
+            and snapshot.get("history_months") == history_months
+            and snapshot.get("authors") == authors
+            and snapshot.get("strategy") == strategy
+        )
+    
+    def timeline(self, snapshot: Dict) -> CommitTimeline:
+        """
+        Commit timeline stored in a snapshot
+        """
+        return CommitTimeline(snapshot["commit_times"])
+    
+    def watermark(self, repo: Dict) -> Optional[str]:
+        """
+        Last-change marker of a repository listing entry
+        """
+        return repo.get("pushed_at") or repo.get("updated_at")
+    
+    def _snapshot_key(self, owner: str, repo: str, scope: str) -> str:
+        return self.cache_service.generate_repo_resource_key(owner, repo, "snapshot", scope)
@@ -0,0 +1,109 @@
+"""
+Worker Service - Out-of-Process Analysis Worker
+
+Design Reference: CLAUDE.md - Backend Architecture, Key Components
+Purpose: Runs queued analyses and batch analyses away from the request-serving event loop
+
+Related Classes:
+- AnalysisQueueService: Durable queue the worker claims from and acknowledges to
+- AnalysisService: Performs the analysis and records job state in the shared job store
+- BatchAnalysisService: Performs queued batch analyses (messages of kind "batch")
+
+Concurrency: At most ANALYSIS_WORKER_CONCURRENCY analyses per worker process
+Reliability: Messages are acknowledged only after the job reaches a final state; a heartbeat
+keeps long analyses from being reclaimed, and a crashed worker's messages are retried elsewhere
+Entry Point: api/worker.py
+"""
+
+from app.services.analysis_service import AnalysisService
+from app.services.batch_analysis_service import BatchAnalysisService
+from app.services.queue_service import AnalysisQueueService, QueuedAnalysis
+from typing import Dict, Optional
+import os
+import socket
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AnalysisWorker:
+    def __init__(
+        self,
+        analysis_service: AnalysisService,
+        queue_service: AnalysisQueueService,
+        consumer_name: Optional[str] = None,
+        batch_analysis_service: Optional[BatchAnalysisService] = None
+    ):
+        self.analysis_service = analysis_service
+        self.queue_service = queue_service
+        self.batch_analysis_service = batch_analysis_service or BatchAnalysisService(analysis_service)
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = max(1, int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", "4")))
+        self.claim_block_ms = int(os.getenv("ANALYSIS_WORKER_BLOCK_MS", "5000"))
+        # Heartbeat well inside the visibility timeout
+        self.heartbeat_interval = max(self.queue_service.visibility_timeout_ms / 3000, 1.0)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stopping = False
+    
+    async def run(self):
+        """
+        Claim and process analyses until stop() is called, then drain in-flight work
+        """
+        logger.info(f"Analysis worker {self.consumer_name} started (concurrency={self.concurrency})")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping:
+                free_slots = self.concurrency - len(self._tasks)
+                if free_slots <= 0:
+                    await asyncio.wait(list(self._tasks.values()), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                
+                try:
+                    claimed = await self.queue_service.claim(self.consumer_name, free_slots, self.claim_block_ms)
+                except Exception as e:
+                    logger.error(f"Failed to claim analyses: {e}")
+                    await asyncio.sleep(1)
+                    continue
+                
+                for queued in claimed:
+                    self._tasks[queued.message_id] = asyncio.create_task(self._process(queued))
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            heartbeat.cancel()
+            logger.info(f"Analysis worker {self.consumer_name} stopped")
+    
+    def stop(self):
+        """
+        Stop claiming new analyses (in-flight ones are allowed to finish)
+        """
+        self._stopping = True
+    
+    async def _process(self, queued: QueuedAnalysis):
+        """
+        Run one queued analysis and acknowledge it once the job has a final state
+        """
+        try:
+            if self.queue_service.is_exhausted(queued):
+                logger.error(f"Giving up on analysis job {queued.job_id} after {queued.attempts - 1} attempts")
+                await self.analysis_service.fail_job(
+                    queued.job_id, "Analysis abandoned after repeated worker failures"
+                )
+            elif queued.kind == "batch":
+                await self.batch_analysis_service._perform_batch_analysis(queued.job_id, queued.request)
+            else:
+                await self.analysis_service._perform_analysis(queued.job_id, queued.request, queued.priority)
+            await self.queue_service.ack(queued.message_id)
+        except Exception as e:
+            # Left unacknowledged: another worker retries it after the visibility timeout
+            logger.error(f"Failed to process analysis job {queued.job_id}: {e}")
+        finally:
+            self._tasks.pop(queued.message_id, None)
+    
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.queue_service.extend(self.consumer_name, list(self._tasks.keys()))
+            except Exception as e:
+                logger.warning(f"Worker heartbeat failed: {e}")
@@ -0,0 +1,526 @@
+"""
+Fake GitHub - Offline GitHub API Stand-in for Benchmarks and End-to-End Runs
+
+Design Reference: CLAUDE.md - External Dependencies
+Purpose: Serves the GitHub endpoints the analysis pipeline uses without network access or quota
+
+Related Classes:
+- GitHubService: Pointed here via GITHUB_API_BASE_URL / GITHUB_GRAPHQL_URL
+- RateLimitService: Exercised through realistic X-RateLimit-* headers and 403 responses
+- bench.run_benchmark: Starts this server and drives POST /analyze through it
+
+Modes:
+- synthetic (default): deterministic users generated from the username; a "-r{repos}-c{commits}-l{languages}"
+  suffix sets the repository count, mean commits per repository and languages per repository
+- replay: answers from a recorded cassette (JSON lines), 404 for unrecorded requests
+- record: replays what is recorded and proxies the rest to --upstream, appending to the cassette
+Endpoints: /users/{user}/repos, /repos/{owner}/{repo}/languages, /repos/{owner}/{repo}/commits,
+/repos/{owner}/{repo}/stats/contributors (202 until computed), /user, /graphql, plus /_bench/stats and /_bench/reset for request accounting
+Realism: Link pagination, ETag/If-None-Match (304s are free, as on GitHub), per-token rate limits,
+injected latency (--latency-ms, --jitter-ms)
+
+Usage: python -m bench.fake_github --port 8765 --latency-ms 20
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import re
+import json
+import time
+import zlib
+import random
+import asyncio
+import hashlib
+import argparse
+import httpx
+
+LANGUAGE_POOL = [
+    "Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "C",
+    "Ruby", "PHP", "HTML", "CSS", "Shell", "Kotlin", "Swift"
+]
+
+# Upstream responses keep only the headers the client looks at
+RECORDED_HEADERS = ("link", "etag", "last-modified", "content-type")
+
+_SIZE_SUFFIX = re.compile(r"-r(\d+)-c(\d+)-l(\d+)$")
+
+@dataclass
+class FakeGitHubConfig:
+    repositories: int = 30
+    commits: int = 100
+    languages: int = 3
+    fork_ratio: float = 0.1
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_limit: int = 1_000_000
+    rate_limit_window: int = 3600
+    cassette: Optional[str] = None
+    upstream: Optional[str] = None
+    seed: int = 0
+    stats_pending: int = 1  # 202 "computing" replies per repository before its statistics are served
+
+@dataclass
+class SyntheticRepository:
+    name: str
+    languages: Dict[str, int]
+    commit_count: int
+    created_at: datetime
+    pushed_at: datetime
+    fork: bool
+    
+    def commit_date(self, index: int) -> datetime:
+        """
+        Date of the index-th newest commit (evenly spread from creation to last push)
+        """
+        span = (self.pushed_at - self.created_at) / max(self.commit_count, 1)
+        return self.pushed_at - span * index
+    
+    def commits_since(self, since: datetime) -> int:
+        """
+        Number of commits dated at or after since
+        """
+        if since > self.pushed_at:
+            return 0
+        span = (self.pushed_at - self.created_at) / max(self.commit_count, 1)
+        if span.total_seconds() <= 0:
+            return self.commit_count
+        return min(self.commit_count, int((self.pushed_at - since) / span) + 1)
+
+@dataclass
+class RateLimitBucket:
+    remaining: int
+    reset_at: int
+
+@dataclass
+class FakeGitHubState:
+    config: FakeGitHubConfig
+    now: datetime = field(default_factory=lambda: datetime.now(timezone.utc).replace(microsecond=0))
+    requests: Counter = field(default_factory=Counter)
+    statuses: Counter = field(default_factory=Counter)
+    buckets: Dict[Tuple[str, str], RateLimitBucket] = field(default_factory=dict)
+    cassette: Dict[str, Dict] = field(default_factory=dict)
+    stats_requests: Counter = field(default_factory=Counter)
+    
+    def __post_init__(self):
+        self.user_repositories = lru_cache(maxsize=4096)(self._generate_repositories)
+        if self.config.cassette:
+            self.cassette = load_cassette(self.config.cassette)
+    
+    def _generate_repositories(self, username: str) -> List[SyntheticRepository]:
+        """
+        Deterministic synthetic repositories for a username
+        """
+        repositories, commits, languages = self.config.repositories, self.config.commits, self.config.languages
+        match = _SIZE_SUFFIX.search(username)
+        if match:
+            repositories, commits, languages = (int(value) for value in match.groups())
+        
+        rng = random.Random(zlib.crc32(username.lower().encode()) ^ self.config.seed)
+        generated = []
+        for index in range(repositories):
+            created_at = self.now - timedelta(days=rng.uniform(30, 1500))
+            pushed_at = created_at + (self.now - created_at) * rng.random()
+            chosen = rng.sample(LANGUAGE_POOL, rng.randint(1, max(1, min(languages, len(LANGUAGE_POOL)))))
+            generated.append(SyntheticRepository(
+                name=f"repo-{index:04d}",
+                languages={language: int(rng.lognormvariate(9, 1.5)) + 1 for language in chosen},
+                commit_count=rng.randint(1, max(1, 2 * commits - 1)),
+                created_at=created_at,
+                pushed_at=pushed_at.replace(microsecond=0),
+                fork=rng.random() < self.config.fork_ratio
+            ))
+        # GitHub lists most recently pushed first
+        generated.sort(key=lambda repo: repo.pushed_at, reverse=True)
+        return generated
+    
+    def find_repository(self, owner: str, name: str) -> Optional[SyntheticRepository]:
+        for repo in self.user_repositories(owner):
+            if repo.name == name:
+                return repo
+        return None
+
+def load_cassette(path: str) -> Dict[str, Dict]:
+    """
+    Read recorded interactions (one JSON object per line), keyed by request
+    """
+    entries = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[cassette_key(entry["method"], entry["path"], entry.get("query", ""), entry.get("body"))] = entry
+    except FileNotFoundError:
+        pass
+    return entries
+
+def cassette_key(method: str, path: str, query: str, body: Optional[str] = None) -> str:
+    params = "&".join(sorted(query.split("&"))) if query else ""
+    digest = hashlib.sha1(body.encode()).hexdigest()[:12] if body else ""
+    return f"{method.upper()} {path}?{params} {digest}".strip()
+
+def iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def create_app(config: Optional[FakeGitHubConfig] = None):
+    """
+    ASGI app of the fake GitHub (its FakeGitHubState is exposed as .state)
+    """
+    state = FakeGitHubState(config or FakeGitHubConfig())
+    app = FastAPI(title="Fake GitHub API")
+    router_app = app.router
+    upstream_client = httpx.AsyncClient(base_url=state.config.upstream) if state.config.upstream else None
+    
+    def paginate(request: Request, items: List, per_page: int, page: int) -> Tuple[List, Dict[str, str]]:
+        """
+        Slice one page and build GitHub-style Link headers pointing back at this server
+        """
+        start = (page - 1) * per_page
+        headers = {}
+        links = []
+        last_page = max(1, -(-len(items) // per_page))
+        for rel, target in (("next", page + 1), ("last", last_page)):
+            if page < last_page:
+                query = dict(request.query_params)
+                query["page"] = str(target)
+                links.append(f'<{str(request.url.replace(query=urlencode(query)))}>; rel="{rel}"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        return items[start:start + per_page], headers
+    
+    def json_response(request: Request, body, headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        JSON response with an ETag; matching If-None-Match gets a 304
+        """
+        payload = json.dumps(body, separators=(",", ":"))
+        etag = f'W/"{hashlib.sha1(payload.encode()).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
+        return Response(
+            payload,
+            media_type="application/json",
+            headers={"ETag": etag, **(headers or {})}
+        )
+    
+    async def github_behaviour(scope, receive, send):
+        """
+        Plain ASGI middleware (cheaper than BaseHTTPMiddleware): latency, accounting,
+        rate limiting and X-RateLimit-* headers around every GitHub endpoint
+        """
+        if scope["type"] != "http" or scope["path"].startswith("/_bench"):
+            return await router_app(scope, receive, send)
+        
+        config = state.config
+        if config.latency_ms or config.jitter_ms:
+            delay = random.gauss(config.latency_ms, config.jitter_ms) if config.jitter_ms else config.latency_ms
+            await asyncio.sleep(max(delay, 0) / 1000)
+        
+        request = Request(scope, receive)
+        resource = "graphql" if scope["path"] == "/graphql" else "core"
+        identity = request.headers.get("authorization") or (request.client.host if request.client else "anonymous")
+        now = int(time.time())
+        bucket = state.buckets.get((identity, resource))
+        if bucket is None or bucket.reset_at <= now:
+            bucket = RateLimitBucket(remaining=config.rate_limit, reset_at=now + config.rate_limit_window)
+            state.buckets[(identity, resource)] = bucket
+        
+        state.requests[f"{scope['method']} {endpoint_name(scope['path'])}"] += 1
+        exhausted = bucket.remaining <= 0
+        
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # 304s do not count against the limit, as on GitHub
+                if status != 304 and bucket.remaining > 0:
+                    bucket.remaining -= 1
+                state.statuses[status] += 1
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-ratelimit-limit", str(config.rate_limit).encode()),
+                    (b"x-ratelimit-remaining", str(bucket.remaining).encode()),
+                    (b"x-ratelimit-reset", str(bucket.reset_at).encode()),
+                    (b"x-ratelimit-resource", resource.encode())
+                ]
+            await send(message)
+        
+        if exhausted:
+            response = JSONResponse({"message": "API rate limit exceeded"}, status_code=403)
+            await response(scope, receive, send_with_headers)
+        elif config.cassette:
+            response = await replay(request)
+            await response(scope, receive, send_with_headers)
+        else:
+            await router_app(scope, receive, send_with_headers)
+    
+    async def replay(request: Request) -> Response:
+        """
+        Answer from the cassette, recording from upstream on a miss when configured
+        """
+        body = (await request.body()).decode() or None
+        key = cassette_key(request.method, request.url.path, request.url.query, body)
+        entry = state.cassette.get(key)
+        
+        if entry is None and upstream_client is not None:
+            upstream = await upstream_client.request(
+                request.method,
+                request.url.path,
+                params=request.url.query or None,
+                content=body,
+                headers={
+                    name: value for name, value in request.headers.items()
+                    if name in ("authorization", "accept", "content-type")
+                }
+            )
+            entry = {
+                "method": request.method,
+                "path": request.url.path,
+                "query": request.url.query,
+                "body": body,
+                "status": upstream.status_code,
+                "headers": {name: value for name, value in upstream.headers.items() if name in RECORDED_HEADERS},
+                "response": upstream.json() if upstream.content else None
+            }
+            state.cassette[key] = entry
+            with open(state.config.cassette, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        
+        if entry is None:
+            return JSONResponse({"message": "Not recorded"}, status_code=404)
+        
+        headers = dict(entry.get("headers", {}))
+        if "link" in headers and state.config.upstream:
+            headers["link"] = headers["link"].replace(state.config.upstream.rstrip("/"), str(request.base_url).rstrip("/"))
+        elif "link" in headers:
+            headers["link"] = re.sub(r"https://api\.github\.com", str(request.base_url).rstrip("/"), headers["link"])
+        return Response(
+            json.dumps(entry["response"]) if entry.get("response") is not None else b"",
+            status_code=entry["status"],
+            media_type="application/json",
+            headers=headers
+        )
+    
+    @app.get("/users/{username}/repos")
+    async def list_repositories(request: Request, username: str, per_page: int = 30, page: int = 1):
+        owner = username.lower()
+        repos = [
+            {
+                "name": repo.name,
+                "full_name": f"{owner}/{repo.name}",
+                "description": f"Synthetic repository {repo.name}",
+                "language": max(repo.languages, key=repo.languages.get),
+                "size": sum(repo.languages.values()) // 1024,
+                "stargazers_count": len(repo.name) % 7,
+                "forks_count": 0,
+                "fork": repo.fork,
+                "archived": False,
+                "updated_at": iso(repo.pushed_at),
+                "pushed_at": iso(repo.pushed_at),
+                "created_at": iso(repo.created_at),
+                "clone_url": f"https://github.com/{owner}/{repo.name}.git",
+                "languages_url": f"{str(request.base_url).rstrip('/')}/repos/{owner}/{repo.name}/languages"
+            }
+            for repo in state.user_repositories(owner)
+        ]
+        items, headers = paginate(request, repos, min(per_page, 100), page)
+        return json_response(request, items, headers)
+    
+    @app.get("/repos/{owner}/{name}/languages")
+    async def repository_languages(request: Request, owner: str, name: str):
+        repo = state.find_repository(owner.lower(), name)
+        if repo is None:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+        return json_response(request, repo.languages)
+    
+    @app.get("/repos/{owner}/{name}/commits")
+    async def repository_commits(
+        request: Request,
+        owner: str,
+        name: str,
+        per_page: int = 30,
+        page: int = 1,
+        since: Optional[str] = None,
+        author: Optional[str] = None
+    ):
+        repo = state.find_repository(owner.lower(), name)
+        if repo is None:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+        
+        total = repo.commits_since(parse_iso(since)) if since else repo.commit_count
+        # Every synthetic commit is authored by the owner (login or noreply email)
+        if author and author.lower() not in (owner.lower(), f"{owner.lower()}@users.noreply.github.com"):
+            total = 0
+        per_page = min(per_page, 100)
+        indexes = range(total)
+        page_indexes, headers = paginate(request, indexes, per_page, page)
+        
+        commits = []
+        for index in page_indexes:
+            date = iso(repo.commit_date(index))
+            sha = hashlib.sha1(f"{owner}/{name}/{index}".encode()).hexdigest()
+            person = {"name": owner, "email": f"{owner}@users.noreply.github.com", "date": date}
+            commits.append({
+                "sha": sha,
+                "commit": {"message": f"Commit {repo.commit_count - index}", "author": person, "committer": person},
+                "url": f"{str(request.base_url).rstrip('/')}/repos/{owner}/{name}/commits/{sha}",
+                "author": {"login": owner}
+            })
+        return json_response(request, commits, headers)
+    
+    @app.get("/repos/{owner}/{name}/stats/contributors")
+    async def contributor_stats(request: Request, owner: str, name: str):
+        repo = state.find_repository(owner.lower(), name)
+        if repo is None:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+        
+        key = f"{owner.lower()}/{name}"
+        state.stats_requests[key] += 1
+        if state.stats_requests[key] <= state.config.stats_pending:
+            return JSONResponse({}, status_code=202)
+        
+        # Weeks start on Sunday 00:00 UTC
+        weeks = Counter()
+        for index in range(repo.commit_count):
+            date = repo.commit_date(index)
+            day = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+            weeks[int((day - timedelta(days=(date.weekday() + 1) % 7)).timestamp())] += 1
+        return json_response(request, [{
+            "author": {"login": owner},
+            "total": repo.commit_count,
+            "weeks": [{"w": week, "a": 0, "d": 0, "c": commits} for week, commits in sorted(weeks.items())]
+        }])
+    
+    @app.get("/user")
+    async def authenticated_user(request: Request):
+        if not request.headers.get("authorization"):
+            return JSONResponse({"message": "Requires authentication"}, status_code=401)
+        return json_response(request, {"login": "bench-user"})
+    
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        variables = (await request.json()).get("variables", {})
+        owner = variables["login"].lower()
+        since = parse_iso(variables["since"])
+        page_size = variables.get("pageSize", 50)
+        offset = int(variables["cursor"]) if variables.get("cursor") else 0
+        
+        repos = [repo for repo in state.user_repositories(owner) if not repo.fork]
+        page = repos[offset:offset + page_size]
+        nodes = [
+            {
+                "name": repo.name,
+                "nameWithOwner": f"{owner}/{repo.name}",
+                "description": f"Synthetic repository {repo.name}",
+                "primaryLanguage": {"name": max(repo.languages, key=repo.languages.get)},
+                "diskUsage": sum(repo.languages.values()) // 1024,
+                "stargazerCount": len(repo.name) % 7,
+                "forkCount": 0,
+                "updatedAt": iso(repo.pushed_at),
+                "pushedAt": iso(repo.pushed_at),
+                "createdAt": iso(repo.created_at),
+                "url": f"https://github.com/{owner}/{repo.name}",
+                "languages": {
+                    "edges": [
+                        {"size": size, "node": {"name": language}}
+                        for language, size in sorted(repo.languages.items(), key=lambda item: -item[1])
+                    ][:variables.get("languageCount", 20)]
+                },
+                "defaultBranchRef": {
+                    "target": {
+                        "history": {"totalCount": repo.commit_count},
+                        "recent": {"totalCount": repo.commits_since(since)},
+                        # Activity windows: $since{N} variables answer as recent{N}
+                        **{
+                            f"recent{name[len('since'):]}": {"totalCount": repo.commits_since(parse_iso(value))}
+                            for name, value in variables.items()
+                            if name.startswith("since") and name[len("since"):].isdigit()
+                        }
+                    }
+                }
+            }
+            for repo in page
+        ]
+        has_next = offset + page_size < len(repos)
+        return JSONResponse({"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": str(offset + page_size) if has_next else None},
+            "nodes": nodes
+        }}}})
+    
+    @app.get("/_bench/stats")
+    async def stats():
+        return {
+            "requests": sum(state.requests.values()),
+            "by_endpoint": dict(state.requests),
+            "by_status": {str(status): count for status, count in state.statuses.items()}
+        }
+    
+    @app.post("/_bench/reset")
+    async def reset():
+        state.requests.clear()
+        state.statuses.clear()
+        state.buckets.clear()
+        state.stats_requests.clear()
+        return {"status": "reset"}
+    
+    github_behaviour.state = state
+    return github_behaviour
+
+def endpoint_name(path: str) -> str:
+    """
+    Collapse a request path to its endpoint template for request accounting
+    """
+    if path == "/graphql" or path == "/user":
+        return path
+    parts = path.strip("/").split("/")
+    if parts[0] == "users" and len(parts) == 3:
+        return "/users/{user}/" + parts[2]
+    if parts[0] == "repos" and len(parts) >= 4:
+        return "/repos/{owner}/{repo}/" + "/".join(parts[3:4])
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline GitHub API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repos", type=int, default=30, help="Repositories per synthetic user")
+    parser.add_argument("--commits", type=int, default=100, help="Mean commits per repository")
+    parser.add_argument("--languages", type=int, default=3, help="Maximum languages per repository")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=1_000_000, help="Requests per window per token")
+    parser.add_argument("--rate-limit-window", type=int, default=3600)
+    parser.add_argument("--cassette", help="Replay recorded responses from this JSON lines file")
+    parser.add_argument("--upstream", help="Record cache misses from this API (e.g. https://api.github.com)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stats-pending", type=int, default=1, help="202 replies per repository before statistics are ready")
+    args = parser.parse_args()
+    
+    import uvicorn
+    uvicorn.run(
+        create_app(FakeGitHubConfig(
+            repositories=args.repos,
+            commits=args.commits,
+            languages=args.languages,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_limit=args.rate_limit,
+            rate_limit_window=args.rate_limit_window,
+            cassette=args.cassette,
+            upstream=args.upstream,
+            seed=args.seed,
+            stats_pending=args.stats_pending
+        )),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+if __name__ == "__main__":
+    main()
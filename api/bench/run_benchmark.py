@@ -0,0 +1,234 @@
+"""
+End-to-End Analysis Benchmark
+
+Design Reference: CLAUDE.md - Backend Architecture
+Purpose: Measures the real pipeline (POST /analyze → completion) against the offline fake GitHub
+
+Related Classes:
+- bench.fake_github: Synthetic/recorded GitHub API (started as a subprocess unless --github-url is given)
+- main.app: The API under test, driven in-process through httpx's ASGI transport
+- AnalysisService: Runs the jobs (local execution, in-memory stores unless --redis-url is given)
+
+Metrics: jobs/sec, p50/p95/p99 job latency, GitHub calls per job, peak Python memory (tracemalloc)
+Regression Gate: --baseline compares against a previous --output file and exits 1 when a metric
+is worse by more than --tolerance
+
+Usage: python -m bench.run_benchmark --jobs 50 --concurrency 10 --repos 30 --commits 200 --latency-ms 20
+"""
+
+from typing import Dict, List, Optional
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tracemalloc
+import subprocess
+import httpx
+
+# Metrics where a higher value is a regression (the rest: lower is a regression)
+HIGHER_IS_WORSE = ("latency_p50_ms", "latency_p95_ms", "latency_p99_ms", "github_calls_per_job", "peak_memory_mb")
+LOWER_IS_WORSE = ("jobs_per_sec",)
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(-(-pct * len(ordered) // 100))))
+    return ordered[rank - 1]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def wait_until_ready(url: str, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/_bench/stats")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Fake GitHub did not start at {url}")
+
+def start_fake_github(args, port: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "bench.fake_github",
+        "--port", str(port),
+        "--repos", str(args.repos),
+        "--commits", str(args.commits),
+        "--languages", str(args.languages),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--rate-limit", str(args.rate_limit)
+    ]
+    if args.cassette:
+        command += ["--cassette", args.cassette]
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def configure_environment(args, github_url: str):
+    """
+    Point the API at the fake GitHub before the app (and its services) are created
+    """
+    os.environ["GITHUB_API_BASE_URL"] = github_url
+    os.environ["GITHUB_GRAPHQL_URL"] = f"{github_url}/graphql"
+    os.environ["GITHUB_HTTP2"] = "false"  # Plain-HTTP test server
+    os.environ["ANALYSIS_FETCH_STRATEGY"] = args.strategy
+    os.environ["ANALYSIS_STATS_RETRY_DELAY"] = str(args.stats_retry_delay)
+    os.environ["ANALYSIS_EXECUTION"] = "local"
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+    else:
+        os.environ.pop("REDIS_URL", None)
+
+async def run_job(client: httpx.AsyncClient, username: str, token: Optional[str]) -> Dict:
+    started = time.perf_counter()
+    response = await client.post("/api/v1/analyze", json={"github_username": username, "access_token": token})
+    response.raise_for_status()
+    job_id = response.json()["job_id"]
+    
+    # The event stream ends when the job finishes; its last event is the final state
+    events = await client.get(f"/api/v1/analyze/{job_id}/events")
+    final = [line for line in events.text.splitlines() if line.startswith("event: ")][-1]
+    return {
+        "latency": time.perf_counter() - started,
+        "status": final.split(": ", 1)[1]
+    }
+
+async def run_benchmark(args) -> Dict:
+    process = None
+    github_url = args.github_url
+    if github_url is None:
+        port = free_port()
+        github_url = f"http://127.0.0.1:{port}"
+        process = start_fake_github(args, port)
+    
+    try:
+        await wait_until_ready(github_url)
+        configure_environment(args, github_url)
+        
+        from main import app
+        from app.routers.analysis_router import get_analysis_service
+        analysis_service = get_analysis_service()
+        await analysis_service.github_service.start()
+        
+        async with httpx.AsyncClient() as github_client:
+            await github_client.post(f"{github_url}/_bench/reset")
+        
+        token = "bench-token" if args.strategy == "graphql" else None
+        semaphore = asyncio.Semaphore(args.concurrency)
+        
+        async def bounded(index: int) -> Dict:
+            async with semaphore:
+                # Distinct users so single-flight dedupe does not collapse the jobs
+                username = f"bench{args.run_id}u{index}-r{args.repos}-c{args.commits}-l{args.languages}"
+                return await run_job(client, username, token)
+        
+        tracemalloc.start()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=None) as client:
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(*(bounded(index) for index in range(args.jobs)))
+            elapsed = time.perf_counter() - started
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        async with httpx.AsyncClient() as github_client:
+            github_stats = (await github_client.get(f"{github_url}/_bench/stats")).json()
+        await analysis_service.github_service.close()
+        await analysis_service.cache_service.close()
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+    
+    latencies_ms = [outcome["latency"] * 1000 for outcome in outcomes]
+    completed = sum(1 for outcome in outcomes if outcome["status"] == "completed")
+    return {
+        "config": {
+            "jobs": args.jobs,
+            "concurrency": args.concurrency,
+            "repos": args.repos,
+            "commits": args.commits,
+            "languages": args.languages,
+            "latency_ms": args.latency_ms,
+            "strategy": args.strategy
+        },
+        "completed": completed,
+        "failed": len(outcomes) - completed,
+        "duration_s": round(elapsed, 3),
+        "jobs_per_sec": round(len(outcomes) / elapsed, 3) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 1),
+        "latency_p95_ms": round(percentile(latencies_ms, 95), 1),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 1),
+        "github_calls_per_job": round(github_stats["requests"] / max(len(outcomes), 1), 2),
+        "github_calls_by_endpoint": github_stats["by_endpoint"],
+        "github_statuses": github_stats["by_status"],
+        "peak_memory_mb": round(peak_memory / (1024 * 1024), 2)
+    }
+
+def find_regressions(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for metric in HIGHER_IS_WORSE:
+        if baseline.get(metric) and report[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f"{metric}: {baseline[metric]} -> {report[metric]}")
+    for metric in LOWER_IS_WORSE:
+        if baseline.get(metric) and report[metric] < baseline[metric] * (1 - tolerance):
+            regressions.append(f"{metric}: {baseline[metric]} -> {report[metric]}")
+    return regressions
+
+def print_report(report: Dict):
+    print(f"jobs            {report['completed']} completed, {report['failed']} failed in {report['duration_s']}s")
+    print(f"throughput      {report['jobs_per_sec']} jobs/s")
+    print(f"latency         p50 {report['latency_p50_ms']}ms  p95 {report['latency_p95_ms']}ms  p99 {report['latency_p99_ms']}ms")
+    print(f"github calls    {report['github_calls_per_job']} per job {report['github_calls_by_endpoint']}")
+    print(f"peak memory     {report['peak_memory_mb']} MB (Python allocations)")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="End-to-end analysis benchmark against a fake GitHub")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5, help="Jobs submitted at once")
+    parser.add_argument("--repos", type=int, default=30, help="Repositories per synthetic user")
+    parser.add_argument("--commits", type=int, default=100, help="Mean commits per repository")
+    parser.add_argument("--languages", type=int, default=3, help="Maximum languages per repository")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Injected GitHub latency")
+    parser.add_argument("--jitter-ms", type=float, default=2.0)
+    parser.add_argument("--rate-limit", type=int, default=1_000_000)
+    parser.add_argument("--strategy", choices=("rest", "graphql", "stats"), default="rest")
+    parser.add_argument("--stats-retry-delay", type=float, default=0.2, help="First retry delay after a 202 (stats strategy)")
+    parser.add_argument("--cassette", help="Replay recorded GitHub responses instead of synthetic users")
+    parser.add_argument("--github-url", help="Use an already running fake GitHub")
+    parser.add_argument("--redis-url", help="Run with Redis-backed cache and job store")
+    parser.add_argument("--run-id", default=str(int(time.time())), help="Username prefix (keeps runs cache-cold)")
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Performance regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
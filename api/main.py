@@ -1,11 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import analysis_router, auth_router
+from app.routers import analysis_router, auth_router, metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the pooled GitHub client once per process and close pools on shutdown
+    analysis_service = analysis_router.get_analysis_service()
+    await analysis_service.github_service.start()
+    yield
+    await analysis_service.github_service.close()
+    await analysis_service.git_mirror_service.close()
+    await analysis_service.cache_service.close()
 
 app = FastAPI(
     title="Skill Piler API",
     description="GitHub repository analysis and skill visualization API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -18,6 +30,7 @@ app.add_middleware(
 
 app.include_router(analysis_router.router, prefix="/api/v1", tags=["analysis"])
 app.include_router(auth_router.router, prefix="/api/v1", tags=["auth"])
+app.include_router(metrics_router.router, tags=["metrics"])
 
 @app.get("/")
 async def root():
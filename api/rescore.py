@@ -0,0 +1,94 @@
+"""
+Re-scoring command line tool (no GitHub calls; uses stored raw aggregates)
+
+  python rescore.py profiles
+  python rescore.py add-profile profile.json
+  python rescore.py user USERNAME [--private] [--profile NAME] [--version N] [--profile-file FILE]
+  python rescore.py all [--profile NAME] [--version N] [--profile-file FILE] > results.ndjson
+
+Analyses run with a token are re-scored with the token from GITHUB_TOKEN.
+"all" re-scores each user once, from their most recent stored analysis.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from app.models.scoring import RescoreRequest, ScoringProfile
+from app.services.analysis_service import AnalysisService
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Re-score stored analyses under a scoring profile")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    commands.add_parser("profiles", help="List scoring profiles")
+    
+    add_profile = commands.add_parser("add-profile", help="Register a profile version from a JSON file")
+    add_profile.add_argument("file")
+    
+    user = commands.add_parser("user", help="Re-score one user")
+    user.add_argument("username")
+    user.add_argument("--private", action="store_true", help="Analysis included private repositories")
+    
+    population = commands.add_parser("all", help="Re-score the latest stored analysis of every user (NDJSON on stdout)")
+    population.add_argument("--batch-size", type=int, default=500)
+    
+    for command in (user, population):
+        command.add_argument("--profile", default="default", help="Stored profile name")
+        command.add_argument("--version", type=int, default=None, help="Profile version (default: latest)")
+        command.add_argument("--profile-file", help="Inline what-if profile JSON (not stored)")
+    
+    return parser
+
+async def resolve_profile(analysis_service: AnalysisService, args) -> ScoringProfile:
+    if args.profile_file:
+        with open(args.profile_file) as f:
+            return ScoringProfile.model_validate_json(f.read())
+    return await analysis_service.scoring_service.get_profile(args.profile, args.version)
+
+async def main(args):
+    analysis_service = AnalysisService()
+    scoring_service = analysis_service.scoring_service
+    try:
+        if args.command == "profiles":
+            for profile in await scoring_service.list_profiles():
+                print(profile.model_dump_json())
+        
+        elif args.command == "add-profile":
+            with open(args.file) as f:
+                profile = await scoring_service.save_profile(ScoringProfile.model_validate_json(f.read()))
+            print(f"Registered scoring profile {profile.label}", file=sys.stderr)
+        
+        elif args.command == "user":
+            profile = await resolve_profile(analysis_service, args)
+            result = await analysis_service.rescore(RescoreRequest(
+                github_username=args.username,
+                include_private=args.private,
+                access_token=os.getenv("GITHUB_TOKEN"),
+                profile=profile
+            ))
+            print(result.model_dump_json())
+        
+        elif args.command == "all":
+            profile = await resolve_profile(analysis_service, args)
+            started = time.perf_counter()
+            count = 0
+            async for records in scoring_service.iter_aggregates(args.batch_size):
+                for result in scoring_service.rescore(records, profile):
+                    print(result.model_dump_json())
+                count += len(records)
+            print(
+                f"Re-scored {count} analyses under {profile.label} in {time.perf_counter() - started:.2f}s",
+                file=sys.stderr
+            )
+    finally:
+        await analysis_service.cache_service.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
+    try:
+        asyncio.run(main(build_parser().parse_args()))
+    except ValueError as e:
+        raise SystemExit(str(e))
@@ -0,0 +1,129 @@
+import pytest
+import httpx
+from datetime import datetime, timedelta, timezone
+
+from bench.fake_github import FakeGitHubConfig, create_app
+from bench.run_benchmark import find_regressions, percentile
+from app.services.github_service import GitHubService
+from app.services.rate_limit_service import RateLimitService
+
+
+def fake_github_service(config: FakeGitHubConfig) -> GitHubService:
+    """
+    GitHubService wired to an in-process fake GitHub
+    """
+    app = create_app(config)
+    service = GitHubService(rate_limit_service=RateLimitService())
+    service.api_base_url = "http://fake"
+    service.graphql_url = "http://fake/graphql"
+    service.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake")
+    return service
+
+
+class TestFakeGitHub:
+    """Fake GitHub サーバーのテスト"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.config = FakeGitHubConfig(repositories=45, commits=20, fork_ratio=0.2)
+        self.app = create_app(self.config)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://fake")
+    
+    @pytest.mark.asyncio
+    async def test_user_repositories_paginated_without_forks(self):
+        """リポジトリ一覧のページングとフォーク除外のテスト"""
+        service = fake_github_service(self.config)
+        
+        repos = await service.get_user_repositories("alice")
+        
+        generated = self.app.state.user_repositories("alice")
+        assert len(repos) == len([repo for repo in generated if not repo.fork])
+        await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_size_suffix_overrides_config(self):
+        """ユーザー名サフィックスによる規模指定のテスト"""
+        response = await self.client.get("/users/bob-r3-c5-l1/repos", params={"per_page": 100})
+        
+        assert response.status_code == 200
+        assert len(self.app.state.user_repositories("bob-r3-c5-l1")) == 3
+    
+    @pytest.mark.asyncio
+    async def test_commits_since_matches_graphql_history(self):
+        """REST の since 指定と GraphQL の履歴件数が一致するテスト"""
+        service = fake_github_service(self.config)
+        since = datetime.now(timezone.utc) - timedelta(days=365)
+        
+        rest_counts = {}
+        for repo in await service.get_user_repositories("carol", "token"):
+            commits = await service.get_commit_history("carol", repo["name"], "token", since)
+            rest_counts[repo["name"]] = len(commits)
+        graphql_counts = {}
+        async for page in service.iter_repository_activity("carol", "token", since):
+            for repo in page:
+                graphql_counts[repo["name"]] = repo["recent_commit_count"]
+        
+        assert graphql_counts == rest_counts
+        await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers_and_exhaustion(self):
+        """レート制限ヘッダーと上限到達時の 403 のテスト"""
+        self.app.state.config.rate_limit = 2
+        
+        first = await self.client.get("/users/dave/repos", headers={"Authorization": "token a"})
+        second = await self.client.get("/users/dave/repos", headers={"Authorization": "token a"})
+        exhausted = await self.client.get("/users/dave/repos", headers={"Authorization": "token a"})
+        other_token = await self.client.get("/users/dave/repos", headers={"Authorization": "token b"})
+        
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert second.headers["X-RateLimit-Remaining"] == "0"
+        assert exhausted.status_code == 403
+        assert other_token.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_etag_revalidation_is_free(self):
+        """ETag 再検証 (304) がレート制限を消費しないテスト"""
+        first = await self.client.get("/users/erin/repos")
+        revalidated = await self.client.get("/users/erin/repos", headers={"If-None-Match": first.headers["ETag"]})
+        
+        assert revalidated.status_code == 304
+        assert revalidated.headers["X-RateLimit-Remaining"] == first.headers["X-RateLimit-Remaining"]
+    
+    @pytest.mark.asyncio
+    async def test_bench_stats_count_requests(self):
+        """リクエスト統計とリセットのテスト"""
+        await self.client.get("/users/frank/repos")
+        await self.client.get("/repos/frank/repo-0000/languages")
+        
+        stats = (await self.client.get("/_bench/stats")).json()
+        await self.client.post("/_bench/reset")
+        after_reset = (await self.client.get("/_bench/stats")).json()
+        
+        assert stats["requests"] == 2
+        assert stats["by_endpoint"]["GET /repos/{owner}/{repo}/languages"] == 1
+        assert after_reset["requests"] == 0
+
+
+class TestBenchmarkReport:
+    """ベンチマークレポート集計のテスト"""
+    
+    def test_percentile(self):
+        """パーセンタイル計算のテスト"""
+        values = [float(value) for value in range(1, 101)]
+        
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+    
+    def test_find_regressions(self):
+        """ベースラインとの比較による性能劣化検出のテスト"""
+        baseline = {"jobs_per_sec": 10.0, "latency_p95_ms": 100.0, "github_calls_per_job": 5.0, "peak_memory_mb": 10.0}
+        report = {"jobs_per_sec": 8.0, "latency_p95_ms": 105.0, "github_calls_per_job": 5.0, "peak_memory_mb": 20.0,
+                  "latency_p50_ms": 50.0, "latency_p99_ms": 120.0}
+        
+        regressions = find_regressions(report, baseline, tolerance=0.1)
+        
+        assert any(item.startswith("jobs_per_sec") for item in regressions)
+        assert any(item.startswith("peak_memory_mb") for item in regressions)
+        assert not any(item.startswith("latency_p95_ms") for item in regressions)
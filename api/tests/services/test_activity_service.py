@@ -0,0 +1,95 @@
+"""
+Tests for ActivityService - Monthly Commit Rollups and Activity Time Series
+"""
+import pytest
+from pydantic import ValidationError
+from app.models.activity import ActivityRequest
+from app.models.commit_timeline import CommitTimeline, parse_month
+from app.services.activity_service import ActivityService
+from tests.services.test_snapshot_service import disabled_cache
+
+
+def months(counts):
+    """"YYYY-MM" → 件数 の辞書を月インデックスの辞書に変換"""
+    return {parse_month(label): count for label, count in counts.items()}
+
+
+class TestActivityService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = ActivityService(disabled_cache())
+        self.rollup = self.service.build_rollup(
+            "testuser",
+            "2024-06-01T00:00:00",
+            months({"2023-11": 2, "2024-01": 5, "2024-03": 1}),
+            {
+                "Python": months({"2023-11": 2, "2024-01": 4}),
+                "Go": months({"2024-01": 1, "2024-03": 1})
+            }
+        )
+    
+    def request(self, **kwargs):
+        """活動量リクエストを生成"""
+        return ActivityRequest(github_username="testuser", **kwargs)
+    
+    def test_build_rollup_is_dense_from_first_month(self):
+        """ロールアップが最初の月から始まる密な配列になるテスト"""
+        assert self.rollup["start"] == "2023-11"
+        assert self.rollup["total"] == [2, 0, 5, 0, 1]
+        assert self.rollup["languages"]["Go"] == [0, 0, 1, 0, 1]
+        assert self.service.build_rollup("testuser", "2024-06-01T00:00:00", {}, {}) is None
+    
+    def test_time_series_monthly_default_range(self):
+        """範囲未指定時は活動のある期間が月単位で返されるテスト"""
+        series = self.service.time_series(self.rollup, self.request())
+        
+        assert series.periods == ["2023-11", "2023-12", "2024-01", "2024-02", "2024-03"]
+        assert series.total_counts == [2, 0, 5, 0, 1]
+        assert [language.language for language in series.languages] == ["Python", "Go"]
+        assert series.languages[0].total == 6
+    
+    def test_time_series_quarters_and_years(self):
+        """四半期・年単位の集計テスト"""
+        quarters = self.service.time_series(self.rollup, self.request(granularity="quarter"))
+        years = self.service.time_series(self.rollup, self.request(granularity="year"))
+        
+        assert quarters.periods == ["2023-Q4", "2024-Q1"]
+        assert quarters.total_counts == [2, 6]
+        assert years.periods == ["2023", "2024"]
+        assert years.total_counts == [2, 6]
+    
+    def test_time_series_range_outside_rollup_is_zero_filled(self):
+        """ロールアップ外の期間は0で埋められ、部分的な期間は範囲内の月のみ数えるテスト"""
+        series = self.service.time_series(
+            self.rollup, self.request(start="2024-02", end="2024-05", granularity="quarter", languages=["Go"])
+        )
+        
+        assert series.periods == ["2024-Q1", "2024-Q2"]
+        assert series.total_counts == [1, 0]
+        assert [(language.language, language.counts) for language in series.languages] == [("Go", [1, 0])]
+    
+    def test_request_validates_range(self):
+        """不正な期間指定が拒否されるテスト"""
+        with pytest.raises(ValidationError):
+            self.request(start="2024-05", end="2024-01")
+        with pytest.raises(ValidationError):
+            self.request(start="2024-13")
+        with pytest.raises(ValidationError):
+            self.request(granularity="week")
+    
+    @pytest.mark.asyncio
+    async def test_save_and_get_rollup_without_redis(self):
+        """Redis未設定時はプロセス内に保存されるテスト"""
+        await self.service.save_rollup("testuser:public:public", self.rollup)
+        
+        assert await self.service.get_rollup("testuser:public:public") == self.rollup
+        assert await self.service.get_rollup("other:public:public") is None
+    
+    def test_commit_timeline_monthly_counts(self):
+        """コミットタイムラインの月別件数 (UTC の月境界) のテスト"""
+        timeline = CommitTimeline.from_dates([
+            "2024-01-31T23:59:59Z", "2024-02-01T00:00:00Z", "2024-02-15T00:00:00Z", "2024-05-01T00:00:00Z"
+        ])
+        
+        assert timeline.monthly_counts() == months({"2024-01": 1, "2024-02": 2, "2024-05": 1})
+        assert CommitTimeline().monthly_counts() == {}
@@ -3,16 +3,41 @@ Tests for AnalysisService - Core GitHub Repository Analysis Orchestration
 """
 import pytest
 import uuid
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, AsyncMock, patch
 from app.services.analysis_service import AnalysisService
-from app.models.analysis import AnalysisRequest, AnalysisJob, LanguageIntensity
+from app.models.activity import ActivityRequest
+from app.models.commit_timeline import CommitTimeline
+from app.models.analysis import AnalysisRequest, AnalysisJob, AnalysisResult, LanguageIntensity
+from app.models.scoring import RescoreRequest, ScoringProfile
+from app.services.activity_service import ActivityService
+from app.services.job_store_service import InMemoryJobStore
+from app.services.progress_service import ProgressService
+from app.services.scoring_service import ScoringService
+from app.services.snapshot_service import SnapshotService
+from tests.services.test_snapshot_service import disabled_cache, in_memory_cache
+
+
+def mock_repository_pages(*pages):
+    """リポジトリ一覧のページを順に返す非同期イテレータを生成"""
+    async def iterate(username, access_token=None):
+        for page in pages:
+            yield page
+    return iterate
 
 
 class TestAnalysisService:
     def setup_method(self):
         """各テストの前に実行される初期化"""
         self.service = AnalysisService()
+        self.service.job_store = InMemoryJobStore()
+    
+    def use_local_stores(self):
+        """集計データ・ロールアップ・スナップショットを環境のRedisではなくプロセス内に保存"""
+        self.service.snapshot_service = SnapshotService(disabled_cache())
+        self.service.scoring_service = ScoringService(disabled_cache())
+        self.service.activity_service = ActivityService(disabled_cache())
     
     @pytest.mark.asyncio
     async def test_start_analysis_creates_job(self):
@@ -29,12 +54,148 @@ class TestAnalysisService:
         # 検証
         assert isinstance(job, AnalysisJob)
         assert job.status == "pending"
-        assert job.job_id in self.service.jobs
+        assert await self.service.job_store.get(job.job_id) is not None
         assert isinstance(job.created_at, datetime)
         
         # バックグラウンド処理が開始されたか確認
         mock_perform.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_start_analysis_enqueues_in_queue_mode(self):
+        """キューモードではワーカー用キューに追加されるテスト"""
+        self.service.execution_mode = "queue"
+        self.service.queue_service = AsyncMock()
+        request = AnalysisRequest(github_username="testuser")
+        
+        with patch.object(self.service, '_perform_analysis') as mock_perform:
+            job = await self.service.start_analysis(request)
+        
+        self.service.queue_service.enqueue.assert_awaited_once()
+        assert self.service.queue_service.enqueue.call_args[0][0] == job.job_id
+        mock_perform.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_start_analysis_attaches_to_in_flight_job(self):
+        """同一ユーザーの同時リクエストが実行中のジョブに合流するテスト"""
+        request = AnalysisRequest(github_username="testuser", access_token="mock_token")
+        
+        with patch.object(self.service, '_perform_analysis') as mock_perform:
+            first = await self.service.start_analysis(request)
+            second = await self.service.start_analysis(
+                AnalysisRequest(github_username="TestUser", access_token="mock_token")
+            )
+        
+        assert second.job_id == first.job_id
+        mock_perform.assert_called_once()
+        assert len(self.service.job_store.jobs) == 1
+    
+    @pytest.mark.asyncio
+    async def test_start_analysis_does_not_share_across_tokens(self):
+        """異なるトークンや公開範囲のリクエストは合流しないテスト"""
+        with patch.object(self.service, '_perform_analysis') as mock_perform:
+            first = await self.service.start_analysis(AnalysisRequest(github_username="testuser", access_token="token_a"))
+            second = await self.service.start_analysis(AnalysisRequest(github_username="testuser", access_token="token_b"))
+            third = await self.service.start_analysis(
+                AnalysisRequest(github_username="testuser", access_token="token_a", include_private=True)
+            )
+        
+        assert len({first.job_id, second.job_id, third.job_id}) == 3
+        assert mock_perform.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_start_analysis_reuses_fresh_result(self):
+        """鮮度期間内の完了済み結果が再利用され、期間外なら再分析されるテスト"""
+        request = AnalysisRequest(github_username="testuser")
+        
+        with patch.object(self.service, '_perform_analysis') as mock_perform:
+            first = await self.service.start_analysis(request)
+            first.status = "completed"
+            first.completed_at = datetime.now()
+            await self.service.job_store.save(first)
+            
+            reused = await self.service.start_analysis(request)
+            assert reused.job_id == first.job_id
+            
+            first.completed_at = datetime.now() - timedelta(seconds=self.service.freshness_window + 1)
+            await self.service.job_store.save(first)
+            
+            fresh = await self.service.start_analysis(request)
+        
+        assert fresh.job_id != first.job_id
+        assert mock_perform.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_analysis_releases_flight(self):
+        """失敗したジョブのフライトが解放され、次のリクエストで再分析されるテスト"""
+        request = AnalysisRequest(github_username="testuser")
+        
+        with patch.object(self.service, '_perform_analysis'):
+            first = await self.service.start_analysis(request)
+        
+        with patch.object(self.service, '_fetch_all_repository_data', side_effect=ValueError("boom")):
+            await self.service._perform_analysis(first.job_id, request)
+        
+        with patch.object(self.service, '_perform_analysis'):
+            second = await self.service.start_analysis(request)
+        
+        assert (await self.service.job_store.get(first.job_id)).status == "failed"
+        assert second.job_id != first.job_id
+    
+    @pytest.mark.asyncio
+    async def test_failed_enqueue_releases_flight(self):
+        """キューへの追加に失敗したジョブが削除され、次のリクエストで再度キューに追加されるテスト"""
+        self.service.execution_mode = "queue"
+        self.service.queue_service = AsyncMock()
+        self.service.queue_service.enqueue.side_effect = [ConnectionError("queue down"), None]
+        request = AnalysisRequest(github_username="testuser")
+        
+        with pytest.raises(ConnectionError):
+            await self.service.start_analysis(request)
+        assert self.service.job_store.jobs == {}
+        
+        job = await self.service.start_analysis(request)
+        
+        assert self.service.queue_service.enqueue.await_count == 2
+        assert self.service.queue_service.enqueue.call_args[0][0] == job.job_id
+    
+    @pytest.mark.asyncio
+    async def test_stale_holder_is_taken_over(self):
+        """ハートビートの途絶えた実行中ジョブが共有されず、失敗扱いになるテスト"""
+        request = AnalysisRequest(github_username="testuser")
+        
+        with patch.object(self.service, '_perform_analysis') as mock_perform:
+            orphan = await self.service.start_analysis(request)
+            orphan.status = "processing"
+            orphan.updated_at = datetime.now() - timedelta(seconds=self.service.stale_after + 1)
+            await self.service.job_store.save(orphan)
+            
+            fresh = await self.service.start_analysis(request)
+        
+        assert fresh.job_id != orphan.job_id
+        assert mock_perform.call_count == 2
+        assert (await self.service.job_store.get(orphan.job_id)).status == "failed"
+    
+    @pytest.mark.asyncio
+    async def test_heartbeat_refreshes_running_job(self):
+        """実行中のジョブの updated_at がハートビートで更新されるテスト"""
+        self.service.heartbeat_interval = 0.01
+        request = AnalysisRequest(github_username="testuser")
+        with patch.object(self.service, '_perform_analysis'):
+            job = await self.service.start_analysis(request)
+        beats = []
+        
+        async def slow_fetch(request, progress=None):
+            beats.append((await self.service.job_store.get(job.job_id)).updated_at)
+            await asyncio.sleep(0.05)
+            beats.append((await self.service.job_store.get(job.job_id)).updated_at)
+            return [], []
+        
+        with patch.object(self.service, '_fetch_all_repository_data', side_effect=slow_fetch):
+            await self.service._perform_analysis(job.job_id, request)
+        
+        assert beats[1] > beats[0]
+        assert (await self.service.job_store.get(job.job_id)).status == "completed"
+    
     @pytest.mark.asyncio
     async def test_get_analysis_status_existing_job(self):
         """既存ジョブのステータス取得テスト"""
@@ -45,7 +206,7 @@ class TestAnalysisService:
             status="processing",
             created_at=datetime.now()
         )
-        self.service.jobs[job_id] = job
+        await self.service.job_store.save(job)
         
         # テスト実行
         retrieved_job = await self.service.get_analysis_status(job_id)
@@ -65,8 +226,14 @@ class TestAnalysisService:
         """完了したジョブの結果取得テスト"""
         # 完了済みジョブを手動で作成
         job_id = str(uuid.uuid4())
-        mock_result = Mock(spec=['username', 'analysis_date', 'languages'])
-        mock_result.username = "testuser"
+        mock_result = AnalysisResult(
+            username="testuser",
+            analysis_date=datetime.now(),
+            languages=[],
+            total_repositories=0,
+            total_commits=0,
+            analysis_period_months=12
+        )
         
         job = AnalysisJob(
             job_id=job_id,
@@ -75,7 +242,7 @@ class TestAnalysisService:
             completed_at=datetime.now(),
             result=mock_result
         )
-        self.service.jobs[job_id] = job
+        await self.service.job_store.save(job)
         
         # テスト実行
         result = await self.service.get_analysis_result(job_id)
@@ -93,7 +260,7 @@ class TestAnalysisService:
             status="processing",
             created_at=datetime.now()
         )
-        self.service.jobs[job_id] = job
+        await self.service.job_store.save(job)
         
         with pytest.raises(ValueError, match="Job .* is not completed"):
             await self.service.get_analysis_result(job_id)
@@ -132,8 +299,8 @@ class TestAnalysisService:
         # GitHubServiceのメソッドをモック
         mocker.patch.object(
             self.service.github_service,
-            'get_user_repositories',
-            return_value=mock_repos
+            'iter_user_repositories',
+            side_effect=mock_repository_pages(mock_repos)
         )
         mocker.patch.object(
             self.service.github_service,
@@ -142,8 +309,8 @@ class TestAnalysisService:
         )
         mocker.patch.object(
             self.service.github_service,
-            'get_commit_history',
-            return_value=mock_commits
+            'get_commit_timeline',
+            return_value=CommitTimeline.from_dates(commit["author"]["date"] for commit in mock_commits)
         )
         
         # IntencyServiceのメソッドをモック
@@ -160,7 +327,7 @@ class TestAnalysisService:
             status="pending",
             created_at=datetime.now()
         )
-        self.service.jobs[job_id] = job
+        await self.service.job_store.save(job)
         
         request = AnalysisRequest(
             github_username="testuser",
@@ -171,7 +338,7 @@ class TestAnalysisService:
         await self.service._perform_analysis(job_id, request)
         
         # 検証
-        updated_job = self.service.jobs[job_id]
+        updated_job = await self.service.job_store.get(job_id)
         assert updated_job.status == "completed"
         assert updated_job.result is not None
         assert updated_job.result.username == "testuser"
@@ -184,13 +351,264 @@ class TestAnalysisService:
         assert languages[1].language == "JavaScript"
         assert languages[1].intensity == 45.2
     
+    @pytest.mark.asyncio
+    async def test_stream_progress_until_completed(self, mocker):
+        """進捗ストリームが現在の状態から完了イベントまで配信されるテスト"""
+        self.service.progress_service = ProgressService(disabled_cache())
+        self.service.progress_service.min_interval = 0
+        mocker.patch.object(
+            self.service.github_service,
+            'iter_user_repositories',
+            side_effect=mock_repository_pages([{"name": "repo-a"}, {"name": "repo-b"}])
+        )
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Python": 1000})
+        mocker.patch.object(self.service.github_service, 'get_commit_timeline', return_value=CommitTimeline())
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        
+        events = []
+        async for event in self.service.stream_progress(job_id):
+            events.append(event)
+            if len(events) == 1:
+                # Start the job once the stream is subscribed
+                task = asyncio.create_task(self.service._perform_analysis(job_id, AnalysisRequest(github_username="testuser")))
+        await task
+        
+        assert events[0]["type"] == "progress" and events[0]["status"] == "pending"
+        assert events[-1]["type"] == "completed"
+        assert events[-1]["progress"]["repositories_processed"] == 2
+        assert events[-1]["progress"]["repositories_total"] == 2
+        assert "fetching" in [event["progress"]["phase"] for event in events[1:-1]]
+    
+    @pytest.mark.asyncio
+    async def test_stream_results_partial_then_final(self, mocker):
+        """途中経過のランキングの後に最終結果が配信されるテスト"""
+        self.service.progress_service = ProgressService(disabled_cache())
+        self.service.progress_service.min_interval = 0
+        mocker.patch.object(
+            self.service.github_service,
+            'iter_user_repositories',
+            side_effect=mock_repository_pages([{"name": "repo-a"}, {"name": "repo-b"}])
+        )
+        
+        async def languages(owner, repo, token):
+            return {"Python": 10000} if repo == "repo-a" else {"Go": 50000}
+        
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', side_effect=languages)
+        mocker.patch.object(self.service.github_service, 'get_commit_timeline', return_value=CommitTimeline.from_dates(["2023-06-01T00:00:00Z"]))
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        
+        # The job only starts running once the stream is subscribed and waiting
+        task = asyncio.create_task(self.service._perform_analysis(job_id, AnalysisRequest(github_username="testuser")))
+        frames = [frame async for frame in self.service.stream_results(job_id)]
+        await task
+        
+        partial = [frame for frame in frames if frame["type"] == "partial"]
+        assert len(partial) == 2
+        assert len(partial[0]["languages"]) == 1
+        assert [language["language"] for language in partial[1]["languages"]] == ["Go", "Python"]
+        assert frames[-1]["type"] == "final"
+        assert [language["language"] for language in frames[-1]["result"]["languages"]] == ["Go", "Python"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_progress_finished_job(self):
+        """完了済みジョブは最終状態のみ配信されるテスト"""
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(
+            job_id=job_id, status="failed", created_at=datetime.now(), error_message="boom"
+        ))
+        
+        events = [event async for event in self.service.stream_progress(job_id)]
+        
+        assert events == [{
+            "type": "failed", "job_id": job_id, "status": "failed", "progress": None, "error_message": "boom"
+        }]
+    
+    @pytest.mark.asyncio
+    async def test_rescore_stored_analysis(self, mocker):
+        """保存された集計データをGitHubを呼ばずに再スコアリングするテスト"""
+        self.use_local_stores()
+        mocker.patch.object(
+            self.service.github_service,
+            'iter_user_repositories',
+            side_effect=mock_repository_pages([{"name": "repo-a"}])
+        )
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Python": 10000, "HTML": 20000})
+        mocker.patch.object(
+            self.service.github_service,
+            'get_commit_timeline',
+            return_value=CommitTimeline.from_dates(["2023-06-01T00:00:00Z"])
+        )
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        await self.service._perform_analysis(job_id, AnalysisRequest(github_username="testuser"))
+        analyzed = (await self.service.job_store.get(job_id)).result
+        
+        self.service.github_service.get_repository_languages.reset_mock()
+        rescored = await self.service.rescore(RescoreRequest(github_username="testuser"))
+        what_if = await self.service.rescore(RescoreRequest(
+            github_username="testuser",
+            profile=ScoringProfile(name="what-if", language_complexity={"HTML": 3.0})
+        ))
+        
+        assert analyzed.scoring_profile == "default@1"
+        assert [(l.language, l.intensity) for l in rescored.languages] == \
+            [(l.language, l.intensity) for l in analyzed.languages]
+        assert what_if.languages[0].language == "HTML"
+        assert what_if.scoring_profile == "what-if@1"
+        self.service.github_service.get_repository_languages.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_commits_fetched_for_author_aliases(self, mocker):
+        """ユーザーのログインと追加メールで作者フィルタされたコミットのみ取得されるテスト"""
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Python": 100})
+        timeline = mocker.patch.object(self.service.github_service, 'get_commit_timeline', return_value=CommitTimeline())
+        request = AnalysisRequest(github_username="TestUser", author_emails=["Work@Example.com ", "testuser", ""])
+        
+        await self.service._load_repository_data(request, {"name": "repo"}, asyncio.Semaphore(1))
+        
+        assert timeline.call_args.kwargs["authors"] == ["testuser", "work@example.com"]
+        self.service.author_filter = False
+        await self.service._load_repository_data(request, {"name": "repo"}, asyncio.Semaphore(1))
+        assert timeline.call_args.kwargs["authors"] is None
+    
+    @pytest.mark.asyncio
+    async def test_stats_strategy_retries_without_blocking_other_repositories(self, mocker):
+        """統計の集計中 (202) は枠を解放して待機し、他のリポジトリが先に処理されるテスト"""
+        self.service.fetch_strategy = "stats"
+        self.service.stats_retry_delay = 0.01
+        order = []
+        calls = {"repo-a": 0}
+        
+        async def contributor_stats(owner, repo, token=None):
+            order.append(repo)
+            if repo == "repo-a":
+                calls["repo-a"] += 1
+                if calls["repo-a"] == 1:
+                    return None
+            return {"testuser": [[1704585600, 3]], "someone-else": [[1704585600, 9]]}
+        
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Python": 100})
+        mocker.patch.object(self.service.github_service, 'get_contributor_stats', side_effect=contributor_stats)
+        request = AnalysisRequest(github_username="TestUser")
+        semaphore = asyncio.Semaphore(1)
+        
+        data_a, data_b = await asyncio.gather(
+            self.service._load_repository_data(request, {"name": "repo-a"}, semaphore),
+            self.service._load_repository_data(request, {"name": "repo-b"}, semaphore)
+        )
+        
+        assert order == ["repo-a", "repo-b", "repo-a"]
+        assert data_a['commit_count'] == 3
+        assert data_b['commit_count'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_stats_strategy_falls_back_to_commit_listing(self, mocker):
+        """統計が用意できないままリトライが尽きるとユーザーのコミット一覧に切り替わるテスト"""
+        self.service.fetch_strategy = "stats"
+        self.service.stats_max_attempts = 2
+        self.service.stats_retry_delay = 0
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Python": 100})
+        stats = mocker.patch.object(self.service.github_service, 'get_contributor_stats', return_value=None)
+        timeline = mocker.patch.object(
+            self.service.github_service, 'get_commit_timeline',
+            return_value=CommitTimeline.from_dates(["2024-01-01T00:00:00Z"])
+        )
+        
+        data = await self.service._load_repository_data(
+            AnalysisRequest(github_username="testuser", author_emails=["work@example.com"]),
+            {"name": "repo"},
+            asyncio.Semaphore(1)
+        )
+        
+        assert stats.call_count == 2
+        assert timeline.call_args.kwargs["authors"] == ["testuser"]
+        assert data['commit_count'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_git_strategy_attributes_commits_per_language(self, mocker):
+        """git ミラー戦略ではスナップショットを使わず、言語別のコミット帰属が集計データに含まれるテスト"""
+        self.service.fetch_strategy = "git"
+        snapshot = mocker.patch.object(self.service.snapshot_service, 'get')
+        mirror = mocker.patch.object(
+            self.service.git_mirror_service, 'analyze_repository',
+            return_value=(
+                {"Python": 100, "Go": 50},
+                CommitTimeline.from_dates(["2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"]),
+                {"Go": CommitTimeline.from_dates(["2024-01-02T00:00:00Z"])}
+            )
+        )
+        
+        data = await self.service._load_repository_data(
+            AnalysisRequest(github_username="testuser"), {"name": "repo"}, asyncio.Semaphore(1)
+        )
+        
+        snapshot.assert_not_called()
+        assert mirror.call_args.kwargs["authors"] == ["testuser"]
+        assert data['commit_count'] == 2
+        assert data['language_commits']["Go"]["commit_count"] == 1
+        assert data['language_commits']["Go"]["monthly"] == {2024 * 12: 1}
+        assert all(count <= 1 for count in data['language_commits']["Go"]["activity"].values())
+        assert "Python" not in data['language_commits']
+    
+    def test_flight_key_includes_author_emails(self):
+        """追加の作者メールが分析の識別子に含まれるテスト"""
+        plain = self.service._flight_key(AnalysisRequest(github_username="testuser"))
+        
+        assert plain == "testuser:public:public"
+        assert self.service._flight_key(AnalysisRequest(github_username="testuser", author_emails=["TestUser"])) == plain
+        assert self.service._flight_key(
+            AnalysisRequest(github_username="testuser", author_emails=["work@example.com"])
+        ).startswith(plain + ":")
+    
+    @pytest.mark.asyncio
+    async def test_activity_from_stored_rollup(self, mocker):
+        """分析時に保存された月別ロールアップから活動量の時系列が返されるテスト"""
+        self.use_local_stores()
+        mocker.patch.object(
+            self.service.github_service,
+            'iter_user_repositories',
+            side_effect=mock_repository_pages([{"name": "repo-a"}, {"name": "repo-b"}])
+        )
+        mocker.patch.object(
+            self.service.github_service,
+            'get_repository_languages',
+            side_effect=lambda owner, repo, token=None: {"Python": 100} if repo == "repo-a" else {"Go": 100}
+        )
+        mocker.patch.object(
+            self.service.github_service,
+            'get_commit_timeline',
+            side_effect=lambda owner, repo, token=None, since=None, authors=None: CommitTimeline.from_dates(
+                ["2023-06-01T00:00:00Z", "2023-06-20T00:00:00Z"] if repo == "repo-a" else ["2023-08-01T00:00:00Z"]
+            )
+        )
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        await self.service._perform_analysis(job_id, AnalysisRequest(github_username="testuser"))
+        
+        series = await self.service.activity(ActivityRequest(github_username="testuser", granularity="quarter"))
+        
+        assert series.periods == ["2023-Q2", "2023-Q3"]
+        assert series.total_counts == [2, 1]
+        assert [(l.language, l.counts) for l in series.languages] == [("Python", [2, 0]), ("Go", [0, 1])]
+        with pytest.raises(ValueError, match="No activity history"):
+            await self.service.activity(ActivityRequest(github_username="unknown"))
+    
+    @pytest.mark.asyncio
+    async def test_rescore_without_stored_analysis(self):
+        """保存された集計データがない場合はエラーになるテスト"""
+        self.use_local_stores()
+        with pytest.raises(ValueError, match="No stored analysis"):
+            await self.service.rescore(RescoreRequest(github_username="unknown"))
+    
     @pytest.mark.asyncio
     async def test_perform_analysis_failure(self, mocker):
         """分析処理の失敗テスト"""
         # GitHubServiceでエラーが発生するようにモック
         mocker.patch.object(
             self.service.github_service,
-            'get_user_repositories',
+            'iter_user_repositories',
             side_effect=ValueError("API Error")
         )
         
@@ -201,7 +619,7 @@ class TestAnalysisService:
             status="pending",
             created_at=datetime.now()
         )
-        self.service.jobs[job_id] = job
+        await self.service.job_store.save(job)
         
         request = AnalysisRequest(
             github_username="testuser",
@@ -212,55 +630,253 @@ class TestAnalysisService:
         await self.service._perform_analysis(job_id, request)
         
         # 検証
-        updated_job = self.service.jobs[job_id]
+        updated_job = await self.service.job_store.get(job_id)
         assert updated_job.status == "failed"
         assert updated_job.error_message == "API Error"
         assert updated_job.completed_at is not None
     
-    def test_filter_recent_commits(self):
-        """最近のコミットフィルタリングテスト"""
-        commits = [
-            {
-                "author": {"date": "2023-06-01T00:00:00Z"}  # 最近
-            },
-            {
-                "author": {"date": "2022-01-01T00:00:00Z"}  # 古い
-            },
-            {
-                "author": {"date": "2023-12-01T00:00:00Z"}  # 最近
-            }
+    @pytest.mark.asyncio
+    async def test_perform_analysis_bounded_concurrency(self, mocker):
+        """リポジトリ取得の同時実行数が上限を超えないことのテスト"""
+        import asyncio
+        
+        mock_repos = [{"name": f"repo-{i}"} for i in range(10)]
+        repo_pages = (mock_repos[:5], mock_repos[5:])
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def slow_languages(owner, repo, token):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"Python": 1000}
+        
+        self.service.repo_concurrency_per_job = 3
+        mocker.patch.object(self.service.github_service, 'iter_user_repositories', side_effect=mock_repository_pages(*repo_pages))
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', side_effect=slow_languages)
+        mocker.patch.object(self.service.github_service, 'get_commit_timeline', return_value=CommitTimeline())
+        
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        
+        await self.service._perform_analysis(job_id, AnalysisRequest(github_username="testuser"))
+        
+        assert (await self.service.job_store.get(job_id)).status == "completed"
+        assert (await self.service.job_store.get(job_id)).result.total_repositories == 10
+        assert 1 < max_in_flight <= 3
+    
+    @pytest.mark.asyncio
+    async def test_repository_selection_skips_per_repository_calls(self, mocker):
+        """一覧のメタデータにより空のリポジトリは取得せず、履歴期間外のリポジトリは言語のみ取得されるテスト"""
+        self.service.history_months = 12
+        old = (datetime.now() - timedelta(days=500)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        recent = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        mock_repos = [
+            {"name": "active", "size": 10, "created_at": old, "pushed_at": recent},
+            {"name": "dormant", "size": 10, "created_at": old, "pushed_at": old},
+            {"name": "empty", "size": 0, "created_at": old, "pushed_at": old}
         ]
+        mocker.patch.object(self.service.github_service, 'iter_user_repositories', side_effect=mock_repository_pages(mock_repos))
+        languages = mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Go": 100})
+        timeline = mocker.patch.object(
+            self.service.github_service, 'get_commit_timeline',
+            return_value=CommitTimeline.from_dates([recent])
+        )
         
-        # 12ヶ月以内のコミットをフィルタ
-        recent_commits = self.service._filter_recent_commits(commits, 12)
+        repos, repo_data = await self.service._fetch_all_repository_data(AnalysisRequest(github_username="testuser"))
         
-        # 検証（実際の日付により結果は変わるが、フィルタリングが機能することを確認）
-        assert len(recent_commits) <= len(commits)
-        assert all("author" in commit for commit in recent_commits)
+        assert [repo["name"] for repo in repos] == ["active", "dormant", "empty"]
+        assert [call.args[1] for call in languages.call_args_list] == ["active", "dormant"]
+        assert [call.args[1] for call in timeline.call_args_list] == ["active"]
+        assert repo_data[1]["commit_count"] == 0
+        assert repo_data[2] is None
     
-    def test_filter_recent_commits_invalid_dates(self):
-        """無効な日付を含むコミットのフィルタリングテスト"""
-        commits = [
-            {
-                "author": {"date": "2023-06-01T00:00:00Z"}  # 有効
-            },
-            {
-                "author": {"date": "invalid-date"}  # 無効
-            },
-            {
-                "author": {}  # 日付なし
-            }
+    @pytest.mark.asyncio
+    async def test_repository_limit_stops_listing(self, mocker):
+        """リポジトリ数の上限に達すると以降の一覧ページを取得しないテスト"""
+        self.service.repository_selection.max_repositories = 3
+        pages_read = []
+        
+        async def pages(username, access_token=None):
+            for number in range(3):
+                pages_read.append(number)
+                yield [{"name": f"repo-{number}-{index}"} for index in range(2)]
+        
+        mocker.patch.object(self.service.github_service, 'iter_user_repositories', side_effect=pages)
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Go": 100})
+        mocker.patch.object(self.service.github_service, 'get_commit_timeline', return_value=CommitTimeline())
+        
+        repos, _ = await self.service._fetch_all_repository_data(AnalysisRequest(github_username="testuser"))
+        
+        assert [repo["name"] for repo in repos] == ["repo-0-0", "repo-0-1", "repo-1-0"]
+        assert pages_read == [0, 1]
+    
+    @pytest.mark.asyncio
+    async def test_perform_analysis_skips_failed_repository(self, mocker):
+        """1つのリポジトリが失敗しても他のリポジトリの分析が継続されるテスト"""
+        mock_repos = [{"name": "good-repo"}, {"name": "bad-repo"}]
+        
+        async def languages(owner, repo, token):
+            if repo == "bad-repo":
+                raise ValueError("Repository not found")
+            return {"Python": 1000}
+        
+        mocker.patch.object(self.service.github_service, 'iter_user_repositories', side_effect=mock_repository_pages(mock_repos))
+        mocker.patch.object(self.service.github_service, 'get_repository_languages', side_effect=languages)
+        mocker.patch.object(
+            self.service.github_service,
+            'get_commit_timeline',
+            return_value=CommitTimeline.from_dates(["2023-06-01T00:00:00Z"])
+        )
+        
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        
+        await self.service._perform_analysis(job_id, AnalysisRequest(github_username="testuser"))
+        
+        result = (await self.service.job_store.get(job_id)).result
+        assert (await self.service.job_store.get(job_id)).status == "completed"
+        assert result.total_commits == 1
+        assert result.languages[0].repository_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_reanalysis_refetches_only_changed_repositories(self, mocker):
+        """再分析時にpushed_atが変わったリポジトリのみ再取得されるテスト"""
+        self.service.snapshot_service = SnapshotService(in_memory_cache())
+        first_listing = [
+            {"name": "repo-a", "pushed_at": "2024-01-01T00:00:00Z"},
+            {"name": "repo-b", "pushed_at": "2024-01-01T00:00:00Z"}
         ]
+        second_listing = [
+            {"name": "repo-a", "pushed_at": "2024-01-01T00:00:00Z"},
+            {"name": "repo-b", "pushed_at": "2024-03-01T00:00:00Z"}
+        ]
+        
+        mocker.patch.object(
+            self.service.github_service,
+            'iter_user_repositories',
+            side_effect=[mock_repository_pages(first_listing)("testuser"), mock_repository_pages(second_listing)("testuser")]
+        )
+        languages = mocker.patch.object(self.service.github_service, 'get_repository_languages', return_value={"Python": 1000})
+        mocker.patch.object(
+            self.service.github_service,
+            'get_commit_timeline',
+            return_value=CommitTimeline.from_dates(["2024-01-01T00:00:00Z"])
+        )
+        request = AnalysisRequest(github_username="testuser")
+        
+        await self.service._fetch_all_repository_data(request)
+        repos, repo_data = await self.service._fetch_all_repository_data(request)
         
-        recent_commits = self.service._filter_recent_commits(commits, 12)
+        fetched = [call.args[1] for call in languages.call_args_list]
+        assert fetched == ["repo-a", "repo-b", "repo-b"]
+        assert [data['commit_count'] for data in repo_data] == [1, 1]
+        assert repo_data[0]['languages'] == {"Python": 1000}
+    
+    @pytest.mark.asyncio
+    async def test_perform_analysis_graphql_strategy(self, mocker):
+        """GraphQL戦略ではREST APIを呼ばずに分析が完了するテスト"""
+        async def activity_pages(username, access_token, since, windows=None, own_commits=False):
+            assert sorted(windows) == [3, 6, 12, 24]
+            # 作者フィルタ有効時はユーザー自身のコミットのみを数える
+            assert own_commits
+            yield [{
+                "name": "repo-a",
+                "languages": {"Python": 10000},
+                "commit_count": 30,
+                "recent_commit_count": 10,
+                "activity": {"3": 2, "6": 4, "12": 10, "24": 20}
+            }]
+        
+        self.service.fetch_strategy = "graphql"
+        self.service.author_filter = True
+        mocker.patch.object(self.service.github_service, 'iter_repository_activity', side_effect=activity_pages)
+        rest_listing = mocker.patch.object(self.service.github_service, 'iter_user_repositories')
+        
+        job_id = str(uuid.uuid4())
+        await self.service.job_store.save(AnalysisJob(job_id=job_id, status="pending", created_at=datetime.now()))
+        
+        await self.service._perform_analysis(
+            job_id, AnalysisRequest(github_username="testuser", access_token="mock_token")
+        )
         
-        # 無効な日付のコミットはスキップされる
-        assert len(recent_commits) <= 1
+        result = (await self.service.job_store.get(job_id)).result
+        assert result.total_commits == 30
+        assert result.languages[0].language == "Python"
+        assert result.languages[0].commit_count == 30
+        assert result.languages[0].activity == {"3": 2, "6": 4, "12": 10, "24": 20}
+        rest_listing.assert_not_called()
     
-    def test_filter_recent_commits_zero_months(self):
-        """0ヶ月指定時のフィルタリングテスト"""
-        commits = [{"author": {"date": "2023-06-01T00:00:00Z"}}]
+    @pytest.mark.asyncio
+    async def test_graphql_strategy_falls_back_to_rest_without_token(self, mocker):
+        """トークンがない場合はREST戦略にフォールバックするテスト"""
+        self.service.fetch_strategy = "graphql"
+        graphql = mocker.patch.object(self.service.github_service, 'iter_repository_activity')
+        mocker.patch.object(
+            self.service.github_service,
+            'iter_user_repositories',
+            side_effect=mock_repository_pages([])
+        )
+        
+        repos, repo_data = await self.service._fetch_all_repository_data(
+            AnalysisRequest(github_username="testuser")
+        )
+        
+        assert repos == [] and repo_data == []
+        graphql.assert_not_called()
+    
+    def test_count_recent_commits(self):
+        """最近のコミット数カウントのテスト"""
+        now = datetime.now()
+        timeline = CommitTimeline.from_dates([
+            (now - timedelta(days=30)).isoformat(),  # 最近
+            (now - timedelta(days=800)).isoformat(),  # 古い
+            (now - timedelta(days=200)).isoformat()  # 最近
+        ])
+        
+        # 12ヶ月以内のコミットをカウント
+        assert self.service._count_recent_commits(timeline, 12) == 2
+    
+    def test_count_recent_commits_aware_dates(self):
+        """タイムゾーン付き日付 (GitHub 形式) のカウントテスト"""
+        recent = (datetime.utcnow() - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        timeline = CommitTimeline.from_dates([recent, "2001-01-01T00:00:00Z", "invalid-date"])
+        
+        # 無効な日付は取り込み時にスキップされる
+        assert len(timeline) == 2
+        assert self.service._count_recent_commits(timeline, 12) == 1
+    
+    def test_summarize_timeline_windows(self):
+        """リポジトリごとの期間別コミット数が一度に計算されるテスト"""
+        now = datetime.now()
+        timeline = CommitTimeline.from_dates([
+            (now - timedelta(days=days)).isoformat() for days in (10, 100, 200, 400, 1000)
+        ])
+        
+        data = self.service._summarize_timeline({"Python": 100}, timeline)
+        
+        assert data['commit_count'] == 5
+        assert data['recent_activity'] == 3
+        assert data['activity'] == {"3": 1, "6": 2, "12": 3, "24": 4}
+    
+    def test_count_recent_commits_zero_months(self):
+        """0ヶ月指定時のカウントテスト"""
+        timeline = CommitTimeline.from_dates(["2023-06-01T00:00:00Z"])
+        
+        # 0ヶ月指定時は全コミットがカウントされる
+        assert self.service._count_recent_commits(timeline, 0) == 1
+    
+    def test_cutoffs_are_utc(self):
+        """履歴期間と期間別集計の開始日時がタイムゾーン付き UTC になるテスト"""
+        self.service.history_months = 12
+        expected = datetime.now(timezone.utc) - timedelta(days=360)
+        
+        cutoff = self.service._history_cutoff()
+        assert cutoff.utcoffset() == timedelta(0)
+        assert abs(cutoff.timestamp() - expected.timestamp()) < 5
         
-        # 0ヶ月指定時は全コミットが返される
-        result = self.service._filter_recent_commits(commits, 0)
-        assert result == commits
\ No newline at end of file
+        windows = self.service._window_cutoffs()
+        assert all(start.utcoffset() == timedelta(0) for start in windows.values())
+        assert abs(windows[12].timestamp() - expected.timestamp()) < 5
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Tests for BatchAnalysisService - Team and Organization Analysis with Shared-Repository Deduplication
+"""
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+from pydantic import ValidationError
+from app.models.analysis import BatchAnalysisRequest
+from app.models.commit_timeline import CommitTimeline
+from app.services.analysis_service import AnalysisService
+from app.services.batch_analysis_service import BatchAnalysisService
+from app.services.job_store_service import InMemoryJobStore
+from app.services.rate_limit_service import RequestPriority
+
+
+def pages_of(listings):
+    """ログインごとのリポジトリ一覧を1ページで返す非同期イテレータを生成"""
+    async def iterate(login, access_token=None):
+        if listings.get(login) is None:
+            raise ValueError(f"User {login} not found")
+        yield listings[login]
+    return iterate
+
+
+def repo(full_name):
+    """一覧のリポジトリ項目を生成"""
+    return {"name": full_name.split("/")[1], "full_name": full_name}
+
+
+def timeline(*dates):
+    """日付からコミットタイムラインを生成"""
+    return CommitTimeline.from_dates(dates)
+
+
+class TestBatchAnalysisService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        analysis_service = AnalysisService()
+        analysis_service.job_store = InMemoryJobStore()
+        self.service = BatchAnalysisService(analysis_service)
+        self.github_service = analysis_service.github_service
+    
+    def mock_crawl(self, mocker, listings, commits, organization_repos=None, organization_members=None):
+        """GitHub 呼び出しをモック (commits: リポジトリ名 → (全体, 作者別))"""
+        mocker.patch.object(self.github_service, 'iter_user_repositories', side_effect=pages_of(listings))
+        mocker.patch.object(
+            self.github_service, 'iter_organization_repositories',
+            side_effect=pages_of({"acme": organization_repos or []})
+        )
+        mocker.patch.object(
+            self.github_service, 'iter_organization_members',
+            side_effect=pages_of({"acme": organization_members or []})
+        )
+        languages = mocker.patch.object(
+            self.github_service, 'get_repository_languages',
+            side_effect=lambda owner, name, token=None: {"Go": 100} if name == "platform" else {"Python": 100}
+        )
+        author_timelines = mocker.patch.object(
+            self.github_service, 'get_author_timelines',
+            side_effect=lambda owner, name, token=None, since=None: commits[name]
+        )
+        return languages, author_timelines
+    
+    async def run(self, request):
+        """バッチ分析を開始して完了まで待ち、ジョブを返す"""
+        job = await self.service.start_batch_analysis(request)
+        await asyncio.gather(*self.service._tasks)
+        return await self.service.analysis_service.get_analysis_status(job.job_id)
+    
+    def crawl_shared(self, mocker):
+        """共有の組織リポジトリとメンバー自身のリポジトリを持つクロールをモック"""
+        platform = (
+            timeline("2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z", "2024-01-03T00:00:00Z", "2024-01-04T00:00:00Z"),
+            {
+                "alice": timeline("2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"),
+                "bob": timeline("2024-01-03T00:00:00Z"),
+                "outsider": timeline("2024-01-04T00:00:00Z")
+            }
+        )
+        tools = (timeline("2024-02-01T00:00:00Z", "2024-02-02T00:00:00Z"), {"bob": timeline("2024-02-01T00:00:00Z")})
+        return self.mock_crawl(
+            mocker,
+            {"alice": [], "Bob": [repo("bob/tools")]},
+            {"platform": platform, "tools": tools},
+            organization_repos=[repo("acme/platform")],
+            organization_members=["alice", "bob"]
+        )
+    
+    @pytest.mark.asyncio
+    async def test_shared_repository_fetched_once_and_attributed(self, mocker):
+        """共有リポジトリが一度だけ取得され、コミットが作者ごとに帰属されるテスト"""
+        languages, author_timelines = self.crawl_shared(mocker)
+        
+        job = await self.run(BatchAnalysisRequest(github_usernames=["Bob"], organization="acme"))
+        result = await self.service.get_batch_result(job.job_id)
+        
+        assert job.status == "completed"
+        assert author_timelines.call_count == 2
+        assert languages.call_count == 2
+        members = {member.username: member for member in result.members}
+        assert list(members) == ["Bob", "alice"]
+        # Author filter (default): only the member's own commits, in their own repositories too
+        assert members["Bob"].total_commits == 1 + 1
+        assert members["Bob"].total_repositories == 2
+        assert members["alice"].total_commits == 2
+        assert [language.language for language in members["alice"].languages] == ["Go"]
+        # Aggregate: each repository once, outsiders' commits excluded
+        assert result.aggregate.username == "acme"
+        assert result.aggregate.total_commits == 3 + 1
+        assert result.total_repositories == 2
+        assert result.shared_repositories == 1
+    
+    @pytest.mark.asyncio
+    async def test_own_repositories_count_all_commits_without_author_filter(self, mocker):
+        """作者フィルタ無効時はメンバー自身のリポジトリの全コミットが帰属されるテスト"""
+        self.service.analysis_service.author_filter = False
+        self.crawl_shared(mocker)
+        
+        job = await self.run(BatchAnalysisRequest(github_usernames=["Bob"], organization="acme"))
+        
+        members = {member.username: member for member in job.batch_result.members}
+        assert members["Bob"].total_commits == 2 + 1
+        assert members["alice"].total_commits == 2
+        assert job.batch_result.aggregate.total_commits == 3 + 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_member_listing_does_not_fail_batch(self, mocker):
+        """一覧取得に失敗したメンバーが記録され、残りの分析が継続するテスト"""
+        self.mock_crawl(
+            mocker,
+            {"alice": [repo("alice/notes")], "ghost": None},
+            {"notes": (timeline("2024-01-01T00:00:00Z"), {"alice": timeline("2024-01-01T00:00:00Z")})}
+        )
+        
+        job = await self.run(BatchAnalysisRequest(github_usernames=["alice", "ghost"]))
+        
+        assert job.status == "completed"
+        assert job.batch_result.failed_members == ["ghost"]
+        assert job.batch_result.aggregate.username == "team"
+        assert [member.total_commits for member in job.batch_result.members] == [1, 0]
+    
+    @pytest.mark.asyncio
+    async def test_empty_repository_left_out_of_plan(self, mocker):
+        """空のリポジトリがクロール計画から除外されるテスト"""
+        empty = dict(repo("alice/empty"), size=0, created_at="2024-01-01T00:00:00Z", pushed_at="2024-01-01T00:00:00Z")
+        languages, author_timelines = self.mock_crawl(
+            mocker,
+            {"alice": [repo("alice/notes"), empty]},
+            {"notes": (timeline("2024-01-01T00:00:00Z"), {"alice": timeline("2024-01-01T00:00:00Z")})}
+        )
+        
+        job = await self.run(BatchAnalysisRequest(github_usernames=["alice"]))
+        
+        assert job.status == "completed"
+        assert author_timelines.call_count == 1
+        assert job.batch_result.total_repositories == 1
+    
+    @pytest.mark.asyncio
+    async def test_member_limit(self, mocker):
+        """メンバー数の上限を超えるバッチが拒否されるテスト"""
+        self.service.max_members = 2
+        self.mock_crawl(mocker, {}, {}, organization_members=["a", "b", "c"])
+        
+        with pytest.raises(ValueError, match="limited to 2 members"):
+            await self.service.start_batch_analysis(BatchAnalysisRequest(github_usernames=["a", "b", "c"]))
+        
+        job = await self.run(BatchAnalysisRequest(organization="acme"))
+        assert job.status == "failed"
+        assert "limited to 2 members" in job.error_message
+    
+    @pytest.mark.asyncio
+    async def test_queue_mode_enqueues_batch(self):
+        """キューモードではバッチ分析がワーカー用キューに追加されるテスト"""
+        analysis_service = self.service.analysis_service
+        analysis_service.execution_mode = "queue"
+        analysis_service.queue_service = AsyncMock()
+        request = BatchAnalysisRequest(organization="acme")
+        
+        job = await self.service.start_batch_analysis(request)
+        
+        analysis_service.queue_service.enqueue.assert_awaited_once_with(job.job_id, request, RequestPriority.BACKGROUND)
+        assert self.service._tasks == set()
+        
+        analysis_service.queue_service.enqueue.side_effect = ConnectionError("queue down")
+        with pytest.raises(ConnectionError):
+            await self.service.start_batch_analysis(request)
+        assert list(analysis_service.job_store.jobs) == [job.job_id]
+    
+    def test_request_requires_members(self):
+        """ユーザー名も組織も指定されないリクエストが拒否されるテスト"""
+        with pytest.raises(ValidationError):
+            BatchAnalysisRequest()
+    
+    @pytest.mark.asyncio
+    async def test_get_batch_result_of_missing_job(self):
+        """存在しないジョブの結果取得がエラーになるテスト"""
+        with pytest.raises(ValueError, match="not found"):
+            await self.service.get_batch_result("missing")
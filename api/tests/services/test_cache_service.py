@@ -0,0 +1,73 @@
+"""
+Tests for CacheService - Redis Caching for GitHub API Response Optimization
+"""
+import pytest
+from unittest.mock import AsyncMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.services.cache_service import CacheService
+
+
+class TestCacheService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = CacheService(redis_url="redis://localhost:6379")
+        self.service.redis_client = AsyncMock()
+    
+    @pytest.mark.asyncio
+    async def test_set_and_get_roundtrip(self):
+        """保存したデータが同じ値で取得できるテスト"""
+        store = {}
+        
+        async def fake_set(key, value, ex=None):
+            store[key] = value
+        
+        async def fake_get(key):
+            return store.get(key)
+        
+        self.service.redis_client.set.side_effect = fake_set
+        self.service.redis_client.get.side_effect = fake_get
+        
+        value = {"Python": 15000, "JavaScript": 8000}
+        assert await self.service.set("repo:owner:repo:languages:public", value, 60) is True
+        assert await self.service.get("repo:owner:repo:languages:public") == value
+    
+    @pytest.mark.asyncio
+    async def test_get_miss_returns_none(self):
+        """キャッシュミス時にNoneが返されるテスト"""
+        self.service.redis_client.get.return_value = None
+        
+        assert await self.service.get("missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_not_raised(self):
+        """Redis障害時も例外を送出せずに処理を継続するテスト"""
+        self.service.redis_client.get.side_effect = RedisConnectionError("down")
+        self.service.redis_client.set.side_effect = RedisConnectionError("down")
+        
+        assert await self.service.get("key") is None
+        assert await self.service.set("key", {"a": 1}) is False
+    
+    @pytest.mark.asyncio
+    async def test_disabled_without_redis_url(self, monkeypatch):
+        """REDIS_URL未設定時はキャッシュが無効になるテスト"""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        service = CacheService()
+        
+        assert service.enabled is False
+        assert await service.get("key") is None
+        assert await service.set("key", 1) is False
+    
+    def test_serialize_compresses_large_payloads(self):
+        """大きなデータが圧縮されて保存されるテスト"""
+        small = self.service._serialize({"a": 1})
+        large_value = [{"sha": f"{i:040d}", "date": "2023-01-01T00:00:00Z"} for i in range(200)]
+        large = self.service._serialize(large_value)
+        
+        assert small.startswith(b"j")
+        assert large.startswith(b"z")
+        assert self.service._deserialize(large) == large_value
+    
+    def test_generate_resource_keys(self):
+        """リソース別キャッシュキー生成テスト"""
+        assert self.service.generate_user_resource_key("TestUser", "repos") == "user:testuser:repos:public"
+        assert self.service.generate_repo_resource_key("Owner", "Repo", "languages", "abc") == "repo:owner:repo:languages:abc"
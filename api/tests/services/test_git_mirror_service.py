@@ -0,0 +1,143 @@
+"""
+Tests for GitMirrorService - Repository Analysis from Local Git Mirrors
+"""
+import os
+import pytest
+import shutil
+import tempfile
+import subprocess
+from app.services.git_mirror_service import GitMirrorService, author_pattern, classify_path
+
+
+def git(cwd, *args, env=None):
+    """テスト用リポジトリで git を実行"""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def commit(cwd, files, name, email, timestamp):
+    """作者と日時を指定してファイルをコミット"""
+    for path, content in files.items():
+        full_path = os.path.join(cwd, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as written:
+            written.write(content)
+    git(cwd, "add", "-A")
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME=name, GIT_AUTHOR_EMAIL=email, GIT_AUTHOR_DATE=f"@{timestamp} +0000",
+        GIT_COMMITTER_NAME=name, GIT_COMMITTER_EMAIL=email, GIT_COMMITTER_DATE=f"@{timestamp} +0000"
+    )
+    git(cwd, "commit", "--quiet", "-m", "change", env=env)
+
+
+class TestGitMirrorService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        # 2人の作者による Python / Go のコミットを持つソースリポジトリ
+        self.root = tempfile.mkdtemp()
+        self.service = GitMirrorService()
+        self.service.processes = 1
+        self.service.mirror_root = os.path.join(self.root, "mirrors")
+        self.service.url_template = os.path.join(self.root, "src", "{owner}", "{repo}")
+        self.source_path = os.path.join(self.root, "src", "alice", "tool")
+        os.makedirs(self.source_path)
+        git(self.source_path, "init", "--quiet")
+        commit(self.source_path, {"main.py": "print(1)\n"}, "alice", "alice@example.com", 1_600_000_000)
+        commit(self.source_path, {"cmd/main.go": "package main\n"}, "Bob", "bob@example.com", 1_600_100_000)
+        commit(
+            self.source_path,
+            {"main.py": "print(2)\n", "node_modules/lib/index.js": "x\n"},
+            "Alice Liddell", "12345+alice@users.noreply.github.com", 1_600_200_000
+        )
+    
+    def teardown_method(self):
+        """各テストの後にプロセスプールと一時ディレクトリを片付ける"""
+        if self.service._pool is not None:
+            self.service._pool.shutdown()
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    @pytest.mark.asyncio
+    async def test_languages_and_timelines(self):
+        """言語サイズ、コミットタイムライン、言語別タイムラインが読み取られるテスト"""
+        languages, timeline, language_timelines = await self.service.analyze_repository(
+            "alice", {"name": "tool", "pushed_at": "2020-09-15T00:00:00Z"}
+        )
+        
+        assert languages == {"Python": 9, "Go": 13}
+        assert list(timeline.timestamps) == [1_600_000_000, 1_600_100_000, 1_600_200_000]
+        assert list(language_timelines["Python"].timestamps) == [1_600_000_000, 1_600_200_000]
+        assert list(language_timelines["Go"].timestamps) == [1_600_100_000]
+        assert "JavaScript" not in language_timelines
+    
+    @pytest.mark.asyncio
+    async def test_author_filter_by_login_and_email(self):
+        """ログイン (名前・noreply アドレス) とメールアドレスで作者が絞り込まれるテスト"""
+        repo = {"name": "tool", "pushed_at": "2020-09-15T00:00:00Z"}
+        
+        _, timeline, _ = await self.service.analyze_repository("alice", repo, authors=["alice"])
+        assert list(timeline.timestamps) == [1_600_000_000, 1_600_200_000]
+        
+        _, timeline, language_timelines = await self.service.analyze_repository(
+            "alice", repo, authors=["bob@example.com"]
+        )
+        assert list(timeline.timestamps) == [1_600_100_000]
+        assert list(language_timelines) == ["Go"]
+    
+    @pytest.mark.asyncio
+    async def test_since_timestamp(self):
+        """since_timestamp より古いコミットが除外されるテスト"""
+        _, timeline, _ = await self.service.analyze_repository(
+            "alice", {"name": "tool"}, since_timestamp=1_600_050_000
+        )
+        
+        assert list(timeline.timestamps) == [1_600_100_000, 1_600_200_000]
+    
+    @pytest.mark.asyncio
+    async def test_fetches_only_when_watermark_changes(self):
+        """pushed_at が変わった場合のみミラーが更新されるテスト"""
+        await self.service.analyze_repository("alice", {"name": "tool", "pushed_at": "2020-09-15T00:00:00Z"})
+        commit(self.source_path, {"util.go": "package main\n"}, "Bob", "bob@example.com", 1_600_300_000)
+        
+        _, timeline, _ = await self.service.analyze_repository(
+            "alice", {"name": "tool", "pushed_at": "2020-09-15T00:00:00Z"}
+        )
+        assert len(timeline) == 3
+        
+        languages, timeline, _ = await self.service.analyze_repository(
+            "alice", {"name": "tool", "pushed_at": "2020-09-18T00:00:00Z"}
+        )
+        assert len(timeline) == 4
+        assert languages["Go"] == 26
+    
+    @pytest.mark.asyncio
+    async def test_empty_repository(self):
+        """コミットのないリポジトリが空の結果になるテスト"""
+        git(os.path.join(self.root, "src", "alice"), "init", "--quiet", "empty")
+        
+        languages, timeline, language_timelines = await self.service.analyze_repository("alice", {"name": "empty"})
+        
+        assert languages == {}
+        assert len(timeline) == 0
+        assert language_timelines == {}
+    
+    @pytest.mark.asyncio
+    async def test_missing_repository(self):
+        """存在しないリポジトリが ValueError になるテスト"""
+        with pytest.raises(ValueError, match="Failed to read git mirror"):
+            await self.service.analyze_repository("alice", {"name": "missing"})
+
+
+def test_classify_path():
+    """拡張子・ファイル名による言語分類とベンダーディレクトリの除外のテスト"""
+    assert classify_path("src/app.PY") == "Python"
+    assert classify_path("build/Dockerfile") == "Dockerfile"
+    assert classify_path("vendor/github.com/x/y.go") is None
+    assert classify_path("README") is None
+
+
+def test_author_pattern_escapes_alias():
+    """作者エイリアスの正規表現特殊文字がエスケープされるテスト"""
+    assert author_pattern("a.b@example.com") == "<a\\.b@example\\.com>"
+    assert author_pattern("octo-cat").startswith("(^octo-cat <|")
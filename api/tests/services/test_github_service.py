@@ -49,6 +49,7 @@ class TestGitHubService:
         
         # HTTPXのAsyncClientをモック
         mock_response = Mock()
+        mock_response.headers = {}
         mock_response.json.return_value = mock_response_data
         mock_response.raise_for_status.return_value = None
         
@@ -98,6 +99,7 @@ class TestGitHubService:
         }
         
         mock_response = Mock()
+        mock_response.headers = {}
         mock_response.json.return_value = mock_languages
         mock_response.raise_for_status.return_value = None
         
@@ -138,6 +140,7 @@ class TestGitHubService:
         ]
         
         mock_response = Mock()
+        mock_response.headers = {}
         mock_response.json.return_value = mock_commits
         mock_response.raise_for_status.return_value = None
         
@@ -155,6 +158,413 @@ class TestGitHubService:
         assert commits[0]["message"] == "Initial commit"
         assert commits[0]["author"]["name"] == "Test User"
     
+    @pytest.mark.asyncio
+    async def test_iter_commits_follows_link_pagination(self, mocker):
+        """Linkヘッダーに従って全ページのコミットが取得されるテスト"""
+        def commit(sha, date):
+            return {
+                "sha": sha,
+                "url": f"https://api.github.com/repos/owner/repo/commits/{sha}",
+                "commit": {
+                    "message": "msg",
+                    "author": {"name": "Test User", "email": "test@example.com", "date": date},
+                    "committer": {"name": "Test User", "email": "test@example.com", "date": date}
+                }
+            }
+        
+        first_page = Mock()
+        first_page.headers = {
+            "Link": '<https://api.github.com/repositories/1/commits?per_page=100&page=2>; rel="next", '
+                    '<https://api.github.com/repositories/1/commits?per_page=100&page=2>; rel="last"'
+        }
+        first_page.json.return_value = [commit("a1", "2024-03-01T00:00:00Z")]
+        
+        second_page = Mock()
+        second_page.headers = {}
+        second_page.json.return_value = [commit("b2", "2024-02-01T00:00:00Z")]
+        
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [first_page, second_page]
+        
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        pages = [page async for page in self.service.iter_commits("owner", "repo", "mock_token")]
+        
+        assert [[c["sha"] for c in page] for page in pages] == [["a1"], ["b2"]]
+        # 2ページ目はnextリンクのURLをそのまま使う
+        second_call = mock_client.get.call_args_list[1]
+        assert second_call[0][0].endswith("page=2")
+        assert second_call[1]["params"] is None
+    
+    @pytest.mark.asyncio
+    async def test_get_commit_history_pages_past_rebased_commits(self, mocker):
+        """作者日時が since より古いコミット (リベース等) を除外しつつ全ページを取得するテスト"""
+        from datetime import datetime
+        
+        def commit(sha, date):
+            return {
+                "sha": sha,
+                "url": "",
+                "commit": {
+                    "message": "msg",
+                    "author": {"name": "n", "email": "e", "date": date},
+                    "committer": {"name": "n", "email": "e", "date": "2024-03-01T00:00:00Z"}
+                }
+            }
+        
+        first_page = Mock()
+        first_page.headers = {"Link": '<https://api.github.com/next>; rel="next"'}
+        first_page.json.return_value = [
+            commit("new", "2024-03-01T00:00:00Z"),
+            commit("rebased", "2023-01-01T00:00:00Z"),
+            commit("newer", "2024-02-20T00:00:00Z")
+        ]
+        
+        second_page = Mock()
+        second_page.headers = {}
+        second_page.json.return_value = [
+            commit("b", "2024-02-01T00:00:00Z"),
+            commit("a", "2024-01-15T00:00:00Z")
+        ]
+        
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [first_page, second_page]
+        
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        commits = await self.service.get_commit_history(
+            "owner", "repo", "mock_token", since=datetime(2024, 1, 1)
+        )
+        
+        assert [c["sha"] for c in commits] == ["new", "newer", "b", "a"]
+        assert mock_client.get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_commit_timeline_keeps_only_timestamps(self, mocker):
+        """軽量モードでタイムスタンプ (と SHA) のみが保持されるテスト"""
+        from datetime import datetime
+        
+        def commit(sha, date):
+            return {
+                "sha": sha,
+                "url": "",
+                "commit": {
+                    "message": "a long commit message that is never read",
+                    "author": {"name": "n", "email": "e", "date": date},
+                    "committer": {"name": "n", "email": "e", "date": date}
+                }
+            }
+        
+        page = Mock()
+        page.status_code = 200
+        page.headers = {}
+        page.json.return_value = [
+            commit("c", "2024-03-01T00:00:00Z"),
+            commit("b", "2024-02-01T00:00:00Z"),
+            commit("a", "2023-01-01T00:00:00Z")
+        ]
+        
+        mock_client = AsyncMock()
+        mock_client.get.return_value = page
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        timeline = await self.service.get_commit_timeline(
+            "owner", "repo", "mock_token", since=datetime(2024, 1, 1), include_shas=True
+        )
+        
+        # Oldest first, trimmed at since, parsed once into epoch seconds
+        assert timeline.to_list() == [1706745600, 1709251200]
+        assert timeline.shas == {"b", "c"}
+        assert timeline.count_since(datetime(2024, 2, 15)) == 1
+        mock_client.get.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_get_commit_timeline_filters_by_author_aliases(self, mocker):
+        """作者・since がクエリで送られ、別名ごとの取得結果が SHA で重複排除されるテスト"""
+        from datetime import datetime
+        
+        def commit(sha, date):
+            person = {"name": "n", "email": "e", "date": date}
+            return {"sha": sha, "url": "", "commit": {"message": "m", "author": person, "committer": person}}
+        
+        def page(*commits):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+            response.json.return_value = list(commits)
+            return response
+        
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [
+            page(commit("b", "2024-03-01T00:00:00Z"), commit("a", "2024-02-01T00:00:00Z")),
+            page(commit("c", "2024-02-15T00:00:00Z"), commit("a", "2024-02-01T00:00:00Z"))
+        ]
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        timeline = await self.service.get_commit_timeline(
+            "owner", "repo", "mock_token",
+            since=datetime(2024, 1, 10, 15, 30), authors=["octocat", "work@example.com"]
+        )
+        
+        assert len(timeline) == 3
+        assert timeline.shas is None
+        first, second = [call.kwargs["params"] for call in mock_client.get.call_args_list]
+        # since is rounded down to the UTC day so cache keys stay stable
+        assert first == {"per_page": 100, "author": "octocat", "since": "2024-01-10T00:00:00Z"}
+        assert second["author"] == "work@example.com"
+    
+    @pytest.mark.asyncio
+    async def test_get_contributor_stats_projects_weeks_and_skips_202(self, mocker):
+        """コントリビューター統計が週ごとのコミット数に射影され、202 (集計中) は None になるテスト"""
+        from app.models.commit_timeline import CommitTimeline
+        
+        computing = Mock()
+        computing.status_code = 202
+        computing.headers = {}
+        ready = Mock()
+        ready.status_code = 200
+        ready.headers = {}
+        ready.json.return_value = [
+            {"author": {"login": "Octocat"}, "total": 3, "weeks": [
+                {"w": 1704585600, "a": 10, "d": 2, "c": 2},
+                {"w": 1705190400, "a": 0, "d": 0, "c": 0},
+                {"w": 1705795200, "a": 5, "d": 1, "c": 1}
+            ]},
+            {"author": None, "total": 1, "weeks": [{"w": 1704585600, "a": 1, "d": 0, "c": 1}]}
+        ]
+        
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [computing, ready]
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        assert await self.service.get_contributor_stats("owner", "repo") is None
+        stats = await self.service.get_contributor_stats("owner", "repo")
+        
+        assert stats == {"octocat": [[1704585600, 2], [1705795200, 1]]}
+        assert mock_client.get.call_args.args[0].endswith("/repos/owner/repo/stats/contributors")
+        assert CommitTimeline.from_weekly_counts(stats["octocat"]).to_list() == [1704585600, 1704585600, 1705795200]
+    
+    @pytest.mark.asyncio
+    async def test_get_author_timelines_splits_by_login(self, mocker):
+        """コミットが作者のログインごとに分けられるテスト (アカウント未連携は全体のみ)"""
+        def commit(sha, date, login):
+            person = {"name": "n", "email": "e", "date": date}
+            return {
+                "sha": sha,
+                "url": "",
+                "commit": {"message": "m", "author": person, "committer": person},
+                "author": {"login": login} if login else None
+            }
+        
+        page = Mock()
+        page.status_code = 200
+        page.headers = {}
+        page.json.return_value = [
+            commit("c", "2024-03-01T00:00:00Z", "Alice"),
+            commit("b", "2024-02-01T00:00:00Z", None),
+            commit("a", "2024-01-01T00:00:00Z", "bob")
+        ]
+        
+        mock_client = AsyncMock()
+        mock_client.get.return_value = page
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        timeline, authors = await self.service.get_author_timelines("owner", "repo", "mock_token")
+        
+        assert len(timeline) == 3
+        assert sorted(authors) == ["alice", "bob"]
+        assert authors["alice"].to_list() == [1709251200]
+    
+    @pytest.mark.asyncio
+    async def test_iter_organization_members_and_not_found(self, mocker):
+        """組織メンバー一覧の取得と存在しない組織のエラーテスト"""
+        page = Mock()
+        page.status_code = 200
+        page.headers = {}
+        page.json.return_value = [{"login": "alice", "id": 1}, {"login": "bob", "id": 2}]
+        missing = Mock()
+        missing.status_code = 404
+        missing.headers = {}
+        missing.raise_for_status.side_effect = httpx.HTTPStatusError("Not Found", request=Mock(), response=missing)
+        
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [page, missing]
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        pages = [members async for members in self.service.iter_organization_members("acme")]
+        
+        assert pages == [["alice", "bob"]]
+        assert mock_client.get.call_args.args[0].endswith("/orgs/acme/members")
+        with pytest.raises(ValueError, match="Organization ghost not found"):
+            async for _ in self.service.iter_organization_repositories("ghost"):
+                pass
+    
+    def test_commit_timeline_window_counts(self):
+        """コミットタイムラインの期間カウント (bisect) のテスト"""
+        from app.models.commit_timeline import CommitTimeline
+        
+        timeline = CommitTimeline([300, 100, 200, 200])
+        
+        assert timeline.to_list() == [100, 200, 200, 300]
+        assert timeline.count_since(200) == 3
+        assert timeline.count_since(301) == 0
+        assert timeline.count_since(None) == 4
+        assert timeline.count_between(100, 300) == 3
+        assert timeline.shas is None
+    
+    @pytest.mark.asyncio
+    async def test_iter_repository_activity_graphql(self, mocker):
+        """GraphQLでリポジトリ・言語・コミット数がまとめて取得されるテスト"""
+        from datetime import datetime
+        
+        def node(name, cursor_languages, total, recent):
+            return {
+                "name": name,
+                "nameWithOwner": f"testuser/{name}",
+                "description": None,
+                "primaryLanguage": {"name": "Python"},
+                "diskUsage": 120,
+                "stargazerCount": 1,
+                "forkCount": 0,
+                "updatedAt": "2024-01-01T00:00:00Z",
+                "createdAt": "2023-01-01T00:00:00Z",
+                "url": f"https://github.com/testuser/{name}",
+                "languages": {"edges": [
+                    {"size": size, "node": {"name": language}}
+                    for language, size in cursor_languages.items()
+                ]},
+                "defaultBranchRef": {"target": {
+                    "history": {"totalCount": total},
+                    "recent": {"totalCount": recent}
+                }}
+            }
+        
+        first_page = Mock()
+        first_page.json.return_value = {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": True, "endCursor": "CURSOR1"},
+            "nodes": [node("repo-a", {"Python": 1000, "Shell": 20}, 42, 5)]
+        }}}}
+        second_page = Mock()
+        second_page.json.return_value = {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": [{**node("repo-b", {"Go": 500}, 3, 0), "defaultBranchRef": None}]
+        }}}}
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [first_page, second_page]
+        
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        pages = [
+            page async for page in self.service.iter_repository_activity(
+                "testuser", "mock_token", since=datetime(2024, 1, 1)
+            )
+        ]
+        
+        assert len(pages) == 2
+        assert pages[0][0]["languages"] == {"Python": 1000, "Shell": 20}
+        assert pages[0][0]["commit_count"] == 42
+        assert pages[0][0]["recent_commit_count"] == 5
+        # 空リポジトリ（defaultBranchRefなし）はコミット数0
+        assert pages[1][0]["commit_count"] == 0
+        # 2回目のクエリはカーソルを引き継ぐ
+        assert mock_client.post.call_args_list[1][1]["json"]["variables"]["cursor"] == "CURSOR1"
+    
+    @pytest.mark.asyncio
+    async def test_iter_repository_activity_windows(self, mocker):
+        """GraphQLで期間別のコミット数がエイリアスで取得されるテスト"""
+        from datetime import datetime
+        
+        page = Mock()
+        page.json.return_value = {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": [{
+                "name": "repo-a",
+                "nameWithOwner": "testuser/repo-a",
+                "url": "https://github.com/testuser/repo-a",
+                "languages": {"edges": []},
+                "defaultBranchRef": {"target": {
+                    "history": {"totalCount": 40},
+                    "recent": {"totalCount": 12},
+                    "recent3": {"totalCount": 2},
+                    "recent24": {"totalCount": 30}
+                }}
+            }]
+        }}}}
+        mock_client = AsyncMock()
+        mock_client.post.return_value = page
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        pages = [
+            page async for page in self.service.iter_repository_activity(
+                "testuser", "mock_token", since=datetime(2024, 1, 1),
+                windows={3: datetime(2024, 10, 1), 24: datetime(2023, 1, 1)}
+            )
+        ]
+        
+        request = mock_client.post.call_args[1]["json"]
+        assert "recent3: history(since: $since3, author: $author)" in request["query"]
+        assert request["variables"]["author"] is None
+        assert request["variables"]["since24"] == "2023-01-01T00:00:00+00:00"
+        assert pages[0][0]["activity"] == {"3": 2, "24": 30}
+        assert pages[0][0]["recent_commit_count"] == 12
+    
+    @pytest.mark.asyncio
+    async def test_iter_repository_activity_own_commits(self, mocker):
+        """作者フィルタ有効時にユーザーのノードIDでコミット数が絞り込まれるテスト"""
+        from datetime import datetime
+        
+        user = Mock()
+        user.json.return_value = {"data": {"user": {"id": "U_node"}}}
+        page = Mock()
+        page.json.return_value = {"data": {"user": {"repositories": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": []
+        }}}}
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [user, page]
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        pages = [
+            page async for page in self.service.iter_repository_activity(
+                "testuser", "mock_token", since=datetime(2024, 1, 1), own_commits=True
+            )
+        ]
+        
+        assert pages == [[]]
+        first, second = [call[1]["json"] for call in mock_client.post.call_args_list]
+        assert first["variables"] == {"login": "testuser"}
+        assert second["variables"]["author"] == {"id": "U_node"}
+        assert "recent: history(since: $since, author: $author)" in second["query"]
+    
+    @pytest.mark.asyncio
+    async def test_iter_repository_activity_user_not_found(self, mocker):
+        """GraphQLで存在しないユーザーを指定した場合のテスト"""
+        from datetime import datetime
+        
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "data": {"user": None},
+            "errors": [{"message": "Could not resolve to a User with the login of 'nobody'."}]
+        }
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        with pytest.raises(ValueError, match="User .* not found"):
+            async for _ in self.service.iter_repository_activity("nobody", "mock_token", since=datetime(2024, 1, 1)):
+                pass
+    
+    def test_parse_next_link(self):
+        """Linkヘッダーからnext URLを抽出するテスト"""
+        header = '<https://api.github.com/x?page=3>; rel="next", <https://api.github.com/x?page=9>; rel="last"'
+        
+        assert self.service._parse_next_link(header) == "https://api.github.com/x?page=3"
+        assert self.service._parse_next_link('<https://api.github.com/x?page=1>; rel="prev"') is None
+        assert self.service._parse_next_link(None) is None
+    
     @pytest.mark.asyncio
     async def test_validate_access_token_success(self, mocker):
         """アクセストークン検証の成功テスト"""
@@ -202,6 +612,98 @@ class TestGitHubService:
         with pytest.raises(ValueError, match="Invalid access token"):
             await self.service.validate_access_token("invalid_token")
     
+    @pytest.mark.asyncio
+    async def test_shared_client_is_reused(self, mocker):
+        """全てのAPI呼び出しで共有クライアントが再利用されるテスト"""
+        mock_response = Mock()
+        mock_response.headers = {}
+        mock_response.json.return_value = {"Python": 100}
+        mock_response.raise_for_status.return_value = None
+        
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        
+        client_factory = mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        await self.service.get_repository_languages("owner", "repo-a", "mock_token")
+        await self.service.get_repository_languages("owner", "repo-b", "mock_token")
+        
+        # クライアントは一度だけ作成される
+        client_factory.assert_called_once()
+        assert mock_client.get.call_count == 2
+        
+        # close後はクライアントが解放される
+        await self.service.close()
+        mock_client.aclose.assert_awaited_once()
+        assert self.service.client is None
+    
+    @pytest.mark.asyncio
+    async def test_get_repository_languages_read_through_cache(self, mocker):
+        """キャッシュヒット時にGitHub APIが呼ばれないテスト"""
+        cache_service = AsyncMock()
+        cache_service.generate_repo_resource_key = Mock(return_value="repo:owner:repo:languages:public")
+        service = GitHubService(cache_service)
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.json.return_value = {"Python": 15000}
+        mock_response.raise_for_status.return_value = None
+        
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        # 1回目はAPIから取得してキャッシュに保存
+        cache_service.get.return_value = None
+        first = await service.get_repository_languages("owner", "repo")
+        cache_service.set.assert_awaited_once()
+        stored_key, stored_entry, _ = cache_service.set.call_args[0]
+        assert stored_key == "repo:owner:repo:languages:public"
+        assert stored_entry["data"] == {"Python": 15000}
+        
+        # 2回目はキャッシュから返される
+        cache_service.get.return_value = stored_entry
+        second = await service.get_repository_languages("owner", "repo")
+        
+        assert first == second == {"Python": 15000}
+        mock_client.get.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_get_repository_languages_revalidates_with_etag(self, mocker):
+        """期限切れキャッシュがETagで再検証され、304時にキャッシュが返されるテスト"""
+        cache_service = AsyncMock()
+        cache_service.generate_repo_resource_key = Mock(return_value="repo:owner:repo:languages:public")
+        cache_service.get.return_value = {
+            "data": {"Python": 15000},
+            "etag": '"abc123"',
+            "last_modified": None,
+            "fetched_at": 0  # 期限切れ
+        }
+        service = GitHubService(cache_service)
+        
+        mock_response = Mock()
+        mock_response.status_code = 304
+        
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        
+        mocker.patch('httpx.AsyncClient', return_value=mock_client)
+        
+        languages = await service.get_repository_languages("owner", "repo")
+        
+        # 条件付きリクエストが送信される
+        sent_headers = mock_client.get.call_args[1]["headers"]
+        assert sent_headers["If-None-Match"] == '"abc123"'
+        
+        # 304ではレスポンスを解析せずキャッシュを返し、取得時刻を更新する
+        assert languages == {"Python": 15000}
+        mock_response.json.assert_not_called()
+        refreshed_entry = cache_service.set.call_args[0][1]
+        assert refreshed_entry["fetched_at"] > 0
+        assert cache_service.set.call_args[0][2] >= service.validator_retention
+    
     def test_get_headers_without_token(self):
         """トークンなしでのヘッダー生成テスト"""
         headers = self.service._get_headers()
@@ -132,4 +132,44 @@ class TestIntencyService:
         """すべてゼロのリストの正規化テスト"""
         intensities = [0.0, 0.0, 0.0]
         normalized = self.service.normalize_intensities(intensities)
-        assert normalized == [0.0, 0.0, 0.0]
\ No newline at end of file
+        assert normalized == [0.0, 0.0, 0.0]    
+    def test_calculate_language_intensities_matches_scalar(self):
+        """バッチ計算がスカラー計算と一致するテスト"""
+        rows = [
+            ("Python", 10000, 50, 3, 20),
+            ("C++", 500000, 1000, 10, 100),
+            ("Markdown", 2000, 5, 1, 0),
+            ("UnknownLang", 49, 3, 1, 1),
+            ("Rust", 0, 10, 1, 5),
+            ("Go", 80000, 0, 2, 0),
+            ("Java", 10 ** 9, 10 ** 6, 400, 10 ** 6)
+        ]
+        
+        batch = self.service.calculate_language_intensities(*zip(*rows))
+        scalar = [self.service.calculate_language_intensity(*row) for row in rows]
+        
+        assert batch.tolist() == pytest.approx(scalar, abs=1e-9)
+    
+    def test_calculate_language_intensities_without_recent_activity(self):
+        """最近の活動量を省略したバッチ計算のテスト"""
+        batch = self.service.calculate_language_intensities(["Python"], [10000], [50], [3])
+        
+        assert batch[0] == pytest.approx(
+            self.service.calculate_language_intensity("Python", 10000, 50, 3), abs=1e-9
+        )
+    
+    def test_normalize_intensities_batch_per_group(self):
+        """グループごとに正規化されるテスト"""
+        intensities = [10.0, 20.0, 5.0, 0.0, 0.0]
+        groups = ["user-a", "user-a", "user-b", "user-c", "user-c"]
+        
+        normalized = self.service.normalize_intensities_batch(intensities, groups)
+        
+        assert normalized.tolist() == [50.0, 100.0, 100.0, 0.0, 0.0]
+        assert self.service.normalize_intensities_batch([10.0, 20.0]).tolist() == \
+            self.service.normalize_intensities([10.0, 20.0])
+    
+    def test_batch_empty_input(self):
+        """空入力のバッチ計算テスト"""
+        assert self.service.calculate_language_intensities([], [], [], []).size == 0
+        assert self.service.normalize_intensities_batch([]).size == 0
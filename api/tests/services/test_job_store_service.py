@@ -0,0 +1,216 @@
+"""
+Tests for JobStore - Persistent Analysis Job Storage
+"""
+import pytest
+from datetime import datetime
+from app.models.analysis import AnalysisJob, AnalysisProgress, AnalysisResult, LanguageIntensity
+from app.services.cache_service import CacheService
+from app.services.job_store_service import JobStore, InMemoryJobStore, RedisJobStore, create_job_store
+
+
+class FakePipeline:
+    """Redisパイプラインの簡易フェイク"""
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        return False
+    
+    def delete(self, key):
+        self.commands.append(("delete", key))
+    
+    def hset(self, key, mapping):
+        self.commands.append(("hset", key, mapping))
+    
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+    
+    async def execute(self):
+        for command in self.commands:
+            if command[0] == "delete":
+                self.redis.hashes.pop(command[1], None)
+            elif command[0] == "hset":
+                self.redis.hashes.setdefault(command[1], {}).update(
+                    {k.encode(): str(v).encode() for k, v in command[2].items()}
+                )
+            elif command[0] == "expire":
+                self.redis.ttls[command[1]] = command[2]
+
+
+class FakeRedis:
+    """ハッシュ操作とフライトキー操作のみを持つRedisの簡易フェイク"""
+    def __init__(self):
+        self.hashes = {}
+        self.strings = {}
+        self.ttls = {}
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def hgetall(self, key):
+        return self.hashes.get(key, {})
+    
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+    
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value.encode()
+        self.ttls[key] = ex
+        return True
+    
+    async def get(self, key):
+        return self.strings.get(key)
+    
+    async def eval(self, script, numkeys, key, job_id, keep_seconds):
+        if self.strings.get(key) != job_id.encode():
+            return 0
+        if keep_seconds > 0:
+            self.ttls[key] = keep_seconds
+        else:
+            del self.strings[key]
+        return 1
+
+
+def make_job(status="completed"):
+    """テスト用のジョブを生成"""
+    return AnalysisJob(
+        job_id="job-1",
+        status=status,
+        created_at=datetime(2024, 1, 1, 12, 0, 0),
+        completed_at=datetime(2024, 1, 1, 12, 5, 0) if status == "completed" else None,
+        result=AnalysisResult(
+            username="testuser",
+            analysis_date=datetime(2024, 1, 1, 12, 5, 0),
+            languages=[LanguageIntensity(
+                language="Python",
+                intensity=75.5,
+                commit_count=10,
+                line_count=200,
+                repository_count=1
+            )],
+            total_repositories=1,
+            total_commits=10,
+            analysis_period_months=12
+        ) if status == "completed" else None
+    )
+
+
+class TestInMemoryJobStore:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.store = InMemoryJobStore()
+    
+    @pytest.mark.asyncio
+    async def test_save_and_get(self):
+        """保存したジョブが取得できるテスト"""
+        job = make_job()
+        await self.store.save(job)
+        
+        assert await self.store.get("job-1") == job
+        assert await self.store.get("missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire(self):
+        """完了したジョブがTTL経過後に削除されるテスト"""
+        self.store.result_ttl = 0
+        await self.store.save(make_job())
+        
+        assert await self.store.get("job-1") is None
+        assert self.store.jobs == {}
+    
+    @pytest.mark.asyncio
+    async def test_claim_flight_returns_holder(self):
+        """フライトキーを先に確保したジョブIDが返されるテスト"""
+        assert await self.store.claim_flight("testuser:public:public", "job-1", 60) is None
+        assert await self.store.claim_flight("testuser:public:public", "job-2", 60) == "job-1"
+    
+    @pytest.mark.asyncio
+    async def test_release_flight_only_by_holder(self):
+        """フライトキーは保持しているジョブのみ解放できるテスト"""
+        await self.store.claim_flight("testuser:public:public", "job-1", 60)
+        
+        await self.store.release_flight("testuser:public:public", "job-2")
+        assert await self.store.claim_flight("testuser:public:public", "job-2", 60) == "job-1"
+        
+        await self.store.release_flight("testuser:public:public", "job-1")
+        assert await self.store.claim_flight("testuser:public:public", "job-2", 60) is None
+
+
+class TestRedisJobStore:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.redis = FakeRedis()
+        self.store = RedisJobStore(self.redis)
+    
+    @pytest.mark.asyncio
+    async def test_roundtrip_completed_job(self):
+        """完了ジョブが結果を含めて往復できるテスト"""
+        job = make_job()
+        await self.store.save(job)
+        
+        restored = await self.store.get("job-1")
+        
+        assert restored == job
+        assert restored.result.languages[0].language == "Python"
+        assert self.redis.ttls["job:job-1"] == self.store.result_ttl
+    
+    @pytest.mark.asyncio
+    async def test_active_job_uses_active_ttl(self):
+        """処理中ジョブには処理中用のTTLが設定されるテスト"""
+        await self.store.save(make_job(status="processing"))
+        
+        restored = await self.store.get("job-1")
+        
+        assert restored.status == "processing"
+        assert restored.result is None
+        assert self.redis.ttls["job:job-1"] == self.store.active_ttl
+    
+    @pytest.mark.asyncio
+    async def test_roundtrip_progress(self):
+        """進捗情報が往復できるテスト"""
+        job = make_job(status="processing")
+        job.progress = AnalysisProgress(phase="fetching", repositories_discovered=5, repositories_processed=2, repositories_total=5)
+        await self.store.save(job)
+        
+        assert (await self.store.get("job-1")).progress == job.progress
+    
+    @pytest.mark.asyncio
+    async def test_missing_job(self):
+        """存在しないジョブはNoneが返されるテスト"""
+        assert await self.store.get("missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_flight_claim_and_release(self):
+        """フライトキーの確保と完了後の保持期間設定のテスト"""
+        assert await self.store.claim_flight("testuser:public:public", "job-1", 600) is None
+        assert await self.store.claim_flight("testuser:public:public", "job-2", 600) == "job-1"
+        assert self.redis.ttls["flight:testuser:public:public"] == 600
+        
+        await self.store.release_flight("testuser:public:public", "job-1", keep_seconds=30)
+        
+        assert self.redis.ttls["flight:testuser:public:public"] == 30
+        assert await self.store.claim_flight("testuser:public:public", "job-2", 600) == "job-1"
+
+
+def test_create_job_store_defaults_to_memory_without_redis(monkeypatch):
+    """REDIS_URL未設定時はメモリストアが使われるテスト"""
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("JOB_STORE_BACKEND", raising=False)
+    
+    assert isinstance(create_job_store(CacheService()), InMemoryJobStore)
+
+
+def test_incomplete_backend_fails_on_construction():
+    """抽象メソッドを実装していないバックエンドが生成時にエラーになるテスト"""
+    class PartialJobStore(JobStore):
+        async def save(self, job):
+            pass
+    
+    with pytest.raises(TypeError):
+        PartialJobStore()
@@ -0,0 +1,117 @@
+"""
+Tests for MetricsService - Prometheus Metrics for the Analysis Pipeline
+"""
+import time
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock
+from prometheus_client import REGISTRY
+from app.services.github_service import GitHubService
+from app.services.metrics_service import MetricsService, observe_cache
+from app.services.rate_limit_service import RateLimitBudget, RateLimitService
+
+
+def sample(name, **labels):
+    """現在のメトリクス値を取得 (未記録は 0)"""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.rate_limit_service = RateLimitService()
+        self.queue_service = MagicMock()
+        self.queue_service.depth = AsyncMock(return_value=7)
+        self.service = MetricsService(self.rate_limit_service, self.queue_service)
+    
+    @pytest.mark.asyncio
+    async def test_collect_reports_lowest_budget_per_resource(self):
+        """リソースごとに最小の残り予算が報告されるテスト"""
+        reset_at = time.time() + 600
+        self.rate_limit_service.budgets = {
+            ("token-a", "core"): RateLimitBudget(limit=5000, remaining=4000, reset_at=reset_at),
+            ("token-b", "core"): RateLimitBudget(limit=5000, remaining=120, reset_at=reset_at),
+            ("token-c", "core"): RateLimitBudget(limit=5000, remaining=1, reset_at=time.time() - 1),
+            ("token-a", "graphql"): RateLimitBudget(limit=5000, remaining=4500, reset_at=reset_at)
+        }
+        
+        await self.service.collect()
+        
+        assert sample("skill_piler_github_rate_limit_remaining", resource="core") == 120
+        assert sample("skill_piler_github_rate_limit_remaining", resource="graphql") == 4500
+        assert sample("skill_piler_github_rate_limit_tokens", resource="core") == 2
+        assert sample("skill_piler_analysis_queue_depth") == 7
+    
+    @pytest.mark.asyncio
+    async def test_collect_drops_budgets_that_have_reset(self):
+        """リセット済みの予算が報告から外れるテスト"""
+        self.rate_limit_service.budgets = {
+            ("token-a", "search"): RateLimitBudget(limit=30, remaining=3, reset_at=time.time() + 60)
+        }
+        await self.service.collect()
+        self.rate_limit_service.budgets[("token-a", "search")].reset_at = time.time() - 1
+        
+        await self.service.collect()
+        
+        assert REGISTRY.get_sample_value("skill_piler_github_rate_limit_remaining", {"resource": "search"}) is None
+        assert sample("skill_piler_github_rate_limit_tokens", resource="search") == 0
+    
+    @pytest.mark.asyncio
+    async def test_collect_tolerates_queue_errors(self):
+        """キュー深度の取得失敗でも収集が継続するテスト"""
+        self.queue_service.depth.side_effect = Exception("Redis down")
+        
+        payload, content_type = await self.service.render()
+        
+        assert b"skill_piler_stage_duration_seconds" in payload
+        assert content_type.startswith("text/plain")
+    
+    def test_observe_cache_counts_results(self):
+        """キャッシュ参照結果がカウントされるテスト"""
+        before = sample("skill_piler_cache_lookups_total", cache="snapshot", result="hit")
+        
+        observe_cache("snapshot", "hit")
+        
+        assert sample("skill_piler_cache_lookups_total", cache="snapshot", result="hit") == before + 1
+
+
+class TestGitHubRequestMetrics:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = GitHubService(rate_limit_service=RateLimitService())
+    
+    def test_endpoint_label_templates_paths(self):
+        """エンドポイント名がパステンプレートになるテスト"""
+        base = self.service.api_base_url
+        
+        assert self.service._endpoint_label(f"{base}/repos/octo/hello/commits?page=3") == "/repos/{owner}/{repo}/commits"
+        assert self.service._endpoint_label(f"{base}/users/octo/repos") == "/users/{user}/repos"
+        assert self.service._endpoint_label(f"{base}/orgs/acme-corp/members?page=2") == "/orgs/{org}/members"
+        assert self.service._endpoint_label(f"{base}/orgs/acme-corp/repos") == "/orgs/{org}/repos"
+        assert self.service._endpoint_label(f"{base}/user") == "/user"
+        assert self.service._endpoint_label(self.service.graphql_url) == "graphql"
+    
+    def test_endpoint_label_strips_enterprise_prefix(self):
+        """GitHub Enterprise の API パス接頭辞が除かれるテスト"""
+        self.service.api_base_url = "https://ghe.example.com/api/v3"
+        
+        label = self.service._endpoint_label("https://ghe.example.com/api/v3/repos/octo/hello/languages")
+        
+        assert label == "/repos/{owner}/{repo}/languages"
+    
+    @pytest.mark.asyncio
+    async def test_requests_counted_by_endpoint_and_status(self):
+        """GitHub リクエストがエンドポイントとステータスごとに記録されるテスト"""
+        def handler(request):
+            return httpx.Response(404 if "missing" in request.url.path else 200, json={})
+        self.service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        endpoint = "/repos/{owner}/{repo}/languages"
+        ok_before = sample("skill_piler_github_requests_total", endpoint=endpoint, status="200")
+        missing_before = sample("skill_piler_github_requests_total", endpoint=endpoint, status="404")
+        
+        await self.service._send("GET", f"{self.service.api_base_url}/repos/octo/hello/languages", None)
+        await self.service._send("GET", f"{self.service.api_base_url}/repos/octo/missing/languages", None)
+        
+        assert sample("skill_piler_github_requests_total", endpoint=endpoint, status="200") == ok_before + 1
+        assert sample("skill_piler_github_requests_total", endpoint=endpoint, status="404") == missing_before + 1
+        await self.service.close()
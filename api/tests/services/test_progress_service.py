@@ -0,0 +1,142 @@
+"""
+Tests for ProgressService - Live Analysis Progress Events
+"""
+import json
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from app.services.progress_service import ProgressService
+from redis.exceptions import ConnectionError
+from tests.services.test_snapshot_service import disabled_cache
+
+
+class TestProgressService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = ProgressService(disabled_cache())
+        self.service.min_interval = 0
+    
+    @pytest.mark.asyncio
+    async def test_local_subscribers_receive_events(self):
+        """Redisなしでもプロセス内の購読者にイベントが届くテスト"""
+        async with self.service.subscribe("job-1") as subscription:
+            await self.service.publish("job-1", {"type": "progress"})
+            await self.service.publish("job-2", {"type": "other"})
+            
+            assert await subscription.next_event(timeout=1) == {"type": "progress"}
+            assert await subscription.next_event(timeout=0.01) is None
+        
+        assert "job-1" not in self.service._queues
+    
+    @pytest.mark.asyncio
+    async def test_tracker_counts_and_phases(self):
+        """進捗トラッカーがリポジトリ数とフェーズを通知するテスト"""
+        tracker = self.service.tracker("job-1")
+        
+        async with self.service.subscribe("job-1") as subscription:
+            await tracker.phase("listing")
+            await tracker.discovered(3)
+            await tracker.processed()
+            await tracker.phase("fetching")
+            
+            events = [await subscription.next_event(timeout=1) for _ in range(4)]
+        
+        assert [event["progress"]["phase"] for event in events] == ["listing", "listing", "listing", "fetching"]
+        assert events[2]["progress"]["repositories_processed"] == 1
+        assert events[3]["progress"]["repositories_total"] == 3
+        assert events[1]["progress"]["repositories_total"] is None
+    
+    @pytest.mark.asyncio
+    async def test_tracker_throttles_count_updates(self):
+        """件数の更新は間引かれ、フェーズ変更は必ず通知されるテスト"""
+        self.service.min_interval = 60
+        tracker = self.service.tracker("job-1")
+        
+        async with self.service.subscribe("job-1") as subscription:
+            await tracker.phase("listing")
+            for _ in range(10):
+                await tracker.processed()
+            await tracker.phase("scoring")
+            
+            first = await subscription.next_event(timeout=1)
+            second = await subscription.next_event(timeout=1)
+            assert await subscription.next_event(timeout=0.01) is None
+        
+        assert first["progress"]["phase"] == "listing"
+        assert second["progress"]["phase"] == "scoring"
+        assert second["progress"]["repositories_processed"] == 10
+    
+    def mock_pubsub(self, *messages):
+        """指定メッセージを順に返す共有pub/sub接続のモックを設定"""
+        pending = list(messages)
+        
+        async def get_message(ignore_subscribe_messages=False, timeout=None):
+            if pending:
+                return pending.pop(0)
+            await asyncio.sleep(timeout)
+            return None
+        
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.unsubscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        pubsub.get_message = AsyncMock(side_effect=get_message)
+        self.service.redis_client = MagicMock()
+        self.service.redis_client.publish = AsyncMock()
+        self.service.redis_client.pubsub.return_value = pubsub
+        return pubsub
+    
+    @pytest.mark.asyncio
+    async def test_redis_publish_and_subscribe(self):
+        """Redis pub/sub経由でイベントが送受信されるテスト"""
+        pubsub = self.mock_pubsub({
+            "type": "message",
+            "channel": b"job:job-1:events",
+            "data": json.dumps({"type": "completed"}).encode()
+        })
+        
+        await self.service.publish("job-1", {"type": "progress"})
+        async with self.service.subscribe("job-1") as subscription:
+            event = await subscription.next_event(timeout=1)
+        
+        assert self.service.redis_client.publish.call_args[0][0] == "job:job-1:events"
+        assert event == {"type": "completed"}
+        pubsub.subscribe.assert_awaited_once_with("job:job-1:events")
+        pubsub.unsubscribe.assert_awaited_once_with("job:job-1:events")
+        
+        await self.service.close()
+        pubsub.aclose.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_streams_share_one_pubsub_connection(self):
+        """複数ジョブの購読が1つのpub/sub接続を共有し、ジョブごとに振り分けられるテスト"""
+        pubsub = self.mock_pubsub(
+            {"type": "message", "channel": b"job:job-2:events", "data": b'{"type":"second"}'},
+            {"type": "message", "channel": b"job:job-1:events", "data": b'{"type":"first"}'}
+        )
+        
+        async with self.service.subscribe("job-1") as first, \
+                self.service.subscribe("job-1") as again, \
+                self.service.subscribe("job-2") as second:
+            assert await first.next_event(timeout=1) == {"type": "first"}
+            assert await again.next_event(timeout=1) == {"type": "first"}
+            assert await second.next_event(timeout=1) == {"type": "second"}
+            assert await second.next_event(timeout=0.01) is None
+        
+        self.service.redis_client.pubsub.assert_called_once()
+        assert pubsub.subscribe.await_count == 2
+        assert pubsub.unsubscribe.await_count == 2
+        assert self.service._queues == {}
+        await self.service.close()
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_failure_falls_back_to_polling(self):
+        """購読に失敗してもエラーにならず、イベントなしで待機できるテスト"""
+        pubsub = self.mock_pubsub()
+        pubsub.subscribe.side_effect = ConnectionError("Too many connections")
+        
+        async with self.service.subscribe("job-1") as subscription:
+            assert await subscription.next_event(timeout=0.01) is None
+        
+        pubsub.aclose.assert_awaited_once()
+        assert self.service._pubsub is None
@@ -0,0 +1,123 @@
+"""
+Tests for AnalysisQueueService - Durable Analysis Job Queue (Redis Streams)
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ResponseError
+from app.models.analysis import AnalysisRequest, BatchAnalysisRequest
+from app.services.queue_service import AnalysisQueueService
+from app.services.rate_limit_service import RequestPriority
+
+
+class TestAnalysisQueueService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.redis = AsyncMock()
+        self.redis.hincrby.return_value = 1
+        self.service = AnalysisQueueService(self.redis)
+    
+    def message(self, message_id, job_id, username="testuser"):
+        """ストリームメッセージを生成"""
+        return (
+            message_id.encode(),
+            {
+                b"job_id": job_id.encode(),
+                b"request": AnalysisRequest(github_username=username).model_dump_json().encode(),
+                b"priority": b"1"
+            }
+        )
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_adds_request_to_stream(self):
+        """分析リクエストがストリームに追加されるテスト"""
+        self.redis.xadd.return_value = b"1-0"
+        request = AnalysisRequest(github_username="testuser", access_token="mock_token")
+        
+        message_id = await self.service.enqueue("job-1", request, RequestPriority.BACKGROUND)
+        
+        assert message_id == "1-0"
+        stream, fields = self.redis.xadd.call_args[0]
+        assert stream == self.service.stream
+        assert fields["job_id"] == "job-1"
+        assert fields["priority"] == int(RequestPriority.BACKGROUND)
+        assert AnalysisRequest.model_validate_json(fields["request"]) == request
+        self.redis.xgroup_create.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_batch_request_round_trip(self):
+        """バッチ分析リクエストが種別付きで追加され、取得時に復元されるテスト"""
+        request = BatchAnalysisRequest(organization="acme")
+        await self.service.enqueue("job-1", request, RequestPriority.BACKGROUND)
+        _, fields = self.redis.xadd.call_args[0]
+        assert fields["kind"] == "batch"
+        
+        self.redis.xautoclaim.return_value = [b"0-0", [], []]
+        self.redis.xreadgroup.return_value = [[b"analysis:queue", [(
+            b"1-0", {k.encode(): str(v).encode() for k, v in fields.items()}
+        )]]]
+        
+        claimed = await self.service.claim("worker-1", count=1)
+        
+        assert claimed[0].kind == "batch"
+        assert claimed[0].request == request
+    
+    @pytest.mark.asyncio
+    async def test_ensure_group_ignores_existing_group(self):
+        """既存のコンシューマグループがあってもエラーにならないテスト"""
+        self.redis.xgroup_create.side_effect = ResponseError("BUSYGROUP Consumer Group name already exists")
+        
+        await self.service.ensure_group()
+        await self.service.ensure_group()
+        
+        self.redis.xgroup_create.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_claim_reclaims_abandoned_before_new(self):
+        """放棄されたメッセージが新規メッセージより先に取得されるテスト"""
+        self.redis.xautoclaim.return_value = [b"0-0", [self.message("1-0", "job-old")], []]
+        self.redis.xreadgroup.return_value = [[b"analysis:queue", [self.message("2-0", "job-new")]]]
+        self.redis.hincrby.side_effect = [2, 1]
+        
+        claimed = await self.service.claim("worker-1", count=2)
+        
+        assert [queued.job_id for queued in claimed] == ["job-old", "job-new"]
+        assert claimed[0].attempts == 2
+        assert claimed[1].priority == RequestPriority.BACKGROUND
+        assert claimed[1].request.github_username == "testuser"
+        assert self.redis.xreadgroup.call_args[1]["count"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_claim_skips_read_when_reclaim_fills_batch(self):
+        """再取得でバッチが埋まった場合は新規読み込みを行わないテスト"""
+        self.redis.xautoclaim.return_value = [b"0-0", [self.message("1-0", "job-old")], []]
+        
+        claimed = await self.service.claim("worker-1", count=1)
+        
+        assert len(claimed) == 1
+        self.redis.xreadgroup.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_is_exhausted_after_max_attempts(self):
+        """最大試行回数を超えたメッセージが判定されるテスト"""
+        self.redis.xautoclaim.return_value = [b"0-0", [self.message("1-0", "job-1")], []]
+        self.redis.hincrby.return_value = self.service.max_attempts + 1
+        
+        claimed = await self.service.claim("worker-1", count=1)
+        
+        assert self.service.is_exhausted(claimed[0])
+    
+    @pytest.mark.asyncio
+    async def test_ack_removes_message(self):
+        """完了時にメッセージが確認・削除されるテスト"""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipeline = MagicMock()
+        pipeline.__aenter__ = AsyncMock(return_value=pipe)
+        pipeline.__aexit__ = AsyncMock(return_value=False)
+        self.redis.pipeline = MagicMock(return_value=pipeline)
+        
+        await self.service.ack("1-0")
+        
+        pipe.xack.assert_called_once_with(self.service.stream, self.service.group, "1-0")
+        pipe.xdel.assert_called_once_with(self.service.stream, "1-0")
+        pipe.execute.assert_awaited_once()
@@ -0,0 +1,157 @@
+"""
+Tests for RateLimitService - GitHub Request Scheduling, Budget Tracking and Backoff
+"""
+import time
+import asyncio
+import pytest
+import httpx
+from app.services.rate_limit_service import RateLimitService, RequestPriority, request_priority
+
+
+def make_response(status_code=200, headers=None, json=None):
+    """テスト用のHTTPレスポンスを生成"""
+    return httpx.Response(
+        status_code,
+        headers=headers or {},
+        json=json if json is not None else {},
+        request=httpx.Request("GET", "https://api.github.com/test")
+    )
+
+
+class TestRateLimitService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = RateLimitService()
+    
+    def test_record_budget_from_headers(self):
+        """レスポンスヘッダーからトークン毎の残量が記録されるテスト"""
+        reset_at = int(time.time()) + 600
+        self.service.record("token-a", make_response(headers={
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4321",
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Resource": "core"
+        }))
+        
+        budget = self.service.get_budget("token-a")
+        assert budget.limit == 5000
+        assert budget.remaining == 4321
+        assert budget.reset_at == reset_at
+        assert self.service.get_budget("token-b") is None
+    
+    def test_pacing_spreads_low_budget_until_reset(self):
+        """残量が少ない場合にリセットまで均等に間隔が空けられるテスト"""
+        reset_at = int(time.time()) + 100
+        self.service.record("token-a", make_response(headers={
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "50",
+            "X-RateLimit-Reset": str(reset_at)
+        }))
+        
+        delay = self.service._pacing_delay("token-a", "core", RequestPriority.INTERACTIVE)
+        assert 1.5 < delay <= 2.0
+    
+    def test_background_paces_before_interactive(self):
+        """バックグラウンド処理はインタラクティブより早くペーシングされるテスト"""
+        self.service.record("token-a", make_response(headers={
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "1000",
+            "X-RateLimit-Reset": str(int(time.time()) + 600)
+        }))
+        
+        assert self.service._pacing_delay("token-a", "core", RequestPriority.INTERACTIVE) == 0.0
+        assert self.service._pacing_delay("token-a", "core", RequestPriority.BACKGROUND) > 0.0
+    
+    def test_exhausted_budget_with_distant_reset_raises(self):
+        """残量0かつリセットが遠い場合は待たずにエラーになるテスト"""
+        self.service.record("token-a", make_response(headers={
+            "X-RateLimit-Limit": "60",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600)
+        }))
+        
+        with pytest.raises(ValueError, match="Rate limit exceeded"):
+            self.service._pacing_delay("token-a", "core", RequestPriority.INTERACTIVE)
+    
+    @pytest.mark.asyncio
+    async def test_send_retries_429_with_retry_after(self, mocker):
+        """429レスポンスがRetry-Afterに従って再試行されるテスト"""
+        sleep = mocker.patch('app.services.rate_limit_service.asyncio.sleep')
+        responses = [
+            make_response(429, headers={"Retry-After": "2"}),
+            make_response(200, json={"ok": True})
+        ]
+        
+        async def send():
+            return responses.pop(0)
+        
+        response = await self.service.send("token-a", "core", send)
+        
+        assert response.status_code == 200
+        delay = sleep.call_args[0][0]
+        assert 2 <= delay <= 3
+    
+    @pytest.mark.asyncio
+    async def test_send_retries_secondary_rate_limit(self, mocker):
+        """セカンダリレート制限の403がジッター付きバックオフで再試行されるテスト"""
+        mocker.patch('app.services.rate_limit_service.asyncio.sleep')
+        responses = [
+            make_response(403, json={"message": "You have exceeded a secondary rate limit."}),
+            make_response(200)
+        ]
+        
+        async def send():
+            return responses.pop(0)
+        
+        response = await self.service.send("token-a", "core", send)
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_send_does_not_retry_permission_error(self, mocker):
+        """通常の403（権限エラー）は再試行されないテスト"""
+        sleep = mocker.patch('app.services.rate_limit_service.asyncio.sleep')
+        calls = 0
+        
+        async def send():
+            nonlocal calls
+            calls += 1
+            return make_response(403, json={"message": "Resource not accessible"})
+        
+        response = await self.service.send("token-a", "core", send)
+        
+        assert response.status_code == 403
+        assert calls == 1
+        sleep.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_interactive_requests_admitted_before_background(self):
+        """同時実行枠が埋まっている場合、インタラクティブが優先して実行されるテスト"""
+        self.service.max_in_flight = 1
+        order = []
+        gate = asyncio.Event()
+        
+        async def blocking_send():
+            await gate.wait()
+            return make_response()
+        
+        def recording_send(name):
+            async def send():
+                order.append(name)
+                return make_response()
+            return send
+        
+        async def run(name, priority, send):
+            request_priority.set(priority)
+            await self.service.send("token-a", "core", send)
+        
+        holder = asyncio.create_task(run("holder", RequestPriority.INTERACTIVE, blocking_send))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(run("background", RequestPriority.BACKGROUND, recording_send("background")))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(run("interactive", RequestPriority.INTERACTIVE, recording_send("interactive")))
+        await asyncio.sleep(0)
+        
+        gate.set()
+        await asyncio.gather(holder, background, interactive)
+        
+        assert order == ["interactive", "background"]
@@ -0,0 +1,73 @@
+"""
+Tests for RepositorySelectionService - Listing-Metadata Pre-Filter for Per-Repository Fetches
+"""
+from datetime import datetime, timedelta, timezone
+from app.services.repository_selection_service import RepositorySelectionService
+
+
+def iso(days_ago):
+    """現在から指定日数前の ISO 8601 日時"""
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def repo(size=100, created=400, pushed=10, archived=False):
+    """一覧のリポジトリ項目を生成 (created / pushed: 何日前か)"""
+    return {
+        "name": "repo",
+        "size": size,
+        "created_at": iso(created),
+        "pushed_at": iso(pushed) if pushed is not None else None,
+        "archived": archived
+    }
+
+
+class TestRepositorySelectionService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = RepositorySelectionService()
+        self.service.skip_empty = True
+        self.service.skip_archived = False
+        self.service.stale_months = 0
+        self.service.max_repositories = 0
+    
+    def test_defaults_keep_results_exact(self):
+        """既定では結果に影響するリポジトリが除外されないテスト"""
+        assert self.service.select(repo()) == "analyze"
+        assert self.service.select(repo(archived=True)) == "analyze"
+        assert self.service.select(repo(pushed=3000, created=3100)) == "analyze"
+    
+    def test_empty_repository(self):
+        """サイズ0で作成後に push されていないリポジトリが空と判定されるテスト"""
+        assert self.service.select(repo(size=0, created=50, pushed=50)) == "empty"
+        assert self.service.select(repo(size=0, pushed=None)) == "empty"
+        # サイズの更新が遅れている push 済みリポジトリは分析する
+        assert self.service.select(repo(size=0, created=50, pushed=1)) == "analyze"
+        
+        self.service.skip_empty = False
+        assert self.service.select(repo(size=0, created=50, pushed=50)) == "analyze"
+    
+    def test_languages_only_outside_history_window(self):
+        """履歴期間の開始前から push されていないリポジトリは言語のみ取得されるテスト"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=365)
+        
+        assert self.service.select(repo(pushed=400), cutoff) == "languages"
+        # 境界付近は since= の日単位丸めと週単位の統計を考慮してコミットも取得する
+        assert self.service.select(repo(pushed=368), cutoff) == "analyze"
+        assert self.service.select(repo(pushed=400), None) == "analyze"
+    
+    def test_opt_in_drops(self):
+        """アーカイブ済み・長期間 push のないリポジトリが設定時のみ除外されるテスト"""
+        self.service.skip_archived = True
+        self.service.stale_months = 24
+        
+        assert self.service.select(repo(archived=True)) == "archived"
+        assert self.service.select(repo(pushed=800, created=900)) == "stale"
+        assert self.service.select(repo(pushed=600, created=900)) == "analyze"
+    
+    def test_limit_reached(self):
+        """リポジトリ数の上限判定のテスト"""
+        assert not self.service.limit_reached(1000)
+        
+        self.service.max_repositories = 2
+        assert not self.service.limit_reached(1)
+        assert self.service.limit_reached(2)
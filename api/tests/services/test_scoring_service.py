@@ -0,0 +1,223 @@
+"""
+Tests for ScoringService - Raw Aggregate Store, Scoring Profiles and Offline Re-scoring
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock
+from app.models.scoring import ScoringProfile
+from app.services.intency_service import IntencyService
+from app.services.scoring_service import IncrementalRanking, ScoringService
+from tests.services.test_snapshot_service import disabled_cache
+
+
+def make_aggregates(username, languages):
+    """テスト用の集計データを生成"""
+    return {
+        "username": username,
+        "analysis_date": "2024-01-01T12:00:00",
+        "total_repositories": 3,
+        "total_commits": sum(stats["commit_count"] for stats in languages.values()),
+        "analysis_period_months": 12,
+        "languages": languages
+    }
+
+
+class TestScoringService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = ScoringService(disabled_cache())
+        self.records = [
+            make_aggregates("user-a", {
+                "Python": {"total_bytes": 50000, "repository_count": 2, "commit_count": 40, "recent_activity": 10},
+                "HTML": {"total_bytes": 90000, "repository_count": 3, "commit_count": 60, "recent_activity": 0}
+            }),
+            make_aggregates("user-b", {
+                "Rust": {"total_bytes": 20000, "repository_count": 1, "commit_count": 15, "recent_activity": 15}
+            })
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_profile_versions(self):
+        """プロファイルのバージョン管理と最新版取得のテスト"""
+        await self.service.save_profile(ScoringProfile(name="tuned", version=1))
+        await self.service.save_profile(ScoringProfile(name="tuned", version=2, volume_weight=0.5))
+        
+        assert (await self.service.get_profile("tuned")).version == 2
+        assert (await self.service.get_profile("tuned", 1)).volume_weight == 0.35
+        assert (await self.service.get_profile()).label == "default@1"
+        assert [profile.label for profile in await self.service.list_profiles()] == [
+            "default@1", "tuned@1", "tuned@2"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_default_name_resolves_to_built_in(self):
+        """保存済みの default プロファイルがあっても default は組み込み版に解決されるテスト"""
+        self.service.profiles["default@2"] = ScoringProfile(name="default", version=2, volume_weight=0.9)
+        
+        assert (await self.service.get_profile("default")).label == "default@1"
+        assert [profile.label for profile in await self.service.list_profiles()] == ["default@1"]
+    
+    @pytest.mark.asyncio
+    async def test_profile_versions_are_immutable(self):
+        """既存バージョンや組み込みプロファイルは上書きできないテスト"""
+        await self.service.save_profile(ScoringProfile(name="tuned", version=1))
+        
+        with pytest.raises(ValueError, match="already exists"):
+            await self.service.save_profile(ScoringProfile(name="tuned", version=1, volume_weight=0.9))
+        with pytest.raises(ValueError, match="reserved"):
+            await self.service.save_profile(ScoringProfile(name="default", version=1))
+        with pytest.raises(ValueError, match="reserved"):
+            await self.service.save_profile(ScoringProfile(name="default", version=2, volume_weight=0.9))
+        with pytest.raises(ValueError, match="not found"):
+            await self.service.get_profile("missing")
+    
+    def test_rescore_matches_scalar_scoring(self):
+        """再スコアリング結果がスカラー計算と一致するテスト"""
+        profile = ScoringProfile(name="default", version=1)
+        scalar = IntencyService(profile)
+        
+        results = self.service.rescore(self.records, profile)
+        
+        assert [result.username for result in results] == ["user-a", "user-b"]
+        for record, result in zip(self.records, results):
+            assert result.scoring_profile == "default@1"
+            for language in result.languages:
+                stats = record["languages"][language.language]
+                assert language.intensity == pytest.approx(scalar.calculate_language_intensity(
+                    language.language,
+                    stats["total_bytes"],
+                    stats["commit_count"],
+                    stats["repository_count"],
+                    stats["recent_activity"]
+                ), abs=1e-9)
+    
+    def test_rescore_under_different_profile(self):
+        """重み付けの異なるプロファイルで順位が変わるテスト"""
+        default = self.service.rescore(self.records[:1], ScoringProfile(name="default"))[0]
+        markup_heavy = self.service.rescore(self.records[:1], ScoringProfile(
+            name="markup-heavy", language_complexity={"HTML": 2.0, "Python": 0.5}
+        ))[0]
+        
+        assert default.languages[0].language == "Python"
+        assert markup_heavy.languages[0].language == "HTML"
+        assert markup_heavy.scoring_profile == "markup-heavy@1"
+    
+    @pytest.mark.asyncio
+    async def test_iter_aggregates_in_batches(self):
+        """保存した集計データがバッチ単位で列挙されるテスト"""
+        for index in range(5):
+            await self.service.save_aggregates(f"user-{index}:public:public", make_aggregates(f"user-{index}", {}))
+        
+        batches = [batch async for batch in self.service.iter_aggregates(batch_size=2)]
+        
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert await self.service.get_aggregates("user-0:public:public") is not None
+    
+    @pytest.mark.asyncio
+    async def test_iter_aggregates_latest_record_per_user(self):
+        """同じユーザーの複数の集計データ (トークン・公開範囲別) から最新の1件のみ列挙されるテスト"""
+        older = {**make_aggregates("user-a", {}), "analysis_date": "2024-01-01T12:00:00"}
+        newer = {**make_aggregates("user-a", {}), "analysis_date": "2024-03-01T12:00:00"}
+        await self.service.save_aggregates("user-a:public:public", older)
+        await self.service.save_aggregates("user-a:private:token-hash", newer)
+        await self.service.save_aggregates("user-b:public:public", make_aggregates("user-b", {}))
+        
+        records = [record async for batch in self.service.iter_aggregates() for record in batch]
+        
+        assert sorted(record["username"] for record in records) == ["user-a", "user-b"]
+        assert newer in records
+    
+    @pytest.mark.asyncio
+    async def test_iter_aggregates_latest_record_per_user_redis(self):
+        """Redis上でもユーザーごとに最新の集計データのみ読み込まれるテスト"""
+        stored = {
+            b"user-a:public:public": json.dumps({**make_aggregates("user-a", {}), "analysis_date": "2024-01-01T12:00:00"}),
+            b"user-a:public:public:email-hash": json.dumps({**make_aggregates("user-a", {}), "analysis_date": "2024-02-01T12:00:00"}),
+            b"user-b:public:public": json.dumps(make_aggregates("user-b", {}))
+        }
+        self.service.redis_client = AsyncMock()
+        self.service.redis_client.hscan.return_value = (0, stored)
+        self.service.redis_client.hmget.side_effect = lambda key, fields: [stored[field.encode()] for field in fields]
+        
+        records = [record async for batch in self.service.iter_aggregates() for record in batch]
+        
+        assert sorted((record["username"], record["analysis_date"]) for record in records) == [
+            ("user-a", "2024-02-01T12:00:00"), ("user-b", "2024-01-01T12:00:00")
+        ]
+
+
+class TestIncrementalRanking:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.intency_service = IntencyService()
+        self.ranking = IncrementalRanking(self.intency_service)
+    
+    def test_rescores_only_changed_languages(self, mocker):
+        """追加されたリポジトリの言語のみ再計算されるテスト"""
+        calculate = mocker.spy(self.intency_service, 'calculate_language_intensity')
+        
+        self.ranking.add({"languages": {"Python": 10000, "HTML": 5000}, "commit_count": 10, "recent_activity": 2})
+        assert [language.language for language in self.ranking.ranking()] == ["Python", "HTML"]
+        assert calculate.call_count == 2
+        
+        self.ranking.add({"languages": {"Python": 20000}, "commit_count": 30, "recent_activity": 5})
+        ranking = self.ranking.ranking()
+        
+        assert calculate.call_count == 3
+        assert ranking[0].language == "Python"
+        assert ranking[0].repository_count == 2
+        assert ranking[0].commit_count == 40
+        assert self.ranking.total_commits == 40
+        assert self.ranking.ranking() == ranking
+        assert calculate.call_count == 3
+    
+    def test_accumulates_activity_across_repositories(self):
+        """リポジトリごとの活動量が言語ごとに累積されるテスト"""
+        self.ranking.add({
+            "languages": {"Python": 10000, "Shell": 200}, "commit_count": 10, "recent_activity": 4,
+            "activity": {"3": 1, "12": 4}
+        })
+        self.ranking.add({
+            "languages": {"Python": 5000}, "commit_count": 20, "recent_activity": 6,
+            "activity": {"3": 3, "12": 6}
+        })
+        
+        stats = self.ranking.language_stats
+        assert stats["Python"]["recent_activity"] == 10
+        assert stats["Python"]["activity"] == {"3": 4, "12": 10}
+        assert stats["Shell"]["recent_activity"] == 4
+        python = next(language for language in self.ranking.ranking() if language.language == "Python")
+        assert python.activity == {"3": 4, "12": 10}
+    
+    def test_matches_batch_rescore(self):
+        """逐次集計の結果が保存済み集計の再スコアリングと一致するテスト"""
+        self.ranking.add({"languages": {"Go": 30000, "Shell": 800}, "commit_count": 25, "recent_activity": 0})
+        self.ranking.add({"languages": {"Go": 12000}, "commit_count": 8, "recent_activity": 0})
+        
+        rescored = ScoringService(disabled_cache()).rescore(
+            [make_aggregates("user-a", self.ranking.language_stats)],
+            self.intency_service.profile
+        )[0]
+        
+        assert [(l.language, l.intensity) for l in self.ranking.ranking()] == \
+            [(l.language, l.intensity) for l in rescored.languages]
+    
+    def test_language_commits_attribution(self):
+        """言語別のコミット帰属がある場合、各言語に帰属分のみ加算されるテスト"""
+        self.ranking.add({
+            "languages": {"Python": 10000, "Shell": 200}, "commit_count": 10, "recent_activity": 4,
+            "activity": {"12": 4}, "monthly": {24290: 6, 24291: 4},
+            "language_commits": {
+                "Python": {"commit_count": 1, "recent_activity": 1, "activity": {"12": 1}, "monthly": {24291: 1}}
+            }
+        })
+        
+        stats = self.ranking.language_stats
+        assert stats["Python"]["commit_count"] == 1
+        assert stats["Python"]["recent_activity"] == 1
+        assert stats["Python"]["activity"] == {"12": 1}
+        assert self.ranking.language_months["Python"] == {24291: 1}
+        assert stats["Shell"]["commit_count"] == 0
+        assert stats["Shell"]["activity"] == {}
+        assert stats["Shell"]["repository_count"] == 1
+        assert self.ranking.total_months == {24290: 6, 24291: 4}
@@ -0,0 +1,103 @@
+"""
+Tests for SnapshotService - Per-Repository Analysis Snapshots for Incremental Re-analysis
+"""
+import pytest
+from unittest.mock import AsyncMock
+from app.models.commit_timeline import CommitTimeline
+from app.services.cache_service import CacheService
+from app.services.snapshot_service import SnapshotService
+
+
+def in_memory_cache():
+    """辞書に保存するRedisモックを持つCacheServiceを生成"""
+    cache = CacheService(redis_url="redis://localhost:6379")
+    store = {}
+    
+    async def fake_set(key, value, ex=None):
+        store[key] = value
+    
+    async def fake_get(key):
+        return store.get(key)
+    
+    cache.redis_client = AsyncMock()
+    cache.redis_client.set.side_effect = fake_set
+    cache.redis_client.get.side_effect = fake_get
+    return cache
+
+
+def disabled_cache():
+    """環境のREDIS_URLに関わらずRedisを使わないCacheServiceを生成"""
+    cache = CacheService()
+    cache.redis_client = None
+    return cache
+
+
+class TestSnapshotService:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.service = SnapshotService(in_memory_cache())
+        self.repo = {
+            "name": "test-repo",
+            "updated_at": "2024-01-02T00:00:00Z",
+            "pushed_at": "2024-01-01T00:00:00Z"
+        }
+        self.commits = CommitTimeline.from_dates(["2024-01-01T00:00:00Z", "2023-06-01T00:00:00Z"])
+    
+    @pytest.mark.asyncio
+    async def test_save_and_get_roundtrip(self):
+        """保存したスナップショットが取得できるテスト"""
+        await self.service.save("testuser", self.repo, "public", {"Python": 1000}, self.commits, 0)
+        
+        snapshot = await self.service.get("testuser", "test-repo", "public")
+        
+        assert snapshot["watermark"] == "2024-01-01T00:00:00Z"
+        assert snapshot["languages"] == {"Python": 1000}
+        assert snapshot["commit_times"] == [1685577600, 1704067200]
+        assert snapshot["commit_count"] == 2
+        assert self.service.timeline(snapshot).count_since(1700000000) == 1
+        assert await self.service.get("testuser", "test-repo", "other-scope") is None
+    
+    @pytest.mark.asyncio
+    async def test_is_current_follows_watermark(self):
+        """pushed_atが変わるとスナップショットが古いと判定されるテスト"""
+        snapshot = await self.service.save("testuser", self.repo, "public", {}, self.commits, 0)
+        
+        assert self.service.is_current(snapshot, self.repo, 0)
+        assert not self.service.is_current(snapshot, {**self.repo, "pushed_at": "2024-02-01T00:00:00Z"}, 0)
+        assert not self.service.is_current(snapshot, self.repo, 12)
+        assert not self.service.is_current(None, self.repo, 0)
+        # Snapshots in the older ISO-date format are refetched
+        legacy = {key: value for key, value in snapshot.items() if key != "commit_times"}
+        assert not self.service.is_current({**legacy, "commit_dates": []}, self.repo, 0)
+    
+    @pytest.mark.asyncio
+    async def test_is_current_requires_same_authors(self):
+        """作者フィルタが異なるスナップショットは再利用されないテスト"""
+        snapshot = await self.service.save("testuser", self.repo, "public", {}, self.commits, 0, ["testuser"])
+        
+        assert self.service.is_current(snapshot, self.repo, 0, ["testuser"])
+        assert not self.service.is_current(snapshot, self.repo, 0, ["testuser", "work@example.com"])
+        assert not self.service.is_current(snapshot, self.repo, 0)
+    
+    @pytest.mark.asyncio
+    async def test_is_current_requires_same_strategy(self):
+        """取得戦略が異なるスナップショットは再利用されないテスト"""
+        snapshot = await self.service.save("testuser", self.repo, "public", {}, self.commits, 0, None, "stats")
+        
+        assert snapshot["strategy"] == "stats"
+        assert self.service.is_current(snapshot, self.repo, 0, None, "stats")
+        assert not self.service.is_current(snapshot, self.repo, 0, None, "rest")
+    
+    def test_watermark_falls_back_to_updated_at(self):
+        """pushed_atがない場合はupdated_atが使われるテスト"""
+        assert self.service.watermark({"updated_at": "2024-01-02T00:00:00Z"}) == "2024-01-02T00:00:00Z"
+        assert self.service.watermark({}) is None
+    
+    @pytest.mark.asyncio
+    async def test_disabled_without_redis(self, monkeypatch):
+        """Redis未設定時はスナップショットが保存されないテスト"""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        service = SnapshotService(CacheService())
+        
+        assert await service.save("testuser", self.repo, "public", {}, self.commits, 0) is None
+        assert await service.get("testuser", "test-repo", "public") is None
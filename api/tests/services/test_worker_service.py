@@ -0,0 +1,82 @@
+"""
+Tests for AnalysisWorker - Out-of-Process Analysis Worker
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+from app.models.analysis import AnalysisRequest, BatchAnalysisRequest
+from app.services.queue_service import QueuedAnalysis
+from app.services.rate_limit_service import RequestPriority
+from app.services.worker_service import AnalysisWorker
+
+
+class TestAnalysisWorker:
+    def setup_method(self):
+        """各テストの前に実行される初期化"""
+        self.analysis_service = Mock()
+        self.analysis_service._perform_analysis = AsyncMock()
+        self.analysis_service.fail_job = AsyncMock()
+        
+        self.queue_service = Mock()
+        self.queue_service.visibility_timeout_ms = 300000
+        self.queue_service.ack = AsyncMock()
+        self.queue_service.is_exhausted = Mock(return_value=False)
+        
+        self.batch_analysis_service = Mock()
+        self.batch_analysis_service._perform_batch_analysis = AsyncMock()
+        
+        self.worker = AnalysisWorker(
+            self.analysis_service, self.queue_service, consumer_name="worker-1",
+            batch_analysis_service=self.batch_analysis_service
+        )
+        self.queued = QueuedAnalysis(
+            message_id="1-0",
+            job_id="job-1",
+            request=AnalysisRequest(github_username="testuser"),
+            priority=RequestPriority.INTERACTIVE,
+            attempts=1
+        )
+    
+    @pytest.mark.asyncio
+    async def test_process_runs_analysis_and_acks(self):
+        """キューの分析が実行され、完了後に確認応答されるテスト"""
+        await self.worker._process(self.queued)
+        
+        self.analysis_service._perform_analysis.assert_awaited_once_with(
+            "job-1", self.queued.request, RequestPriority.INTERACTIVE
+        )
+        self.queue_service.ack.assert_awaited_once_with("1-0")
+    
+    @pytest.mark.asyncio
+    async def test_process_runs_batch_analysis(self):
+        """バッチ種別のメッセージがバッチ分析として実行されるテスト"""
+        request = BatchAnalysisRequest(organization="acme")
+        queued = QueuedAnalysis(
+            message_id="2-0", job_id="job-2", request=request,
+            priority=RequestPriority.BACKGROUND, attempts=1, kind="batch"
+        )
+        
+        await self.worker._process(queued)
+        
+        self.batch_analysis_service._perform_batch_analysis.assert_awaited_once_with("job-2", request)
+        self.analysis_service._perform_analysis.assert_not_called()
+        self.queue_service.ack.assert_awaited_once_with("2-0")
+    
+    @pytest.mark.asyncio
+    async def test_process_leaves_message_unacked_on_error(self):
+        """処理中の障害時は確認応答せず再試行に回されるテスト"""
+        self.analysis_service._perform_analysis.side_effect = RuntimeError("job store unavailable")
+        
+        await self.worker._process(self.queued)
+        
+        self.queue_service.ack.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_fails_exhausted_job(self):
+        """試行回数を超えたジョブは失敗として記録されるテスト"""
+        self.queue_service.is_exhausted.return_value = True
+        
+        await self.worker._process(self.queued)
+        
+        self.analysis_service._perform_analysis.assert_not_called()
+        self.analysis_service.fail_job.assert_awaited_once()
+        self.queue_service.ack.assert_awaited_once_with("1-0")
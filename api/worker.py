@@ -0,0 +1,52 @@
+"""
+Analysis worker entry point
+
+Run alongside the API with ANALYSIS_EXECUTION=queue:  python worker.py
+"""
+
+import os
+import signal
+import asyncio
+import logging
+from prometheus_client import start_http_server
+from app.services.analysis_service import AnalysisService
+from app.services.worker_service import AnalysisWorker
+
+async def sample_metrics(analysis_service: AnalysisService):
+    # Sampled gauges (rate-limit budgets, queue depth) are refreshed between scrapes
+    interval = float(os.getenv("ANALYSIS_WORKER_METRICS_INTERVAL", "15"))
+    while True:
+        await analysis_service.metrics_service.collect()
+        await asyncio.sleep(interval)
+
+async def main():
+    analysis_service = AnalysisService()
+    if analysis_service.queue_service is None:
+        raise SystemExit("Analysis worker requires REDIS_URL")
+    
+    worker = AnalysisWorker(analysis_service, analysis_service.queue_service)
+    
+    # Each worker process exports its own metrics (0 = disabled)
+    metrics_port = int(os.getenv("ANALYSIS_WORKER_METRICS_PORT", "9100"))
+    metrics_task = None
+    if metrics_port:
+        start_http_server(metrics_port)
+        metrics_task = asyncio.create_task(sample_metrics(analysis_service))
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    
+    await analysis_service.github_service.start()
+    try:
+        await worker.run()
+    finally:
+        if metrics_task is not None:
+            metrics_task.cancel()
+        await analysis_service.github_service.close()
+        await analysis_service.git_mirror_service.close()
+        await analysis_service.cache_service.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    asyncio.run(main())